@@ -6,6 +6,9 @@
 # physical pixels instead of logical (scaled) ones.
 # ---------------------------------------------------------------------------
 import sys as _sys
+import time as _time
+_STARTUP_T0 = _time.perf_counter_ns()   # see Startup Timing
+
 if _sys.platform == "win32":
     try:
         from ctypes import windll as _windll
@@ -24,35 +27,191 @@ import sys
 import re
 import random
 import os
-from collections import OrderedDict
+from collections import OrderedDict, Counter
 import datetime
 import time
 import json
 import threading
+import queue
+import atexit
+import copy
+import bisect
+import functools
+from collections import deque
 
-try:
-    import serial
-    import serial.tools.list_ports
-    SERIAL_AVAILABLE = True
-except ImportError:
-    SERIAL_AVAILABLE = False
-
-try:
-    from reportlab.lib.pagesizes import letter
-    from reportlab.lib import colors
-    from reportlab.lib.units import inch
-    from reportlab.platypus import (
-        SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, HRFlowable
-    )
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.enums import TA_CENTER, TA_LEFT
-    REPORTLAB_AVAILABLE = True
-except ImportError:
-    REPORTLAB_AVAILABLE = False
+# =============================================================================
+# --- Optional Libraries ---
+# pyserial and ReportLab are imported the first time they are needed rather
+# than at startup (ReportLab alone costs more than the rest of the imports
+# together). Each loader binds the names the rest of this file uses as module
+# globals and returns whether the library is available; the result is cached.
+# =============================================================================
+
+SERIAL_AVAILABLE = None      # None until load_serial() has run
+REPORTLAB_AVAILABLE = None   # None until load_reportlab() has run
+
+def load_serial():
+    """Imports pyserial on first use (Flipper connect)."""
+    global SERIAL_AVAILABLE, serial
+    if SERIAL_AVAILABLE is None:
+        try:
+            import serial
+            import serial.tools.list_ports
+            SERIAL_AVAILABLE = True
+        except ImportError:
+            SERIAL_AVAILABLE = False
+    return SERIAL_AVAILABLE
+
+def load_reportlab():
+    """Imports the ReportLab pieces used by the PDF report on first use."""
+    global REPORTLAB_AVAILABLE, letter, colors, inch, SimpleDocTemplate, Paragraph, Spacer, \
+        Table, TableStyle, HRFlowable, getSampleStyleSheet, ParagraphStyle, TA_CENTER, TA_LEFT
+    if REPORTLAB_AVAILABLE is None:
+        try:
+            from reportlab.lib.pagesizes import letter
+            from reportlab.lib import colors
+            from reportlab.lib.units import inch
+            from reportlab.platypus import (
+                SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, HRFlowable
+            )
+            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+            from reportlab.lib.enums import TA_CENTER, TA_LEFT
+            REPORTLAB_AVAILABLE = True
+        except ImportError:
+            REPORTLAB_AVAILABLE = False
+    return REPORTLAB_AVAILABLE
+
+def reportlab_installed():
+    """True if ReportLab can be imported, without importing it (for the Tk process)."""
+    if REPORTLAB_AVAILABLE is not None:
+        return REPORTLAB_AVAILABLE
+    import importlib.util
+    return importlib.util.find_spec('reportlab') is not None
+
+# =============================================================================
 
 # --- Version ---
 SHUF_VERSION = "1.77B"
 
+# =============================================================================
+# --- Performance Trace ---
+# Timing spans for the hot paths (bracket/scoreboard drawing, replay writes,
+# final stats, PDF export, IR sends) kept in a fixed-size ring buffer, so a
+# slow night can be diagnosed after the fact without a profiler. F9 in the
+# main window saves the buffer as Chrome trace JSON (open in chrome://tracing
+# or ui.perfetto.dev); SB_TRACE_FILE also saves it on exit. SB_TRACE=0 turns
+# recording off.
+# =============================================================================
+
+TRACE_ENABLED = os.environ.get('SB_TRACE', '1') != '0'
+TRACE_BUFFER_SIZE = 20000
+TRACE_BUFFER = deque(maxlen=TRACE_BUFFER_SIZE)   # (name, start_ns, dur_ns, thread id, args)
+_TRACE_THREAD_NAMES = {}
+
+def trace_record(name, start_ns, end_ns, args=None):
+    """Adds one finished span (perf_counter_ns timestamps) to the ring buffer."""
+    tid = threading.get_ident()
+    if tid not in _TRACE_THREAD_NAMES:
+        _TRACE_THREAD_NAMES[tid] = threading.current_thread().name
+    TRACE_BUFFER.append((name, start_ns, end_ns - start_ns, tid, args))
+
+class trace_span:
+    """`with trace_span('name', key=value):` records the block's duration."""
+    __slots__ = ('name', 'args', 'start')
+
+    def __init__(self, name, **args):
+        self.name = name
+        self.args = args or None
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        if TRACE_ENABLED:
+            trace_record(self.name, self.start, time.perf_counter_ns(), self.args)
+        return False
+
+def traced(name=None, args=None):
+    """
+    Decorator form of trace_span. `args`, if given, is called with the
+    function's arguments and returns a dict attached to the span.
+    """
+    def decorate(fn):
+        span_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*a, **kw):
+            if not TRACE_ENABLED:
+                return fn(*a, **kw)
+            start = time.perf_counter_ns()
+            try:
+                return fn(*a, **kw)
+            finally:
+                trace_record(span_name, start, time.perf_counter_ns(), args(*a, **kw) if args else None)
+        return wrapper
+    return decorate
+
+def trace_summary():
+    """{name: (count, total_ms, max_ms)} over the spans currently buffered, slowest total first."""
+    stats = {}
+    for name, _, dur, _, _ in list(TRACE_BUFFER):
+        count, total, peak = stats.get(name, (0, 0, 0))
+        stats[name] = (count + 1, total + dur, max(peak, dur))
+    return OrderedDict((name, (c, t / 1e6, p / 1e6))
+                       for name, (c, t, p) in sorted(stats.items(), key=lambda kv: -kv[1][1]))
+
+def export_trace(path):
+    """Writes the buffer as Chrome trace-event JSON; returns the number of spans written."""
+    spans = list(TRACE_BUFFER)
+    pid = os.getpid()
+    events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': tname}}
+              for tid, tname in list(_TRACE_THREAD_NAMES.items())]
+    for name, start, dur, tid, args in spans:
+        event = {'name': name, 'ph': 'X', 'pid': pid, 'tid': tid,
+                 'ts': start / 1000, 'dur': dur / 1000}
+        if args:
+            event['args'] = args
+        events.append(event)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+    return len(spans)
+
+# =============================================================================
+# --- Startup Timing ---
+# Milestones from the first line of sb.py to the title screen being on
+# screen, logged as one line once it appears (WARN past STARTUP_TARGET_MS)
+# and added to the trace buffer as startup/* spans. Interpreter start-up
+# before sb.py runs is not included.
+# =============================================================================
+
+STARTUP_TARGET_MS = 300
+STARTUP_MARKS = []   # (label, perf_counter_ns) in the order reached
+
+def startup_mark(label):
+    """Records that start-up has reached `label`."""
+    now = time.perf_counter_ns()
+    prev = STARTUP_MARKS[-1][1] if STARTUP_MARKS else _STARTUP_T0
+    STARTUP_MARKS.append((label, now))
+    if TRACE_ENABLED:
+        trace_record(f'startup/{label}', prev, now)
+
+def log_startup_report():
+    """Logs the time to each milestone; warns if the title screen missed the target."""
+    if not STARTUP_MARKS:
+        return
+    marks = dict(STARTUP_MARKS)
+    parts = ", ".join(f"{label} {(t - _STARTUP_T0) / 1e6:.0f}" for label, t in STARTUP_MARKS)
+    title_ms = (marks.get('title_visible', STARTUP_MARKS[-1][1]) - _STARTUP_T0) / 1e6
+    level = "WARN" if title_ms > STARTUP_TARGET_MS else "INFO"
+    log_message(f"Startup: title screen in {title_ms:.0f} ms "
+                f"(target {STARTUP_TARGET_MS} ms; {parts} ms)", level)
+
+startup_mark('imports')
+
+# =============================================================================
+
 # =============================================================================
 # --- Flipper Zero IR Module ---
 # Sends IR commands to a digital scoreboard via Flipper Zero over USB serial.
@@ -95,7 +254,7 @@ def flipper_connect():
     """
     global _flipper_port
 
-    if not SERIAL_AVAILABLE:
+    if not load_serial():
         log_message("pyserial not installed — Flipper IR disabled. Run: pip install pyserial", "WARN")
         return False
 
@@ -130,6 +289,7 @@ def flipper_disconnect():
             _flipper_port = None
             log_message("Flipper Zero disconnected")
 
+@traced('ir_send', args=lambda action, repeat=1: {'action': action, 'repeat': repeat})
 def _send_ir_blocking(action, repeat=1):
     """
     Internal: sends an IR command `repeat` times with IR_SEND_DELAY between
@@ -284,6 +444,202 @@ def start_flipper_watchdog():
 
 # =============================================================================
 
+# =============================================================================
+# --- Event-Loop Lag Monitor ---
+# A Tk after() heartbeat that measures how late each beat fires. Lateness
+# means the UI thread was busy, so the recent samples give lag percentiles
+# (shown in the footer overlay, toggled with F8), and a beat later than
+# LAG_ALERT_MS logs the slowest spans from the performance trace that
+# overlap the stall.
+# =============================================================================
+
+LAG_HEARTBEAT_MS = 100
+LAG_WINDOW = 600             # samples kept for percentiles (one minute of beats)
+LAG_ALERT_MS = 250           # a beat this late is reported
+LAG_ALERT_COOLDOWN_S = 10    # at most one report per stall burst
+LAG_REPORT_SPANS = 5
+LAG_OVERLAY_REFRESH_MS = 1000
+
+_LAG_SAMPLES = deque(maxlen=LAG_WINDOW)
+_lag_last_alert = 0.0
+
+def lag_percentiles():
+    """{'p50', 'p95', 'p99', 'max'} of recent heartbeat lag in ms (None before the first beat)."""
+    samples = sorted(_LAG_SAMPLES)
+    if not samples:
+        return None
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))]
+    return {'p50': pick(0.50), 'p95': pick(0.95), 'p99': pick(0.99), 'max': samples[-1]}
+
+def _report_lag(lag_ms, now_ns):
+    """Logs a stall together with the slowest traced spans that overlap it."""
+    global _lag_last_alert
+    if time.time() - _lag_last_alert < LAG_ALERT_COOLDOWN_S:
+        return
+    _lag_last_alert = time.time()
+
+    stall_start = now_ns - int((lag_ms + LAG_HEARTBEAT_MS) * 1e6)
+    recent = [s for s in list(TRACE_BUFFER)[-500:] if s[1] + s[2] >= stall_start]
+    recent.sort(key=lambda s: -s[2])
+    culprits = ", ".join(f"{name} {dur / 1e6:.0f} ms" for name, _, dur, _, _ in recent[:LAG_REPORT_SPANS])
+    log_message(f"UI stalled {lag_ms:.0f} ms — slowest recent spans: {culprits or 'none traced'}", "WARN")
+
+def start_lag_monitor(root):
+    """Starts the heartbeat on `root`'s event loop. Call once after the main window is ready."""
+    state = {'due': None}
+
+    def beat():
+        now = time.perf_counter_ns()
+        lag_ms = max(0.0, (now - state['due']) / 1e6)
+        _LAG_SAMPLES.append(lag_ms)
+        if lag_ms >= LAG_ALERT_MS:
+            _report_lag(lag_ms, now)
+        state['due'] = time.perf_counter_ns() + LAG_HEARTBEAT_MS * 1_000_000
+        root.after(LAG_HEARTBEAT_MS, beat)
+
+    state['due'] = time.perf_counter_ns() + LAG_HEARTBEAT_MS * 1_000_000
+    root.after(LAG_HEARTBEAT_MS, beat)
+
+def toggle_lag_overlay(root):
+    """Shows/hides the lag percentiles next to the Flipper status in the footer."""
+    lbl = ui_references.get('lag_overlay_lbl')
+    if not lbl:
+        return
+    # The pending refresh is the "shown" state: cancelling it on hide means a
+    # quick re-toggle starts one fresh chain instead of reviving the old one
+    job = ui_references.get('_lag_overlay_job')
+    if job:
+        root.after_cancel(job)
+        ui_references['_lag_overlay_job'] = None
+        lbl.pack_forget()
+        return
+    lbl.pack(side='left', after=ui_references['flipper_status_lbl'], padx=(4, 0))
+
+    def refresh():
+        p = lag_percentiles()
+        if p:
+            color = (THEME['btn_cancel'] if p['p95'] >= LAG_ALERT_MS
+                     else THEME['btn_yellow'] if p['p95'] >= LAG_HEARTBEAT_MS / 2
+                     else THEME['fg_secondary'])
+            try:
+                lbl.config(text=f"⏱ lag p50 {p['p50']:.0f} · p95 {p['p95']:.0f} · "
+                                f"p99 {p['p99']:.0f} · max {p['max']:.0f} ms", fg=color)
+            except tk.TclError:
+                ui_references['_lag_overlay_job'] = None   # footer rebuilt
+                return
+        ui_references['_lag_overlay_job'] = root.after(LAG_OVERLAY_REFRESH_MS, refresh)
+
+    refresh()
+
+# =============================================================================
+
+# =============================================================================
+# --- Leak Detector ---
+# Debug mode (SB_LEAK_CHECK=1) that samples live widgets per class, items per
+# canvas, pending after() jobs, Tcl commands and images once a minute. Full
+# rebuilds make these counts swing, but their floor should stay flat; a floor
+# that keeps rising block after block is logged as a probable leak. F7 logs
+# the trend so far, and on_close() logs it at exit.
+# =============================================================================
+
+LEAK_CHECK_ENABLED = os.environ.get('SB_LEAK_CHECK', '0') != '0'
+LEAK_SAMPLE_MS = 60_000
+LEAK_HISTORY_SIZE = 720       # twelve hours of samples
+LEAK_BLOCK = 10               # samples per block when comparing floors
+LEAK_RISING_BLOCKS = 3        # consecutive higher floors before warning
+LEAK_MIN_GROWTH = 25          # ... and by at least this many objects overall
+
+LEAK_HISTORY = deque(maxlen=LEAK_HISTORY_SIZE)   # (timestamp, {counter: count})
+_leak_reported = {}                              # counter -> floor at last warning
+
+def count_tk_objects(root):
+    """
+    One sample of live Tk object counts under `root`, keyed by
+    'widget:<Class>', 'canvas:<path>', 'canvas items', 'after jobs',
+    'tcl commands' and 'images'.
+    """
+    counts = Counter()
+    canvas_items = 0
+    stack = [root]
+    while stack:
+        w = stack.pop()
+        stack.extend(w.children.values())
+        counts[f"widget:{type(w).__name__}"] += 1
+        if isinstance(w, tk.Canvas):
+            n = len(w.find_all())
+            counts[f"canvas:{w}"] = n
+            canvas_items += n
+    counts['canvas items'] = canvas_items
+    counts['after jobs'] = len(root.tk.splitlist(root.tk.call('after', 'info')))
+    counts['tcl commands'] = len(root.tk.splitlist(root.tk.call('info', 'commands')))
+    counts['images'] = len(root.image_names())
+    return dict(counts)
+
+def find_leak_trends(history=LEAK_HISTORY):
+    """
+    Counters whose per-block minimum rose in each of the last
+    LEAK_RISING_BLOCKS blocks by LEAK_MIN_GROWTH or more in total.
+    Returns {counter: [block floors, oldest first]}.
+    """
+    samples = list(history)
+    needed = (LEAK_RISING_BLOCKS + 1) * LEAK_BLOCK
+    if len(samples) < needed:
+        return {}
+    blocks = [samples[i:i + LEAK_BLOCK] for i in range(len(samples) - needed, len(samples), LEAK_BLOCK)]
+    trends = {}
+    for key in blocks[-1][-1][1]:
+        floors = [min(counts.get(key, 0) for _, counts in block) for block in blocks]
+        if (all(b > a for a, b in zip(floors, floors[1:]))
+                and floors[-1] - floors[0] >= LEAK_MIN_GROWTH):
+            trends[key] = floors
+    return trends
+
+def leak_report():
+    """One line per counter: first, lowest, highest and latest sample."""
+    samples = list(LEAK_HISTORY)
+    if not samples:
+        return []
+    lines = []
+    for key in sorted(samples[-1][1]):
+        series = [counts.get(key, 0) for _, counts in samples]
+        lines.append(f"{key}: first {series[0]}, min {min(series)}, max {max(series)}, "
+                     f"now {series[-1]} ({len(series)} samples over "
+                     f"{(samples[-1][0] - samples[0][0]) / 60:.0f} min)")
+    return lines
+
+def log_leak_report():
+    """Logs leak_report() at INFO, since it is asked for (F7, or at close)."""
+    lines = leak_report()
+    if not lines:
+        log_message("Leak check: no samples yet" + ("" if LEAK_CHECK_ENABLED else " (set SB_LEAK_CHECK=1)"))
+    for line in lines:
+        log_message(f"Leak check {line}")
+
+def start_leak_monitor(root):
+    """Samples every LEAK_SAMPLE_MS on `root`'s event loop. Call once when LEAK_CHECK_ENABLED."""
+    def sample():
+        try:
+            with trace_span('leak_sample'):
+                counts = count_tk_objects(root)
+        except tk.TclError:
+            return   # root destroyed
+        LEAK_HISTORY.append((time.time(), counts))
+        widgets = sum(n for k, n in counts.items() if k.startswith('widget:'))
+        log_message(f"Leak check: {widgets} widgets, {counts['canvas items']} canvas items, "
+                    f"{counts['after jobs']} after jobs, {counts['tcl commands']} Tcl commands", "DEBUG")
+
+        for key, floors in find_leak_trends().items():
+            # Warn once per trend, then again only after it grows by another LEAK_MIN_GROWTH
+            if key not in _leak_reported or floors[-1] - _leak_reported[key] >= LEAK_MIN_GROWTH:
+                _leak_reported[key] = floors[-1]
+                log_message(f"Possible leak: {key} floor keeps rising "
+                            f"({' -> '.join(map(str, floors))} per {LEAK_BLOCK} min)", "WARN")
+        root.after(LEAK_SAMPLE_MS, sample)
+
+    root.after(LEAK_SAMPLE_MS, sample)
+
+# =============================================================================
+
 # --- Theme Configuration ---
 THEME = {
     'bg_main': '#263238',       # Dark Blue-Grey
@@ -432,6 +788,17 @@ MAX_PLAYERS = 20
 MATCH_HISTORY = []  # Tracks completed matches: {'id': id, 'winner': name, 'loser': name, 'color': color}
 schedule_content_frame = None # Reference for refreshing the UI
 TOURNAMENT_STATE = {}
+TOURNAMENT_FORMAT = 'D'  # Key into TOURNAMENT_FORMATS; saved in every snapshot
+TOURNAMENT_FORMATS = OrderedDict([
+    ('D', 'Double Elimination'),
+    ('S', 'Single Elimination'),
+    ('R', 'Round Robin'),
+    ('W', 'Swiss'),
+])
+LEAGUE_FORMATS = ('R', 'W')  # Formats ranked by standings rather than by elimination
+# Player cap per format: double elimination is bound by the shipped bracket
+# configs; generated formats scale further (round robin grows quadratically).
+FORMAT_MAX_PLAYERS = {'D': MAX_PLAYERS, 'S': 64, 'R': 32, 'W': 64}
 REPLAY_FILEPATH = None # Initialized to None, set only on New Game or Resume
 REPLAY_MODE = False
 REPLAY_VIEW_ONLY = False
@@ -455,6 +822,7 @@ full_bracket_root = None
 full_bracket_canvas = None
 LOG_GAME_TO_FILE = False
 LOG_FILE_HANDLE = None
+LOG_CONSOLE = True   # batch commands (e.g. `sb.py validate`) switch console echo off
 final_control_frame_ref = None
 match_details_frame = None
 game_routing_label = None
@@ -468,20 +836,197 @@ match_timer_id = None
 MATCH_DURATIONS = []        # List of completed match durations (seconds)
 TOURNAMENT_START_TIME = None
 
+# --- Batched Writers ---
+# A BatchWriter is a daemon thread that takes whatever has been put() on its
+# queue and hands it to one handler call, so callers on the Tk and IR threads
+# never wait on the console or disk. With `linger`, it keeps collecting for
+# up to that many seconds before writing. flush() blocks until everything
+# put so far has been handled. A forked worker process inherits the writer
+# objects but not their threads, so each is reset in the child and starts
+# again on its first put().
+
+_BATCH_WRITERS = []
+
+class _BatchFlush:
+    """Queue marker: handled once everything queued before it has been written."""
+    def __init__(self):
+        self.done = threading.Event()
+
+class BatchWriter:
+    """Background batching for one sink: put() items, handle(items) writes them."""
+    def __init__(self, name, handle, max_batch=500, linger=0.0):
+        self.name = name
+        self.handle = handle          # handle(items), on the writer thread
+        self.max_batch = max_batch
+        self.linger = linger
+        self._reset()
+        _BATCH_WRITERS.append(self)
+
+    def _reset(self):
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def put(self, item):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                    self._thread.start()
+        self._queue.put(item)
+
+    def flush(self, timeout=2.0):
+        """Blocks until every item put so far has been handled (or `timeout` passes)."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        marker = _BatchFlush()
+        self._queue.put(marker)
+        marker.done.wait(timeout)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.linger
+            while len(batch) < self.max_batch and not isinstance(batch[-1], _BatchFlush):
+                try:
+                    if self.linger:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        batch.append(self._queue.get(timeout=remaining))
+                    else:
+                        batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            items = [item for item in batch if not isinstance(item, _BatchFlush)]
+            if items:
+                try:
+                    self.handle(items)
+                except Exception as e:
+                    try:
+                        sys.stderr.write(f"[{self.name}] batch dropped: {e}\n")
+                    except Exception:
+                        pass
+            for item in batch:
+                if isinstance(item, _BatchFlush):
+                    item.done.set()
+
+def _reset_batch_writers_after_fork():
+    for writer in _BATCH_WRITERS:
+        writer._reset()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_batch_writers_after_fork)
+
 # --- Console Logging Function ---
+# log_message only checks levels and queues the record, so the Tk and IR
+# threads never block on the console or disk. A BatchWriter formats, prints
+# and appends to the log file in batches (one flush per batch), and rotates
+# logs/shuffleboard_*.log by size and age. flush_logs() drains the queue;
+# on_close and interpreter exit both call it.
+
+LOG_LEVELS = {'DEBUG': 10, 'INFO': 20, 'WARN': 30, 'ERROR': 40}
+# Console threshold; SB_LOG_LEVEL=DEBUG brings back the full console trace
+LOG_CONSOLE_LEVEL = LOG_LEVELS.get(os.environ.get('SB_LOG_LEVEL', 'INFO').upper(), LOG_LEVELS['INFO'])
+LOG_FILE_LEVEL = LOG_LEVELS['DEBUG']
+LOG_DIR = 'logs'
+LOG_ROTATE_BYTES = 5 * 1024 * 1024   # start a new file past this size...
+LOG_ROTATE_SECONDS = 24 * 3600       # ...or this age
+LOG_KEEP_FILES = 30                  # older shuffleboard_*.log files are deleted on rotation
+
+_log_opened_at = time.time()   # current log file's age and size (writer thread only)
+_log_written = 0
+
 def log_message(message, level="INFO"):
     """Prints a leveled, timestamped message to the console and log file (if enabled).
     Levels: DEBUG, INFO, WARN, ERROR
     """
-    global LOG_GAME_TO_FILE, LOG_FILE_HANDLE
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    log_line = f"[{timestamp}] [{level:<5}] {message}"
+    lvl = LOG_LEVELS.get(level, LOG_LEVELS['INFO'])
+    to_console = LOG_CONSOLE and lvl >= LOG_CONSOLE_LEVEL
+    to_file = LOG_GAME_TO_FILE and lvl >= LOG_FILE_LEVEL
+    if not (to_console or to_file):
+        return
+    _LOG_WRITER.put(('msg', time.time(), level, message, to_console, to_file))
+
+def open_log_file():
+    """Creates a new logs/shuffleboard_<timestamp>.log; returns (handle, path)."""
+    os.makedirs(LOG_DIR, exist_ok=True)
+    stem = os.path.join(LOG_DIR, f"shuffleboard_{datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}")
+    filename, n = stem + ".log", 1
+    while os.path.exists(filename):
+        filename, n = f"{stem}_{n}.log", n + 1
+    return open(filename, 'a', encoding='utf-8'), filename
+
+def set_log_file(handle):
+    """Hands a log file to the writer (None closes the current one). Records queued earlier go to the old file."""
+    _LOG_WRITER.put(('file', handle))
+
+def flush_logs(timeout=2.0):
+    """Blocks until everything logged so far is written (or `timeout` passes)."""
+    _LOG_WRITER.flush(timeout)
+
+def _prune_log_files():
+    try:
+        logs = sorted((os.path.join(LOG_DIR, f) for f in os.listdir(LOG_DIR)
+                       if f.startswith('shuffleboard_') and f.endswith('.log')),
+                      key=os.path.getmtime)
+        for old in logs[:-LOG_KEEP_FILES]:
+            os.remove(old)
+    except OSError:
+        pass
+
+def _write_log_batch(batch):
+    """Writer thread: sole owner of LOG_FILE_HANDLE once logging starts."""
+    global LOG_FILE_HANDLE, _log_opened_at, _log_written
+
+    console_lines = []
+    for item in batch:
+        kind = item[0]
+        if kind == 'msg':
+            _, ts, level, message, to_console, to_file = item
+            stamp = datetime.datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
+            line = f"[{stamp}] [{level:<5}] {message}\n"
+            if to_console:
+                console_lines.append(line)
+            if to_file and LOG_FILE_HANDLE:
+                try:
+                    LOG_FILE_HANDLE.write(line)
+                    _log_written += len(line)
+                except Exception as e:
+                    console_lines.append(f"[Log Manager] Log file write failed, file logging off: {e}\n")
+                    LOG_FILE_HANDLE = None
+        elif kind == 'file':
+            if LOG_FILE_HANDLE:
+                try:
+                    LOG_FILE_HANDLE.close()
+                except Exception:
+                    pass
+            LOG_FILE_HANDLE = item[1]
+            _log_opened_at = time.time()
+            _log_written = LOG_FILE_HANDLE.tell() if LOG_FILE_HANDLE else 0
+
+    if console_lines:
+        try:
+            sys.stdout.write(''.join(console_lines))
+            sys.stdout.flush()
+        except Exception:
+            pass
+    if LOG_FILE_HANDLE:
+        try:
+            LOG_FILE_HANDLE.flush()
+            if _log_written >= LOG_ROTATE_BYTES or time.time() - _log_opened_at >= LOG_ROTATE_SECONDS:
+                LOG_FILE_HANDLE.close()
+                LOG_FILE_HANDLE, path = open_log_file()
+                _log_opened_at, _log_written = time.time(), 0
+                _prune_log_files()
+                LOG_FILE_HANDLE.write(f"[{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] "
+                                      f"[INFO ] Log rotated — continuing in {path}\n")
+        except Exception:
+            LOG_FILE_HANDLE = None
 
-    print(log_line)
+_LOG_WRITER = BatchWriter('log-writer', _write_log_batch)
 
-    if LOG_GAME_TO_FILE and LOG_FILE_HANDLE:
-        LOG_FILE_HANDLE.write(log_line + "\n")
-        LOG_FILE_HANDLE.flush()
+atexit.register(flush_logs)
 
 # --- System Functions ---
 def _find_last_snapshot_in_file(path):
@@ -533,6 +1078,8 @@ ui_references = {
     'red_round_delta_lbl': None,
     'blue_round_delta_lbl': None,
     '_first_throw_color': None, # 'red' | 'blue' | None — who throws first next round
+    # Lag overlay (F8)
+    '_lag_overlay_job': None,   # pending after() id for the overlay refresh
 }
 
 def update_footer_log_status():
@@ -708,6 +1255,7 @@ def add_late_team():
 
     if REPLAY_FILEPATH:
         append_snapshot_to_file(REPLAY_FILEPATH)
+    live_publish()
 
     log_message(f"Bracket rebuilt for {len(TEAMS)} teams. G1 preserved and still active.")
     confirm_msg = f"{new_team_name} ({p1_name} & {p2_name}) added!\nBracket updated for {len(TEAMS)} teams."
@@ -1335,6 +1883,13 @@ def setup_scoreboard(root, team_red_placeholder, team_blue_placeholder):
     )
     ui_references['flipper_status_lbl'].pack(side='left')
 
+    # Lag overlay — packed next to the Flipper status by toggle_lag_overlay (F8)
+    ui_references['lag_overlay_lbl'] = tk.Label(
+        footer_bar, text="⏱ lag —", font=scaled_font('Consolas', 8),
+        bg=THEME['bg_card'], fg=THEME['fg_secondary'], padx=4, cursor='hand2'
+    )
+    ui_references['lag_overlay_lbl'].bind("<Button-1>", lambda e: toggle_lag_overlay(root))
+
     def _set_flipper_ui(connected):
         """Update Fix Score buttons and footer indicator to reflect connection state."""
         lbl = ui_references.get('flipper_status_lbl')
@@ -1388,6 +1943,13 @@ def setup_scoreboard(root, team_red_placeholder, team_blue_placeholder):
 
     threading.Thread(target=_initial_flipper_check, daemon=True).start()
 
+    # Per-point event stream; puts a crashed match's score back (see Point Events)
+    watch_point_events()
+
+    # Spectator page on the LAN (see Live Results Server)
+    if LIVE_ENABLED:
+        start_live_updates(root)
+
 def update_schedule_tab():
     """
     Refreshes the Schedule tab.
@@ -1407,6 +1969,25 @@ def update_schedule_tab():
             return "TBD"
         return " / ".join(TEAM_ROSTERS.get(team, [team, team]))
 
+    # --- SECTION 0: STANDINGS (round robin / Swiss only) ---
+    if TOURNAMENT_FORMAT in LEAGUE_FORMATS and TOURNAMENT_STATE:
+        tk.Label(schedule_content_frame, text="STANDINGS", font=THEME['font_bold'],
+                 fg=THEME['accent_gold'], bg=THEME['bg_main'], pady=10).pack()
+
+        for place, row in enumerate(league_standings(TOURNAMENT_STATE, get_compiled_bracket()), start=1):
+            f = tk.Frame(schedule_content_frame, bg=THEME['bg_card'], padx=10, pady=4)
+            f.pack(fill='x', padx=20, pady=2)
+
+            tk.Label(f, text=f"{place}.", font=scaled_font('Selawik', 9, 'bold'),
+                     fg=THEME['fg_secondary'], bg=THEME['bg_card']).pack(side='left')
+            tk.Label(f, text=get_roster_text(row['team']), font=scaled_font('Selawik', 10, 'bold'),
+                     fg=THEME['fg_primary'], bg=THEME['bg_card']).pack(side='left', padx=15)
+            record = f"{row['wins']}-{row['losses']}"
+            if row['byes']:
+                record += f"  ({row['byes']} bye)"
+            tk.Label(f, text=record, font=scaled_font('Selawik', 10, 'bold'),
+                     fg=THEME['accent_gold'], bg=THEME['bg_card']).pack(side='right')
+
     # --- SECTION 1: ON DECK (Upcoming) ---
     tk.Label(schedule_content_frame, text="UPCOMING MATCHES", font=THEME['font_bold'],
              fg=THEME['accent_gold'], bg=THEME['bg_main'], pady=10).pack()
@@ -1499,9 +2080,12 @@ def update_roster_seeding_vertical():
     table.grid_columnconfigure(1, weight=3)  # Team / Players
     table.grid_columnconfigure(2, weight=0)  # W-L
     table.grid_columnconfigure(3, weight=0)  # Win %
+    table.grid_columnconfigure(4, weight=0)  # Elo
+
+    ratings = get_player_ratings()
 
     # ---- Header Row ----
-    headers = ["Status", "Team / Players", "W-L", "Win%"]
+    headers = ["Status", "Team / Players", "W-L", "Win%", "Elo"]
     for col, text in enumerate(headers):
         tk.Label(
             table,
@@ -1514,7 +2098,7 @@ def update_roster_seeding_vertical():
 
     # Divider
     tk.Frame(table, bg=THEME['bg_main'], height=2)\
-        .grid(row=1, column=0, columnspan=4, sticky='ew', pady=(0, 6))
+        .grid(row=1, column=0, columnspan=5, sticky='ew', pady=(0, 6))
 
     # ---- Team Rows ----
     row_index = 2
@@ -1543,6 +2127,7 @@ def update_roster_seeding_vertical():
 
         roster = TEAM_ROSTERS.get(team, ['?', '?'])
         team_text = f"{roster[0]} & {roster[1]}"
+        team_elo = sum(ratings.get(_player_key(p), DEFAULT_PLAYER_RATING) for p in roster) / len(roster)
 
         # Seed
         tk.Label(
@@ -1576,6 +2161,14 @@ def update_roster_seeding_vertical():
             anchor='e'
         ).grid(row=row_index, column=3, sticky='e', padx=35, pady=7)
 
+        # Elo (team average of career ratings)
+        tk.Label(
+            table, text=f"{team_elo:.0f}",
+            font=scaled_font('Consolas', 10),
+            bg=bg_col, fg=fg_secondary,
+            anchor='e'
+        ).grid(row=row_index, column=4, sticky='e', padx=35, pady=7)
+
         row_index += 1
 
 def update_payout_footer_display():
@@ -1770,6 +2363,7 @@ def format_seconds(seconds):
         return f"{hours}:{mins:02d}:{secs:02d}"
     return f"{mins:02d}:{secs:02d}"
 
+@traced()
 def update_scoreboard_display():
     """Redesigned update logic for the new Card UI."""
     global team_labels, player_labels_ref, TOURNAMENT_STATE, status_label, current_match_teams
@@ -1832,7 +2426,7 @@ def update_scoreboard_display():
     # Show only on G1, no completed matches, AND the N+1 bracket keeps G1 seeding intact
     if ui_references.get('late_entry_btn'):
         show_btn = False
-        if match_id == 'G1' and not MATCH_HISTORY:
+        if match_id == 'G1' and not MATCH_HISTORY and TOURNAMENT_FORMAT == 'D':
             try:
                 n = len(TEAMS)
                 curr_config, _ = load_bracket_config(n, 'D')
@@ -1981,36 +2575,12 @@ def load_match_data_and_teams():
 
     update_scoreboard_display()
 
-def run_replay_mode(path):
-    global REPLAY_FILEPATH, REPLAY_MODE, REPLAY_VIEW_ONLY
-    global main_root, TEAMS, TEAM_ROSTERS, TOURNAMENT_STATE, TOURNAMENT_RANKINGS, PRIZES
-
-    reset_global_state()
-    REPLAY_MODE = True
-    REPLAY_VIEW_ONLY = False
-
-    log_message(f"Loading replay file: {path}")
-
-    # Load last snapshot
-    try:
-        snap = _find_last_snapshot_in_file(path)
-    except Exception as e:
-        print(f"Replay error: {e}")
-        messagebox.showerror("Replay Error", f"Could not load file: {e}")
-        return
-
-    if not snap:
-        print("Replay file contains no SNAPSHOT entries.")
-        sys.exit(1)
-
-    # Validate minimal structure
-    required_keys = ("teams", "rosters", "state", "active_match_id")
-    for key in required_keys:
-        if key not in snap:
-            print(f"Snapshot missing required field '{key}'. Cannot continue.")
-            sys.exit(1)
+def restore_snapshot(snap):
+    """Loads a SNAPSHOT record into the tournament globals (no UI). Returns the active match id."""
+    global TOURNAMENT_FORMAT
 
-    # Load tournament basic data
+    # Load tournament basic data (snapshots predating formats are double elimination)
+    TOURNAMENT_FORMAT = snap.get("format", "D")
     TEAMS[:] = snap.get("teams", [])
     TEAM_ROSTERS.clear()
     TEAM_ROSTERS.update(snap.get("rosters", {}))
@@ -2021,18 +2591,9 @@ def run_replay_mode(path):
     MATCH_DURATIONS.clear()
     MATCH_DURATIONS.extend(snap.get("match_durations", []))
 
-    # Replay snapshots don't store the prize structure, so recompute it
-    # from the bracket config for this team count (best-effort; payout
-    # footer just stays blank if this fails).
-    PRIZES.clear()
-    try:
-        _, replay_prizes = load_bracket_config(len(TEAMS), 'D')
-        PRIZES.update(replay_prizes or {})
-    except Exception as e:
-        log_message(f"Could not restore prize info for replay: {e}", "WARN")
-
     # Restore match-level state including champion
     TOURNAMENT_STATE.clear()
+    invalidate_compiled_bracket()
     raw_state = snap.get("state", {})
     for mid, m in raw_state.items():
         config = {}
@@ -2053,6 +2614,7 @@ def run_replay_mode(path):
             "champion": m.get("champion"),      # ADDED RESTORE
             "is_winnerbracket": m.get("is_winnerbracket", "unknown"),  # ADDED RESTORE
             "start_time": m.get("start_time"),
+            "duration": m.get("duration"),
             "red_score": m.get("red_score"),    # restored for bracket score display
             "blue_score": m.get("blue_score"),
             "config": config,
@@ -2061,6 +2623,49 @@ def run_replay_mode(path):
     # Restore active match
     active = snap.get("active_match_id")
     TOURNAMENT_STATE["active_match_id"] = active
+    return active
+
+def run_replay_mode(path):
+    global REPLAY_FILEPATH, REPLAY_MODE, REPLAY_VIEW_ONLY
+    global main_root, TEAMS, TEAM_ROSTERS, TOURNAMENT_STATE, TOURNAMENT_RANKINGS, PRIZES
+    global TOURNAMENT_FORMAT
+
+    reset_global_state()
+    REPLAY_MODE = True
+    REPLAY_VIEW_ONLY = False
+
+    log_message(f"Loading replay file: {path}")
+
+    # Load last snapshot
+    try:
+        snap = _find_last_snapshot_in_file(path)
+    except Exception as e:
+        print(f"Replay error: {e}")
+        messagebox.showerror("Replay Error", f"Could not load file: {e}")
+        return
+
+    if not snap:
+        print("Replay file contains no SNAPSHOT entries.")
+        sys.exit(1)
+
+    # Validate minimal structure
+    required_keys = ("teams", "rosters", "state", "active_match_id")
+    for key in required_keys:
+        if key not in snap:
+            print(f"Snapshot missing required field '{key}'. Cannot continue.")
+            sys.exit(1)
+
+    active = restore_snapshot(snap)
+
+    # Replay snapshots don't store the prize structure, so recompute it
+    # from the bracket config for this team count (best-effort; payout
+    # footer just stays blank if this fails).
+    PRIZES.clear()
+    try:
+        _, replay_prizes = load_bracket_config(len(TEAMS), TOURNAMENT_FORMAT)
+        PRIZES.update(replay_prizes or {})
+    except Exception as e:
+        log_message(f"Could not restore prize info for replay: {e}", "WARN")
 
     # Determine if tournament completed
     is_complete = (
@@ -2120,20 +2725,40 @@ def run_replay_mode(path):
     root.mainloop()
     sys.exit(0)
 
+def save_trace_snapshot(path=None):
+    """Exports the trace buffer (default logs/trace_<timestamp>.json) and logs where it went."""
+    path = path or os.path.join(LOG_DIR, f"trace_{datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.json")
+    try:
+        count = export_trace(path)
+        log_message(f"Performance trace saved: {path} ({count} spans)")
+    except Exception as e:
+        log_message(f"Could not save performance trace: {e}", "ERROR")
+
 def on_close(root):
     """Handles clean exit when the window or the console is closed/interrupted."""
     global main_root
-    global LOG_FILE_HANDLE
 
     log_message("Application close requested")
     flipper_disconnect()
-
-    if LOG_FILE_HANDLE:
-        try:
-            LOG_FILE_HANDLE.close()
-            print("[Log Manager] Log file closed on exit.")
-        except:
-            pass
+    shutdown_pdf_worker()
+    stop_live_server()
+    flush_point_events()
+
+    if TRACE_ENABLED and TRACE_BUFFER:
+        for name, (count, total_ms, max_ms) in trace_summary().items():
+            log_message(f"Trace {name}: {count} calls, {total_ms:.0f} ms total, "
+                        f"{total_ms / count:.1f} ms avg, {max_ms:.1f} ms max", "DEBUG")
+        if os.environ.get('SB_TRACE_FILE'):
+            save_trace_snapshot(os.environ['SB_TRACE_FILE'])
+
+    if LEAK_CHECK_ENABLED:
+        log_leak_report()
+
+    # Drain everything queued, then let the writer close the file
+    set_log_file(None)
+    flush_logs()
+    if LOG_GAME_TO_FILE:
+        print("[Log Manager] Log file closed on exit.")
 
     try:
         if root:
@@ -2146,7 +2771,6 @@ def on_close(root):
 def show_title_screen():
     """Displays a title image, Load Game button, and New Game button."""
     import tkinter as tk
-    from PIL import Image, ImageTk
 
     splash = tk.Tk()
     splash.title("Moose Lodge Shuffleboard ")
@@ -2154,14 +2778,32 @@ def show_title_screen():
     splash.geometry(scaled_geo(500, 550))
     splash.configure(bg=THEME['bg_main'])
 
-    try:
-        img = Image.open("img/title.png")
-        img = img.resize((SF(480), SF(300)), Image.LANCZOS)
-        logo = ImageTk.PhotoImage(img)
-        tk.Label(splash, image=logo, bg=THEME['bg_main']).pack(pady=20)
-    except Exception as e:
-        tk.Label(splash, text="Moose Lodge Shuffleboard ", fg=THEME['fg_primary'], bg=THEME['bg_main'], font=scaled_font("Arial", 20, "bold")).pack(pady=60)
-        print(f"[Title Screen] Could not load image: {e}")
+    # The logo is loaded once the window is up: PIL is the slowest import on
+    # the start-up path, so the rest of the screen is not kept waiting for it.
+    logo_frame = tk.Frame(splash, width=SF(480), height=SF(300), bg=THEME['bg_main'])
+    logo_frame.pack_propagate(False)
+    logo_frame.pack(pady=20)
+
+    def load_logo():
+        try:
+            from PIL import Image, ImageTk
+            img = Image.open("img/title.png")
+            img = img.resize((SF(480), SF(300)), Image.LANCZOS)
+            logo = ImageTk.PhotoImage(img)
+            label = tk.Label(logo_frame, image=logo, bg=THEME['bg_main'])
+            label.image = logo
+            label.pack(expand=True)
+        except Exception as e:
+            tk.Label(logo_frame, text="Moose Lodge Shuffleboard ", fg=THEME['fg_primary'], bg=THEME['bg_main'], font=scaled_font("Arial", 20, "bold")).pack(expand=True)
+            print(f"[Title Screen] Could not load image: {e}")
+        startup_mark('logo')
+        log_startup_report()
+
+    def on_first_map(event):
+        if event.widget is splash and 'title_visible' not in dict(STARTUP_MARKS):
+            startup_mark('title_visible')
+            splash.after_idle(load_logo)
+    splash.bind('<Map>', on_first_map)
 
     tk.Label(
         splash,
@@ -2211,12 +2853,24 @@ def show_title_screen():
         height=1
     ).pack(pady=SF(10), fill="x", padx=SF(50))
 
+    startup_mark('title_built')
     splash.mainloop()
 
 # --- Winnings Calculation (Retained for fallback only) ---
 
+# Match-id -> sort position. Match ids are a small fixed vocabulary, so the
+# parse below only ever runs once per id instead of once per comparison.
+_MATCH_ORDER_CACHE = {}
+
 def sort_match_keys(k):
     """Sorts match keys (G1, G2... G7, GF, GGF) numerically, handling non-numeric games safely."""
+    order = _MATCH_ORDER_CACHE.get(k)
+    if order is None:
+        order = _MATCH_ORDER_CACHE[k] = _match_order(k)
+    return order
+
+def _match_order(k):
+    """Uncached sort position for a single match key (see sort_match_keys)."""
     if k.startswith('G'):
         try:
             # Handle G1 through G99
@@ -2249,9 +2903,9 @@ def _parse_json_destination(dest_data):
     if 'result' in dest_data:
         res = dest_data['result']
 
-        if res == 'ELIMINATED':
+        if res in ('ELIMINATED', 'PLACED'):
             rank = dest_data.get('rank', 'N/A').upper()
-            return f"ELIMINATED[{rank}]"
+            return f"{res}[{rank}]"
 
         return res
 
@@ -2287,10 +2941,23 @@ def _parse_json_config_content(json_content):
 
 # --- Dynamic Config Loading ---
 
+# (num_teams, elimination_type) -> (state, prizes) as built by the loader.
+# Callers mutate what they get back, so hits are handed out as deep copies.
+_BRACKET_CONFIG_CACHE = {}
+
 def load_bracket_config(num_teams, elimination_type='D'):
     """
     Reads the bracket configuration from a local .json file.
+    Results are cached per bracket size; every call returns a private copy.
     """
+    key = (num_teams, elimination_type)
+    if key not in _BRACKET_CONFIG_CACHE:
+        _BRACKET_CONFIG_CACHE[key] = _load_bracket_config_uncached(num_teams, elimination_type)
+    state, prizes = _BRACKET_CONFIG_CACHE[key]
+    return copy.deepcopy(state), dict(prizes)
+
+def _load_bracket_config_uncached(num_teams, elimination_type):
+    """Reads and finals-patches one bracket config file (see load_bracket_config)."""
     base_filename = f"{num_teams}team{elimination_type}.json"
     search_paths = [base_filename, os.path.join('data', base_filename)]
 
@@ -2314,10 +2981,22 @@ def load_bracket_config(num_teams, elimination_type='D'):
                 raise ValueError(f"Error parsing '{filepath}': {e}")
 
     if not json_loaded:
+        if elimination_type in BRACKET_GENERATORS:
+            state = BRACKET_GENERATORS[elimination_type](num_teams)
+            log_message(f"Generated {TOURNAMENT_FORMATS[elimination_type]} schedule "
+                        f"for {num_teams} teams ({len(state)} matches)")
+            return state, _default_prizes(num_teams)
         err_msg = f"Configuration file '{base_filename}' not found."
         log_message(f"Bracket config error: {err_msg}", "ERROR")
         raise FileNotFoundError(err_msg)
 
+    # Only double elimination uses the GF/GGF bracket-reset pair
+    if elimination_type == 'D':
+        _inject_finals(state)
+    return state, prizes
+
+def _inject_finals(state):
+    """Rewires a parsed double-elimination config onto the standard GF/GGF pair (in place)."""
     # --- PATCH: AUTO-INJECT FINALS LOGIC ---
     WB_FINAL_ID = None
     LB_FINAL_ID = None
@@ -2350,7 +3029,250 @@ def load_bracket_config(num_teams, elimination_type='D'):
         'is_winnerbracket': 'both'
     }
     log_message(f"Finals injected — GF linked from {WB_FINAL_ID} & {LB_FINAL_ID}", "DEBUG")
-    return state, prizes
+
+# =============================================================================
+# --- Compiled Bracket ---
+# Configs (and the live TOURNAMENT_STATE) describe routing with match-id
+# strings: ('G4', 1), "ELIMINATED[3RD]", "CHAMPION", ... compile_bracket()
+# resolves all of that once into parallel lists indexed by match position so
+# the engine and the renderers only ever do list lookups.
+# =============================================================================
+
+DEST_NONE     = -1   # no onward match (eliminated, conditional, unknown)
+DEST_CHAMPION = -2   # result crowns the champion
+
+SIDE_WB     = 0
+SIDE_LB     = 1
+SIDE_FINALS = 2
+
+_COMPILED_BRACKET = None   # compiled view of TOURNAMENT_STATE, built on demand
+
+def _rank_code(label):
+    """'3RD' -> 3. Returns 0 when the label carries no usable place number."""
+    digits = ''
+    for ch in label:
+        if not ch.isdigit():
+            break
+        digits += ch
+    return int(digits) if digits else 0
+
+def compile_bracket(config):
+    """
+    Compiles a bracket into dense arrays.
+
+    `config` may be a parsed config from load_bracket_config() or a state
+    dict shaped like TOURNAMENT_STATE (entries carrying a 'config' sub-dict).
+    Returns a dict of parallel lists, all indexed by play order:
+
+      ids, index          match id <-> position
+      w_dest, w_slot      winner's next match position + slot (or DEST_*)
+      l_dest, l_slot      loser's next match position + slot (or DEST_*)
+      w_rank, l_rank      place code the winner/loser finishes on (0 = none)
+      rank_labels         place code -> TOURNAMENT_RANKINGS key ('3RD')
+      side                SIDE_WB / SIDE_LB / SIDE_FINALS
+      num                 numeric part of the id (G7 -> 7, 0 for finals)
+      round               configured M_round (0 = not set)
+      bye                 True for league bye slots
+      format              TOURNAMENT_FORMATS key the matches were built for
+      dangling            (match_id, key, target) routes to unknown matches
+      feeders             per match, [(src position, 'W'/'L', slot), ...]
+      reach               per match, bitmask of every match a team sitting
+                          in it can still play (itself included)
+    """
+    ids = sorted((k for k, v in config.items() if isinstance(v, dict)), key=sort_match_keys)
+    index = {mid: i for i, mid in enumerate(ids)}
+    n = len(ids)
+
+    compiled = {
+        'ids': ids,
+        'index': index,
+        'w_dest': [DEST_NONE] * n,
+        'w_slot': [0] * n,
+        'l_dest': [DEST_NONE] * n,
+        'l_slot': [0] * n,
+        'w_rank': [0] * n,
+        'l_rank': [0] * n,
+        'rank_labels': {},
+        'side': [SIDE_WB] * n,
+        'num': [0] * n,
+        'round': [0] * n,
+        'bye': [False] * n,
+        'format': 'D',
+        'dangling': [],
+    }
+
+    for i, mid in enumerate(ids):
+        entry = config[mid]
+        cfg = entry.get('config', entry)
+
+        for key, dests, slots, ranks in (
+                ('W_next', compiled['w_dest'], compiled['w_slot'], compiled['w_rank']),
+                ('L_next', compiled['l_dest'], compiled['l_slot'], compiled['l_rank'])):
+            dest = cfg.get(key)
+            if isinstance(dest, (tuple, list)) and len(dest) == 2:
+                target = dest[0]
+                if target in index:
+                    dests[i] = index[target]
+                    slots[i] = int(dest[1])
+                elif target == 'CHAMPION':
+                    dests[i] = DEST_CHAMPION
+                else:
+                    compiled['dangling'].append((mid, key, target))
+            elif dest == 'CHAMPION':
+                dests[i] = DEST_CHAMPION
+            elif isinstance(dest, str) and dest.startswith(('ELIMINATED[', 'PLACED[')):
+                label = dest[dest.index('[') + 1:-1]
+                code = _rank_code(label)
+                if code:
+                    ranks[i] = code
+                    compiled['rank_labels'][code] = label
+
+        bt = entry.get('is_winnerbracket', 'unknown')
+        if bt == 'both' or mid in ('GF', 'GGF'):
+            compiled['side'][i] = SIDE_FINALS
+        elif bt in ('false', False):
+            compiled['side'][i] = SIDE_LB
+
+        digits = mid[1:].split('_')[0] if mid.startswith('G') else ''
+        compiled['num'][i] = int(digits) if digits.isdigit() else 0
+        compiled['round'][i] = cfg.get('M_round') or 0
+        compiled['bye'][i] = bool(cfg.get('bye'))
+        if 'format' in cfg:
+            compiled['format'] = cfg['format']
+
+    # Reverse index: which results feed each match.
+    feeders = [[] for _ in range(n)]
+    for i in range(n):
+        if compiled['w_dest'][i] >= 0:
+            feeders[compiled['w_dest'][i]].append((i, 'W', compiled['w_slot'][i]))
+        if compiled['l_dest'][i] >= 0:
+            feeders[compiled['l_dest'][i]].append((i, 'L', compiled['l_slot'][i]))
+    compiled['feeders'] = feeders
+
+    # Forward closure. Routing may point "backwards" in id order (GF sorts
+    # last), so resolve with an explicit stack rather than a reverse sweep.
+    reach = [0] * n
+    for start in range(n):
+        stack = [(start, False)]
+        while stack:
+            i, expanded = stack.pop()
+            if reach[i]:
+                continue
+            nexts = [d for d in (compiled['w_dest'][i], compiled['l_dest'][i]) if d >= 0]
+            if expanded:
+                mask = 1 << i
+                for d in nexts:
+                    mask |= reach[d]
+                reach[i] = mask
+            else:
+                stack.append((i, True))
+                stack.extend((d, False) for d in nexts if not reach[d] and d != i)
+    compiled['reach'] = reach
+
+    if compiled['dangling']:
+        log_message(f"Compiled bracket has routes to unknown matches: {compiled['dangling']}", "DEBUG")
+    return compiled
+
+def get_compiled_bracket():
+    """Returns the compiled view of TOURNAMENT_STATE, compiling it on first use."""
+    global _COMPILED_BRACKET
+    if _COMPILED_BRACKET is None:
+        _COMPILED_BRACKET = compile_bracket(TOURNAMENT_STATE)
+    return _COMPILED_BRACKET
+
+def invalidate_compiled_bracket():
+    """Drops the compiled view; call whenever matches are added to or removed from TOURNAMENT_STATE."""
+    global _COMPILED_BRACKET
+    _COMPILED_BRACKET = None
+
+def get_possible_teams(match_id, slot):
+    """
+    Returns the set of teams that can still end up in `slot` of `match_id`,
+    walking the feeder index back through undecided matches.
+    """
+    compiled = get_compiled_bracket()
+    if match_id not in compiled['index']:
+        return set()
+
+    teams = set()
+    stack = [(compiled['index'][match_id], slot)]
+    seen = set()
+    while stack:
+        i, s = stack.pop()
+        if (i, s) in seen:
+            continue
+        seen.add((i, s))
+        seated = TOURNAMENT_STATE[compiled['ids'][i]]['teams'][s]
+        if seated:
+            teams.add(seated)
+            continue
+        for src, kind, src_slot in compiled['feeders'][i]:
+            if src_slot != s:
+                continue
+            src_data = TOURNAMENT_STATE[compiled['ids'][src]]
+            if src_data.get('winner'):
+                # Decided but not yet propagated only happens mid-resolution;
+                # the result is already known either way.
+                a, b = src_data['teams']
+                teams.add(src_data['winner'] if kind == 'W' else (b if src_data['winner'] == a else a))
+            else:
+                stack.append((src, 0))
+                stack.append((src, 1))
+    return teams
+
+def get_possible_opponents(team_name):
+    """
+    Returns (match_id, opponents) for the team's next unplayed match, where
+    opponents is every team that could still fill the other slot.
+    Returns (None, set()) if the team has nothing left to play.
+    """
+    for mid in get_compiled_bracket()['ids']:
+        data = TOURNAMENT_STATE[mid]
+        if data.get('winner') is None and team_name in data['teams']:
+            other = 1 - data['teams'].index(team_name)
+            return mid, get_possible_teams(mid, other)
+    return None, set()
+
+def get_team_reach(team_name):
+    """Match ids (play order) the team can still appear in, from its next unplayed match onwards."""
+    compiled = get_compiled_bracket()
+    for i, mid in enumerate(compiled['ids']):
+        data = TOURNAMENT_STATE[mid]
+        if data.get('winner') is None and team_name in data['teams']:
+            mask = compiled['reach'][i]
+            return [m for j, m in enumerate(compiled['ids']) if mask >> j & 1]
+    return []
+
+def get_team_path(team_name, match_id):
+    """
+    Match ids (play order) the team played on its way into `match_id`,
+    found by walking the feeder index backwards. `match_id` is included.
+    """
+    compiled = get_compiled_bracket()
+    if match_id not in compiled['index']:
+        return []
+
+    path = []
+    i = compiled['index'][match_id]
+    while i is not None:
+        path.append(compiled['ids'][i])
+        teams = TOURNAMENT_STATE[compiled['ids'][i]]['teams']
+        if team_name not in teams:
+            break
+        prev = fallback = None
+        for src, kind, _slot in compiled['feeders'][i]:
+            src_data = TOURNAMENT_STATE[compiled['ids'][src]]
+            if team_name not in src_data['teams'] or not src_data.get('winner'):
+                continue
+            if (src_data['winner'] == team_name) == (kind == 'W'):
+                prev = src
+                break
+            # GF -> GGF seats both finalists regardless of the configured
+            # route, so accept the latest decided feeder the team played in.
+            fallback = src if fallback is None else max(fallback, src)
+        i = prev if prev is not None else fallback
+    path.reverse()
+    return path
 
 def calculate_dynamic_coords(state):
     """
@@ -2694,94 +3616,66 @@ def resolve_team_name(team_ref):
 
 
 
-def draw_large_bracket(canvas):
-    """
-    Modern full-bracket layout.
+# Lane colours: (banner, lane tint, connector line)
+BRACKET_LANE_COLORS = {
+    SIDE_WB:     ('#1565C0', '#1E3A5F', '#42A5F5'),   # deep blue
+    SIDE_LB:     ('#B71C1C', '#3B1010', '#EF5350'),   # deep red
+    SIDE_FINALS: ('#E65100', '#3E1F00', '#FFA726'),   # deep amber
+}
+BRACKET_CROSS_LINE = '#78909C'   # dashed connectors between lanes
 
-    Visual upgrades over the old version:
-    - Color-coded lane banners (blue WB / red LB / gold Finals)
-    - Per-column "Round N" labels so the bracket reads like a traditional draw sheet
-    - Taller match boxes to accommodate the two-row team + roster layout
-    - Rounded-corner boxes with drop shadows (via draw_match_box_internal)
-    - Connector lines colored to match the lane they originate from
-    - Score badges inside completed boxes
+def bracket_layout(state, compiled, canvas_w):
     """
-    global TEAM_ROSTERS, REPLAY_VIEW_ONLY, TOURNAMENT_RANKINGS, TOURNAMENT_STATE
+    Geometry of the full bracket for a TOURNAMENT_STATE-shaped dict, in
+    canvas pixels and without touching Tk: lane bands with their round
+    columns, one box per match, and a connector for every decided result.
+    draw_large_bracket() paints it on a canvas; bracket_svg() writes it as SVG.
+
+    Returns {'lanes': [...], 'boxes': {mid: (x, y, w, h)}, 'connectors':
+    [(points, colour, dashed)], 'width', 'height'}; each lane is a dict with
+    'side', 'section', 'title', 'y', 'w', 'h', 'banner_h', 'colors' and
+    'rounds' = [(label, label_x, label_y, [match ids])].
+    """
+    # ── Layout constants ─────────────────────────────────────────────────────
+    canvas_w   = max(SF(620), canvas_w)
+    side_pad   = SF(24)
+    top_pad    = SF(16)
+    match_w    = SF(220)
+    match_h    = SF(68)      # taller to fit two-row layout
+    col_gap    = SF(32)
+    row_gap    = SF(18)
+    banner_h   = SF(28)      # colored lane banner height
+    round_h    = SF(20)      # "Round N" label height below banner
+    section_gap= SF(36)      # vertical gap between lane sections
 
-    canvas.delete('all')
-    canvas.configure(bg=THEME['bg_canvas'])
-    canvas.update_idletasks()
-
-    if not TOURNAMENT_STATE:
-        return
+    col_step = match_w + col_gap
 
     # ── Categorise matches ───────────────────────────────────────────────────
-    wb_matches     = {}
-    lb_matches     = {}
-    finals_matches = {}
-
-    for mid, md in TOURNAMENT_STATE.items():
-        if not isinstance(md, dict) or 'teams' not in md:
-            continue
-        bt = md.get('is_winnerbracket', 'unknown')
-        if bt == 'both' or mid in ('GF', 'GGF'):
-            finals_matches[mid] = md
-        elif bt in ('false', False):
-            lb_matches[mid] = md
-        elif bt in ('true', True):
-            wb_matches[mid] = md
-        else:
-            wb_matches[mid] = md
-
-    # ── Layout constants ─────────────────────────────────────────────────────
-    canvas_w   = max(SF(620), canvas.winfo_width())
-    side_pad   = SF(24)
-    top_pad    = SF(16)
-    match_w    = SF(220)
-    match_h    = SF(68)      # taller to fit two-row layout
-    col_gap    = SF(32)
-    row_gap    = SF(18)
-    banner_h   = SF(28)      # colored lane banner height
-    round_h    = SF(20)      # "Round N" label height below banner
-    section_gap= SF(36)      # vertical gap between lane sections
+    lanes = {SIDE_WB: {}, SIDE_LB: {}, SIDE_FINALS: {}}
+    for i, mid in enumerate(compiled['ids']):
+        if 'teams' in state[mid]:
+            lanes[compiled['side'][i]][mid] = state[mid]
 
-    col_step = match_w + col_gap
-
-    # ── Lane colours ─────────────────────────────────────────────────────────
-    WB_COLOR     = '#1565C0'   # deep blue
-    WB_LIGHT     = '#1E3A5F'   # dark-blue tint for lane bg
-    WB_LINE      = '#42A5F5'   # connector line
-    LB_COLOR     = '#B71C1C'   # deep red
-    LB_LIGHT     = '#3B1010'
-    LB_LINE      = '#EF5350'
-    FIN_COLOR    = '#E65100'   # deep amber
-    FIN_LIGHT    = '#3E1F00'
-    FIN_LINE     = '#FFA726'
-
-    # ── Helper: sort match IDs, group into rounds ────────────────────────────
-    def _sorted_ids(matches):
-        return sorted(matches.keys(), key=sort_match_keys)
-
-    def _group_into_rounds(sorted_ids):
+    def _group_into_rounds(ids):
         """
         Assign each match to a visual 'round column'.
         For standard G-numbered matches we use the numeric part bucketed by 2
         (G1/G2 → R1, G3/G4 → R2, …).  GF and GGF always go into their own columns.
         """
         round_map = {}   # match_id → round_index (0-based)
-        for mid in sorted_ids:
+        for mid in ids:
             if mid == 'GGF':
                 round_map[mid] = 999
             elif mid == 'GF':
                 round_map[mid] = 998
-            elif mid.startswith('G'):
-                try:
-                    n = int(mid[1:])
-                    round_map[mid] = (n - 1) // 2
-                except ValueError:
-                    round_map[mid] = 0
             else:
-                round_map[mid] = 0
+                i = compiled['index'][mid]
+                if compiled['round'][i]:
+                    # Generated formats know their rounds exactly
+                    round_map[mid] = compiled['round'][i] - 1
+                else:
+                    n = compiled['num'][i]
+                    round_map[mid] = (n - 1) // 2 if n else 0
         # Re-index so rounds are 0, 1, 2, …
         unique = sorted(set(round_map.values()))
         remap  = {v: i for i, v in enumerate(unique)}
@@ -2791,6 +3685,8 @@ def draw_large_bracket(canvas):
         """Human-readable round name."""
         if section == 'finals':
             return {0: 'Grand Final', 1: 'Grand Final Reset'}.get(round_idx, 'Finals')
+        if compiled['format'] in LEAGUE_FORMATS:
+            return f'Round {round_idx + 1}'
         if total_rounds == 1:
             return 'Match'
         remaining = total_rounds - round_idx
@@ -2802,178 +3698,149 @@ def draw_large_bracket(canvas):
             return 'Quarter-Final'
         return f'Round {round_idx + 1}'
 
-    # ── Draw one lane section, return next y_cursor ──────────────────────────
-    def draw_lane(section, matches, banner_color, lane_bg, line_color, y_start):
-        if not matches:
-            return y_start
-
-        ids        = _sorted_ids(matches)
+    layout = {'lanes': [], 'boxes': {}, 'connectors': [], 'width': canvas_w}
+    y = top_pad
+    for side, section in ((SIDE_WB, 'wb'), (SIDE_LB, 'lb'), (SIDE_FINALS, 'finals')):
+        # Lane dicts are filled in compiled (play) order, so their keys are already sorted.
+        ids = list(lanes[side])
+        if not ids:
+            continue
         round_map  = _group_into_rounds(ids)
         num_rounds = max(round_map.values()) + 1
 
-        # Group IDs by round
         by_round = {}
         for mid in ids:
-            r = round_map[mid]
-            by_round.setdefault(r, []).append(mid)
+            by_round.setdefault(round_map[mid], []).append(mid)
 
-        # Calculate total canvas height needed for this lane
+        # Total height needed for this lane
         max_in_col = max(len(v) for v in by_round.values())
         lane_h = (banner_h + round_h
                   + max_in_col * (match_h + row_gap)
                   + section_gap)
+        lane_w = max(canvas_w, num_rounds * col_step - col_gap + side_pad * 2)
 
-        # Lane background tint
-        lane_w = num_rounds * col_step - col_gap + side_pad * 2
-        lane_x = 0
-        canvas.create_rectangle(lane_x, y_start,
-                                 max(canvas_w, lane_w), y_start + lane_h,
-                                 fill=lane_bg, outline='', tags=('lane_bg',))
-
-        # Colored banner strip
-        canvas.create_rectangle(0, y_start, max(canvas_w, lane_w),
-                                 y_start + banner_h,
-                                 fill=banner_color, outline='')
-
-        # Banner label
-        section_title = {
+        title = {
             'wb':     "WINNER'S BRACKET",
             'lb':     "LOSER'S BRACKET",
             'finals': 'FINALS',
         }[section]
-        canvas.create_text(max(canvas_w, lane_w) // 2, y_start + banner_h // 2,
-                           text=section_title, anchor='center',
-                           fill='white',
-                           font=scaled_font('Selawik', 10, 'bold'))
+        if compiled['format'] != 'D':
+            title = TOURNAMENT_FORMATS.get(compiled['format'], title).upper()
 
-        # Per-column round labels + match boxes
-        match_positions = {}
+        rounds = []
         for r in range(num_rounds):
-            col_x      = side_pad + r * col_step
-            label_y    = y_start + banner_h
-            content_y  = label_y + round_h
-
-            # Round label
-            total_rounds_this_section = num_rounds
-            rl = _round_label(section, r, total_rounds_this_section)
-            canvas.create_text(col_x + match_w // 2, label_y + round_h // 2,
-                               text=rl, anchor='center',
-                               fill='#B0BEC5',
-                               font=scaled_font('Selawik', 8))
-
-            # Boxes in this column
-            col_ids = by_round.get(r, [])
-            for row_idx, mid in enumerate(col_ids):
-                bx = col_x
-                by = content_y + row_idx * (match_h + row_gap)
-                match_positions[mid] = {'x': bx, 'y': by, 'w': match_w, 'h': match_h}
-                draw_match_box_internal(canvas, mid, matches[mid], bx, by, match_w, match_h)
-
-        # Connection lines between completed boxes
-        for src_id, src_info in match_positions.items():
-            src_match = TOURNAMENT_STATE.get(src_id, {})
-            winner = src_match.get('winner') or src_match.get('champion')
-            if not winner:
-                continue
-            for dst_id, dst_info in match_positions.items():
-                dst_match = TOURNAMENT_STATE.get(dst_id, {})
-                for slot_idx, team_ref in enumerate(dst_match.get('teams', [None, None])):
-                    if (isinstance(team_ref, str)
-                            and team_ref.startswith('W:')
-                            and team_ref[2:] == src_id):
-                        sx = src_info['x'] + src_info['w']
-                        sy = src_info['y'] + src_info['h'] / 2
-                        dx = dst_info['x']
-                        dy = (dst_info['y'] + dst_info['h'] / 4
-                              if slot_idx == 0
-                              else dst_info['y'] + 3 * dst_info['h'] / 4)
-                        mx = (sx + dx) / 2
-                        canvas.create_line(sx, sy, mx, sy, mx, dy, dx, dy,
-                                           fill=line_color,
-                                           width=max(1, SF(2)),
-                                           smooth=True)
-
-        return y_start + lane_h
-
-    # ── Draw all three lanes ─────────────────────────────────────────────────
-    y = top_pad
-    y = draw_lane('wb',     wb_matches,     WB_COLOR,  WB_LIGHT,  WB_LINE,  y)
-    y = draw_lane('lb',     lb_matches,     LB_COLOR,  LB_LIGHT,  LB_LINE,  y)
-    y = draw_lane('finals', finals_matches, FIN_COLOR, FIN_LIGHT, FIN_LINE, y)
-
-    # Cross-lane connector lines (loser drops from WB → LB, winner advances to Finals)
-    # These are drawn after all boxes exist so we can reference both lane positions.
-    # We iterate the full TOURNAMENT_STATE to find inter-lane W: references.
-    all_positions = {}
-    # Rebuild a flat position map by re-running the grouping logic (read-only)
-    def _collect_positions(matches, y_start):
-        if not matches:
-            return {}, y_start
-        ids       = _sorted_ids(matches)
-        rmap      = _group_into_rounds(ids)
-        by_round  = {}
-        for mid in ids:
-            by_round.setdefault(rmap[mid], []).append(mid)
-        max_in_col = max(len(v) for v in by_round.values())
-        lane_h = banner_h + round_h + max_in_col * (match_h + row_gap) + section_gap
-        positions = {}
-        for r, col_ids in by_round.items():
             col_x     = side_pad + r * col_step
-            content_y = y_start + banner_h + round_h
+            label_y   = y + banner_h
+            content_y = label_y + round_h
+            col_ids   = by_round.get(r, [])
             for row_idx, mid in enumerate(col_ids):
-                positions[mid] = {
-                    'x': col_x,
-                    'y': content_y + row_idx * (match_h + row_gap),
-                    'w': match_w, 'h': match_h,
-                }
-        return positions, y_start + lane_h
-
-    pos_wb, y_after_wb = _collect_positions(wb_matches, top_pad)
-    pos_lb, y_after_lb = _collect_positions(lb_matches, y_after_wb)
-    pos_fn, _          = _collect_positions(finals_matches, y_after_lb)
-    all_positions.update(pos_wb)
-    all_positions.update(pos_lb)
-    all_positions.update(pos_fn)
-
-    # Draw cross-lane lines (only for matches with a known winner)
-    for src_id, src_info in all_positions.items():
-        src_match = TOURNAMENT_STATE.get(src_id, {})
-        winner    = src_match.get('winner') or src_match.get('champion')
-        if not winner:
-            continue
-        for dst_id, dst_info in all_positions.items():
-            if dst_id == src_id:
+                layout['boxes'][mid] = (col_x, content_y + row_idx * (match_h + row_gap), match_w, match_h)
+            rounds.append((_round_label(section, r, num_rounds),
+                           col_x + match_w // 2, label_y + round_h // 2, col_ids))
+
+        layout['lanes'].append({'side': side, 'section': section, 'title': title,
+                                'y': y, 'w': lane_w, 'h': lane_h, 'banner_h': banner_h,
+                                'colors': BRACKET_LANE_COLORS[side], 'rounds': rounds})
+        layout['width'] = max(layout['width'], lane_w)
+        y += lane_h
+    layout['height'] = y
+
+    # ── Connector lines ──────────────────────────────────────────────────────
+    # Walk the feeder index: every decided result that feeds a drawn box gets
+    # a line. Winners advancing inside a lane use the lane colour; anything
+    # crossing lanes (WB losers dropping, lane winners reaching the finals)
+    # is dashed.
+    boxes = layout['boxes']
+    for dst_id, (dst_x, dst_y, _dst_w, dst_h) in boxes.items():
+        dst_idx = compiled['index'][dst_id]
+        for src_idx, kind, slot_idx in compiled['feeders'][dst_idx]:
+            src_id = compiled['ids'][src_idx]
+            if src_id not in boxes:
                 continue
-            # Skip pairs already in the same lane (handled inside draw_lane)
-            same_lane = ((src_id in wb_matches and dst_id in wb_matches) or
-                         (src_id in lb_matches and dst_id in lb_matches) or
-                         (src_id in finals_matches and dst_id in finals_matches))
-            if same_lane:
+            src_match = state[src_id]
+            if not (src_match.get('winner') or src_match.get('champion')):
                 continue
-            dst_match = TOURNAMENT_STATE.get(dst_id, {})
-            for slot_idx, team_ref in enumerate(dst_match.get('teams', [None, None])):
-                if (isinstance(team_ref, str)
-                        and team_ref.startswith('W:')
-                        and team_ref[2:] == src_id):
-                    sx = src_info['x'] + src_info['w']
-                    sy = src_info['y'] + src_info['h'] / 2
-                    dx = dst_info['x']
-                    dy = (dst_info['y'] + dst_info['h'] / 4
-                          if slot_idx == 0
-                          else dst_info['y'] + 3 * dst_info['h'] / 4)
-                    mx = (sx + dx) / 2
-                    canvas.create_line(sx, sy, mx, sy, mx, dy, dx, dy,
-                                       fill='#78909C', width=max(1, SF(2)),
-                                       dash=(SF(4), SF(3)),
-                                       smooth=True)
+            src_x, src_y, src_w, src_h = boxes[src_id]
+            sx = src_x + src_w
+            sy = src_y + src_h / 2
+            dx = dst_x
+            dy = dst_y + dst_h / 4 if slot_idx == 0 else dst_y + 3 * dst_h / 4
+            mx = (sx + dx) / 2
+            points = (sx, sy, mx, sy, mx, dy, dx, dy)
+            if kind == 'W' and compiled['side'][src_idx] == compiled['side'][dst_idx]:
+                layout['connectors'].append((points, BRACKET_LANE_COLORS[compiled['side'][src_idx]][2], False))
+            else:
+                layout['connectors'].append((points, BRACKET_CROSS_LINE, True))
+    return layout
+
+@traced()
+def draw_large_bracket(canvas):
+    """
+    Modern full-bracket layout.
+
+    Visual upgrades over the old version:
+    - Color-coded lane banners (blue WB / red LB / gold Finals)
+    - Per-column "Round N" labels so the bracket reads like a traditional draw sheet
+    - Taller match boxes to accommodate the two-row team + roster layout
+    - Rounded-corner boxes with drop shadows (via draw_match_box_internal)
+    - Connector lines colored to match the lane they originate from
+    - Score badges inside completed boxes
+
+    The geometry comes from bracket_layout(); this function only paints it.
+    """
+    global TEAM_ROSTERS, REPLAY_VIEW_ONLY, TOURNAMENT_RANKINGS, TOURNAMENT_STATE
+
+    canvas.delete('all')
+    canvas.configure(bg=THEME['bg_canvas'])
+    canvas.update_idletasks()
+
+    if not TOURNAMENT_STATE:
+        return
+
+    canvas_w = max(SF(620), canvas.winfo_width())
+    layout = bracket_layout(TOURNAMENT_STATE, get_compiled_bracket(), canvas_w)
+
+    # ── Lanes: tint, banner, round labels and match boxes ────────────────────
+    for lane in layout['lanes']:
+        banner_color, lane_bg, _line = lane['colors']
+        y_start = lane['y']
+        canvas.create_rectangle(0, y_start, lane['w'], y_start + lane['h'],
+                                fill=lane_bg, outline='', tags=('lane_bg',))
+        canvas.create_rectangle(0, y_start, lane['w'], y_start + lane['banner_h'],
+                                fill=banner_color, outline='')
+        canvas.create_text(lane['w'] // 2, y_start + lane['banner_h'] // 2,
+                           text=lane['title'], anchor='center',
+                           fill='white',
+                           font=scaled_font('Selawik', 10, 'bold'))
+
+        for label, label_x, label_y, col_ids in lane['rounds']:
+            canvas.create_text(label_x, label_y,
+                               text=label, anchor='center',
+                               fill='#B0BEC5',
+                               font=scaled_font('Selawik', 8))
+            for mid in col_ids:
+                bx, by, bw, bh = layout['boxes'][mid]
+                draw_match_box_internal(canvas, mid, TOURNAMENT_STATE[mid], bx, by, bw, bh)
+
+    # ── Connector lines ──────────────────────────────────────────────────────
+    for points, color, dashed in layout['connectors']:
+        if dashed:
+            canvas.create_line(*points, fill=color, width=max(1, SF(2)),
+                               dash=(SF(4), SF(3)), tags=('connector',))
+        else:
+            canvas.create_line(*points, fill=color,
+                               width=max(1, SF(2)), tags=('connector',))
+    # Keep lines behind the boxes but above the lane tints
+    canvas.tag_lower('connector')
+    canvas.tag_lower('lane_bg')
 
     # ── Scrollregion ─────────────────────────────────────────────────────────
     canvas.update_idletasks()
     bbox = canvas.bbox('all')
     if bbox:
         canvas.config(scrollregion=(0, 0,
-                                    max(canvas_w, bbox[2] + side_pad),
-                                    bbox[3] + top_pad))
+                                    max(canvas_w, bbox[2] + SF(24)),
+                                    bbox[3] + SF(16)))
 
 def _draw_rounded_rect(canvas, x1, y1, x2, y2, r, fill, outline, width, tags=()):
     """
@@ -3207,9 +4074,13 @@ def open_full_bracket():
     right_header = tk.Frame(header, bg=THEME['bg_card'])
     right_header.pack(side='right', padx=(20, 0))
 
-    if REPLAY_VIEW_ONLY:
-        # Search bar for player highlighting (also in replay mode)
-        search_frame = tk.Frame(right_header, bg=THEME['bg_card'])
+    def _build_player_search(parent):
+        """
+        Player search box (live and view-only modes). Results update as you
+        type, tolerate typos, and Up/Down/Enter step through the matching
+        teams, scrolling each into view.
+        """
+        search_frame = tk.Frame(parent, bg=THEME['bg_card'])
         search_frame.pack(side='left', padx=SF(5))
 
         tk.Label(search_frame, text="Search Player:", font=scaled_font('Selawik', 9),
@@ -3220,30 +4091,73 @@ def open_full_bracket():
                                font=scaled_font('Selawik', 9), relief='flat')
         search_entry.pack(side='left', padx=SF(5))
 
-        def search_player(event=None):
-            """Search for player and highlight their matches"""
-            player_name = search_var.get().strip()
-            dehighlight_traces(full_bracket_canvas)
-
-            if not player_name:
-                return
-
-            # Find all teams with this player
-            matching_teams = []
-            for team_name, roster in TEAM_ROSTERS.items():
-                if player_name.lower() in roster[0].lower() or player_name.lower() in roster[1].lower():
-                    matching_teams.append(team_name)
+        search = {'job': None, 'index': None, 'rosters': None, 'hits': [], 'pos': 0}
 
-            # Highlight all matches with these teams
-            for team_name in matching_teams:
-                highlight_team_matches(full_bracket_canvas, team_name, '#90EE90')
+        def _roster_index():
+            # Rebuilt only when the rosters change (e.g. a late entry)
+            rosters = {team: tuple(r) for team, r in TEAM_ROSTERS.items()}
+            if rosters != search['rosters']:
+                search['rosters'] = rosters
+                search['index'] = build_roster_search_index(rosters)
+            return search['index']
 
-        search_entry.bind('<Return>', search_player)
+        def show_hits():
+            """Highlight every hit, the current one brighter and scrolled into view."""
+            dehighlight_traces(full_bracket_canvas)
+            hits = search['hits']
+            if not hits:
+                hit_label.config(text="No match" if search_var.get().strip() else "")
+                return
+            team, player = hits[search['pos']]
+            for other, _ in hits:
+                if other != team:
+                    highlight_team_matches(full_bracket_canvas, other, '#90EE90')
+            highlight_team_matches(full_bracket_canvas, team, '#32CD32')
+            scroll_to_team(full_bracket_canvas, team)
+            hit_label.config(text=f"{search['pos'] + 1}/{len(hits)}  {player}")
 
-        tk.Button(search_frame, text="Search", command=search_player,
+        def search_player(event=None):
+            """Search for player and highlight their matches"""
+            search['job'] = None
+            text = search_var.get().strip()
+            search['hits'] = search_roster(_roster_index(), text) if text else []
+            search['pos'] = 0
+            show_hits()
+
+        def _on_type(*_):
+            if search['job']:
+                search_entry.after_cancel(search['job'])
+            search['job'] = search_entry.after(150, search_player)
+
+        def step(delta):
+            """Moves to the next/previous hit (runs a pending search first)."""
+            if search['job']:
+                search_entry.after_cancel(search['job'])
+                search_player()
+            elif search['hits']:
+                search['pos'] = (search['pos'] + delta) % len(search['hits'])
+                show_hits()
+            return 'break'
+
+        search_var.trace_add('write', _on_type)
+        search_entry.bind('<Down>', lambda e: step(1))
+        search_entry.bind('<Return>', lambda e: step(1))
+        search_entry.bind('<Up>', lambda e: step(-1))
+        search_entry.bind('<Escape>', lambda e: search_var.set(''))
+
+        tk.Button(search_frame, text="Next", command=lambda: step(1),
                  bg=THEME['btn_confirm'], fg='white', font=scaled_font('Selawik', 9),
                  relief='flat', padx=SF(10), pady=SF(2)).pack(side='left', padx=2)
 
+        hit_label = tk.Label(search_frame, text="", width=18, anchor='w',
+                             font=scaled_font('Selawik', 8),
+                             bg=THEME['bg_card'], fg=THEME['fg_secondary'])
+        hit_label.pack(side='left', padx=(4, 0))
+
+    # Search bar for player highlighting (also in replay mode)
+    _build_player_search(right_header)
+
+    if REPLAY_VIEW_ONLY:
         # Add clear highlights button
         clear_btn = tk.Button(right_header, text="Clear Highlights",
                              command=lambda: dehighlight_traces(full_bracket_canvas),
@@ -3269,42 +4183,6 @@ def open_full_bracket():
                  bg=THEME['btn_cancel'], fg='white', font=THEME['font_main'],
                  relief='flat', padx=SF(15), pady=SF(5)).pack(side='left', padx=SF(5))
     else:
-        # Search bar for player highlighting
-        search_frame = tk.Frame(right_header, bg=THEME['bg_card'])
-        search_frame.pack(side='left', padx=SF(5))
-
-        tk.Label(search_frame, text="Search Player:", font=scaled_font('Selawik', 9),
-                bg=THEME['bg_card'], fg=THEME['fg_secondary']).pack(side='left', padx=(0, 5))
-
-        search_var = tk.StringVar()
-        search_entry = tk.Entry(search_frame, textvariable=search_var, width=15,
-                               font=scaled_font('Selawik', 9), relief='flat')
-        search_entry.pack(side='left', padx=SF(5))
-
-        def search_player(event=None):
-            """Search for player and highlight their matches"""
-            player_name = search_var.get().strip()
-            dehighlight_traces(full_bracket_canvas)
-
-            if not player_name:
-                return
-
-            # Find all teams with this player
-            matching_teams = []
-            for team_name, roster in TEAM_ROSTERS.items():
-                if player_name.lower() in roster[0].lower() or player_name.lower() in roster[1].lower():
-                    matching_teams.append(team_name)
-
-            # Highlight all matches with these teams
-            for team_name in matching_teams:
-                highlight_team_matches(full_bracket_canvas, team_name, '#90EE90')
-
-        search_entry.bind('<Return>', search_player)
-
-        tk.Button(search_frame, text="Search", command=search_player,
-                 bg=THEME['btn_confirm'], fg='white', font=scaled_font('Selawik', 9),
-                 relief='flat', padx=SF(10), pady=SF(2)).pack(side='left', padx=2)
-
         # Add clear highlights button
         clear_btn = tk.Button(right_header, text="Clear Highlights",
                              bg=THEME['btn_cancel'], fg='white', font=THEME['font_main'],
@@ -3401,56 +4279,45 @@ def open_full_bracket():
         # Get the winner of this match
         winner = match_data.get('winner') or match_data.get('champion')
 
-        # If no winner, check if it's GF/GGF with W: references
-        if not winner and match_id in ['GF', 'GGF']:
-            # For GF/GGF, try to resolve the teams to see if they're available
-            team_a = match_data.get('teams', [None, None])[0]
-            team_b = match_data.get('teams', [None, None])[1]
-
-            resolved_a = resolve_team_name(team_a)
-            resolved_b = resolve_team_name(team_b)
-
-            if resolved_a and resolved_b:
-                # Both teams are available, but no winner declared yet
-                flash_effect(canvas, match_id, '#FFD700')
-                return
-
-        # If still no winner, flash and reset
+        # No winner yet: flash, then mark every team that can still fill an
+        # open slot so the viewer can see where the opponent will come from
         if not winner:
             flash_effect(canvas, match_id, '#FFD700')
+            for slot, seated in enumerate(match_data.get('teams', [None, None])):
+                if seated:
+                    continue
+                for team in get_possible_teams(match_id, slot):
+                    for mid in get_team_reach(team)[:1]:
+                        highlight_match_box(canvas, mid, '#FFF59D', None)
             return
 
-        # Highlight the clicked match in gold
-        highlight_match_box(canvas, match_id, '#FFD700', None)
-
-        # Highlight all previous matches the winner played in, with their names
-        highlight_team_matches(canvas, winner, '#FFD700')
+        # Highlight the winner's route into this match, with their names
+        for mid in get_team_path(winner, match_id):
+            highlight_match_box(canvas, mid, '#FFD700', winner)
 
     def flash_effect(canvas, match_id, color):
         """Flash the match box and then clear"""
 
-        for item_id in canvas.find_all():
-            tags = canvas.gettags(item_id)
-            if f'match_{match_id}' in tags:
-                coords = canvas.coords(item_id)
-                if coords and len(coords) >= 4:
-                    x1, y1, x2, y2 = coords[0], coords[1], coords[2], coords[3]
-
-                    # Flash 3 times
-                    for i in range(3):
-                        # Show color
-                        canvas.create_rectangle(x1, y1, x2, y2,
-                                              fill=color, outline='', tags=('trace_highlight',))
-                        canvas.create_rectangle(x1, y1, x2, y2,
-                                              fill='', outline='#263238', width=2, tags=('trace_highlight',))
-                        canvas.update()
-                        canvas.after(200)
-
-                        # Clear
-                        canvas.delete('trace_highlight')
-                        canvas.update()
-                        canvas.after(200)
-                break
+        items = canvas.find_withtag(f'match_{match_id}')
+        if items:
+            coords = canvas.coords(items[0])
+            if coords and len(coords) >= 4:
+                x1, y1, x2, y2 = coords[0], coords[1], coords[2], coords[3]
+
+                # Flash 3 times
+                for i in range(3):
+                    # Show color
+                    canvas.create_rectangle(x1, y1, x2, y2,
+                                          fill=color, outline='', tags=('trace_highlight',))
+                    canvas.create_rectangle(x1, y1, x2, y2,
+                                          fill='', outline='#263238', width=2, tags=('trace_highlight',))
+                    canvas.update()
+                    canvas.after(200)
+
+                    # Clear
+                    canvas.delete('trace_highlight')
+                    canvas.update()
+                    canvas.after(200)
 
     def highlight_team_matches(canvas, team_name, color):
         """Highlight all matches this team played in, with their names in each box"""
@@ -3478,45 +4345,56 @@ def open_full_bracket():
         if match_id in ['GF', 'GGF'] and team_name and team_name.startswith('W:'):
             team_name = resolve_team_name(team_name)
 
-        found = False
-        for item_id in canvas.find_all():
-            tags = canvas.gettags(item_id)
-            if f'match_{match_id}' in tags:
-                coords = canvas.coords(item_id)
-                if coords and len(coords) >= 4:
-                    x1, y1, x2, y2 = coords[0], coords[1], coords[2], coords[3]
-
-                    # Draw colored background
-                    canvas.create_rectangle(x1, y1, x2, y2,
-                                          fill=color, outline='', tags=('trace_highlight',))
-
-                    # Draw border on top
-                    canvas.create_rectangle(x1, y1, x2, y2,
-                                          fill='', outline='#263238', width=2, tags=('trace_highlight',))
-
-                    # Add team member names if we have a team name
-                    if team_name and team_name in TEAM_ROSTERS:
-                        roster = TEAM_ROSTERS.get(team_name, ['?', '?'])
-
-                        # Add player names with larger font to fill the box
-                        text_x = (x1 + x2) / 2
-
-                        # Top player name
-                        canvas.create_text(text_x, y1 + (y2 - y1) / 4,
-                                         text=roster[0],
-                                         font=scaled_font('Selawik', 9, 'bold'),
-                                         fill='black', anchor='center',
-                                         tags=('trace_text',))
-
-                        # Bottom player name
-                        canvas.create_text(text_x, y1 + 3 * (y2 - y1) / 4,
-                                         text=roster[1],
-                                         font=scaled_font('Selawik', 9, 'bold'),
-                                         fill='black', anchor='center',
-                                         tags=('trace_text',))
-
-                    found = True
-                break
+        items = canvas.find_withtag(f'match_{match_id}')
+        if items:
+            coords = canvas.coords(items[0])
+            if coords and len(coords) >= 4:
+                x1, y1, x2, y2 = coords[0], coords[1], coords[2], coords[3]
+
+                # Draw colored background
+                canvas.create_rectangle(x1, y1, x2, y2,
+                                      fill=color, outline='', tags=('trace_highlight',))
+
+                # Draw border on top
+                canvas.create_rectangle(x1, y1, x2, y2,
+                                      fill='', outline='#263238', width=2, tags=('trace_highlight',))
+
+                # Add team member names if we have a team name
+                if team_name and team_name in TEAM_ROSTERS:
+                    roster = TEAM_ROSTERS.get(team_name, ['?', '?'])
+
+                    # Add player names with larger font to fill the box
+                    text_x = (x1 + x2) / 2
+
+                    # Top player name
+                    canvas.create_text(text_x, y1 + (y2 - y1) / 4,
+                                     text=roster[0],
+                                     font=scaled_font('Selawik', 9, 'bold'),
+                                     fill='black', anchor='center',
+                                     tags=('trace_text',))
+
+                    # Bottom player name
+                    canvas.create_text(text_x, y1 + 3 * (y2 - y1) / 4,
+                                     text=roster[1],
+                                     font=scaled_font('Selawik', 9, 'bold'),
+                                     fill='black', anchor='center',
+                                     tags=('trace_text',))
+
+    def scroll_to_team(canvas, team_name):
+        """Scroll so the team's first match box is visible (centred when the view has to move)."""
+        boxes = [canvas.bbox(f'match_{mid}') for mid, data in TOURNAMENT_STATE.items()
+                 if isinstance(data, dict) and team_name in data.get('teams', [])]
+        boxes = [b for b in boxes if b]
+        region = canvas.bbox('all')
+        if not boxes or not region:
+            return
+        x1, y1, x2, y2 = min(boxes, key=lambda b: (b[0], b[1]))
+        width, height = region[2] - region[0], region[3] - region[1]
+        view_w, view_h = canvas.winfo_width(), canvas.winfo_height()
+        if width > view_w and not (canvas.canvasx(0) <= x1 and x2 <= canvas.canvasx(view_w)):
+            canvas.xview_moveto(max(0, ((x1 + x2) / 2 - region[0] - view_w / 2) / width))
+        if height > view_h and not (canvas.canvasy(0) <= y1 and y2 <= canvas.canvasy(view_h)):
+            canvas.yview_moveto(max(0, ((y1 + y2) / 2 - region[1] - view_h / 2) / height))
 
     def dehighlight_traces(canvas):
         """Clear all trace highlights"""
@@ -3535,17 +4413,11 @@ def open_full_bracket():
 def find_next_active_match():
     """Iterates through all match keys (in chronological order) to find the next ready-to-play match."""
 
-    sorted_match_keys = sorted(
-        [k for k in TOURNAMENT_STATE.keys() if k.startswith('G') or k == 'GF' or k == 'GGF'],
-        key=sort_match_keys
-    )
-
-    for k in sorted_match_keys:
+    k = next_playable_match(TOURNAMENT_STATE, get_compiled_bracket())
+    if k != 'TOURNAMENT_OVER':
         data = TOURNAMENT_STATE[k]
-
-        if data['teams'][0] and data['teams'][1] and data['winner'] is None:
-            log_message(f"Next active match: {k} ({data['teams'][0]} vs {data['teams'][1]})", "DEBUG")
-            return k
+        log_message(f"Next active match: {k} ({data['teams'][0]} vs {data['teams'][1]})", "DEBUG")
+        return k
 
     log_message("No further matches found — tournament complete")
     return 'TOURNAMENT_OVER'
@@ -3575,6 +4447,7 @@ def serialize_snapshot():
         "type": "SNAPSHOT",
         "version": SNAPSHOT_VERSION,
         "timestamp": time.time(),
+        "format": TOURNAMENT_FORMAT,
         "teams": list(TEAMS),
         "rosters": dict(TEAM_ROSTERS),
         "state": {},
@@ -3603,6 +4476,7 @@ def serialize_snapshot():
 
     return snapshot
 
+@traced()
 def append_snapshot_to_file(path):
     """
     Append a single ND-JSON snapshot to the replay file.
@@ -3654,11 +4528,12 @@ def _find_final_stats_in_file(path):
                 continue
     return result
 
+@traced()
 def _compute_final_stats(champion):
     """
     Compute the full set of final-screen statistics from current globals and
     return them as a plain serialisable dict.  Called both when saving to the
-    replay file and when building the PDF from a replay.
+    replay file and when building the PDF report (see pdf_report_payload).
     """
     stats = {}
 
@@ -3846,42 +4721,467 @@ def append_final_stats_to_file(path, champion):
             except Exception:
                 pass
         log_message(f"FINAL_STATS written to replay file: {path}")
+        update_player_ratings()
+        update_career_db()
     except Exception as e:
         log_message(f"Failed to write FINAL_STATS: {e}", "ERROR")
 
 
-def handle_match_resolution(winner, loser, winning_color, match_id):
+# =============================================================================
+# --- Point Events ---
+# Every change of the red/blue counters (buttons, Fix Score, IR remote,
+# reset) becomes one timestamped ND-JSON line next to the replay file:
+#   replays/game_<epoch>.points.ndjson
+#   {"t":1760000000123,"match":"W3","team":"red","red":5,"blue":3}
+# `t` is epoch milliseconds, `team` the counter that moved, and red/blue the
+# score after the change. The Tk thread only queues the line; a BatchWriter
+# appends whatever has queued in the last POINT_FLUSH_SECONDS as one write
+# per file, so a press never waits on the disk and a crash loses at most that
+# window. Resuming a replay puts the active match's counters back where its
+# last recorded point left them.
+# =============================================================================
+
+POINT_FLUSH_SECONDS = 1.0   # longest a point waits in memory before it is written
+POINT_BATCH_MAX = 500       # ...or fewer, once this many have queued
+
+_point_scores = {'red': 0, 'blue': 0}   # counters as last recorded (Tk thread only)
+
+def points_path(replay_path):
+    """replays/game_1712345678.json -> replays/game_1712345678.points.ndjson (None without a replay)."""
+    return os.path.splitext(replay_path)[0] + '.points.ndjson' if replay_path else None
+
+def watch_point_events():
+    """Hooks the scoreboard counters up to the event stream and restores a crashed match's score."""
+    for color in ('red', 'blue'):
+        var = ui_references[f'{color}_counter_var']
+        _point_scores[color] = var.get()
+        var.trace_add('write', lambda *_, c=color: record_point_event(c))
+    restore_point_scores()
+
+def record_point_event(color):
+    """IntVar trace callback: queues one event when the `color` counter actually changed."""
+    try:
+        value = ui_references[f'{color}_counter_var'].get()
+    except (tk.TclError, ValueError):
+        return
+    if value == _point_scores[color]:
+        return
+    _point_scores[color] = value
+    path = points_path(REPLAY_FILEPATH)
+    if not path:
+        return
+    mid = last_assigned_match_id
+    md = TOURNAMENT_STATE.get(mid)
+    if not isinstance(md, dict) or md.get('winner') is not None:
+        # reset_game() zeroes the counters before the next match is loaded
+        mid = TOURNAMENT_STATE.get('active_match_id')
+    event = {'t': time.time_ns() // 1_000_000, 'match': mid, 'team': color,
+             'red': _point_scores['red'], 'blue': _point_scores['blue']}
+    _POINT_WRITER.put((path, json.dumps(event, separators=(",", ":")) + "\n"))
+
+def flush_point_events(timeout=2.0):
+    """Blocks until every queued point is on disk (or `timeout` passes)."""
+    _POINT_WRITER.flush(timeout)
+
+def _write_point_batch(batch):
+    """Writer thread: appends a batch of (path, line) points, one write per file."""
+    by_path = {}
+    for path, line in batch:
+        by_path.setdefault(path, []).append(line)
+    for path, lines in by_path.items():
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(''.join(lines))
+                f.flush()
+                try:
+                    os.fsync(f.fileno())
+                except Exception:
+                    pass
+        except Exception as e:
+            log_message(f"Failed to write {len(lines)} point events to {path}: {e}", "ERROR")
+
+_POINT_WRITER = BatchWriter('point-writer', _write_point_batch,
+                            max_batch=POINT_BATCH_MAX, linger=POINT_FLUSH_SECONDS)
+atexit.register(flush_point_events)
+
+def iter_point_events(path):
+    """Yields the recorded events of a points file in order, skipping a torn last line."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(event, dict) and 'match' in event:
+                yield event
+
+def restore_point_scores():
+    """Continue mode: sets the counters to the last recorded score of the active match."""
+    path = points_path(REPLAY_FILEPATH)
+    mid = TOURNAMENT_STATE.get('active_match_id')
+    if not path or not os.path.exists(path) or mid not in TOURNAMENT_STATE:
+        return
+    last = None
+    for event in iter_point_events(path):
+        if event['match'] == mid:
+            last = event
+    if last is None or (last['red'], last['blue']) == (0, 0):
+        return
+    # Recorded already, so the traces see no change; the next settle counts from here
+    _point_scores.update(red=last['red'], blue=last['blue'])
+    for color in ('red', 'blue'):
+        ui_references[f'{color}_counter_var'].set(last[color])
+        ui_references[f'{color}_round_baseline'] = last[color]
+    log_message(f"Restored match {mid} score {last['red']}-{last['blue']} from {path}")
+
+# =============================================================================
+# --- Generated Formats ---
+# Single elimination, round robin and Swiss need no data file: their configs
+# are generated here in the same shape _parse_json_config_content() produces,
+# so they run through the same engine, schedule and snapshot code as 'D'.
+# Every generated match config carries its 'format' so snapshots restore it.
+# =============================================================================
+
+SWISS_REMATCH_PENALTY = 10000    # pairing cost of a repeat match-up
+SWISS_SEARCH_BUDGET = 400000     # branch-and-bound work (cost-matrix reads) before settling for the best found
+
+def _ordinal_label(place):
+    """1 -> '1ST', 12 -> '12TH', 22 -> '22ND' (TOURNAMENT_RANKINGS key style)."""
+    if 10 <= place % 100 <= 20:
+        suffix = 'TH'
+    else:
+        suffix = {1: 'ST', 2: 'ND', 3: 'RD'}.get(place % 10, 'TH')
+    return f"{place}{suffix}"
+
+def _default_prizes(num_teams):
+    """Payouts for formats without their own file: reuse the 'D' table, else split the pool 50/30/20."""
+    try:
+        _, prizes = load_bracket_config(num_teams, 'D')
+        if prizes:
+            return prizes
+    except Exception:
+        pass
+    pool = num_teams * 2 * ENTRY_FEE_PER_PERSON
+    first, second = pool * 50 // 100, pool * 30 // 100
+    return {'1st': first, '2nd': second, '3rd': pool - first - second}
+
+def _generated_match(fmt, teams, round_no, w_next=None, l_next=None, **extra):
+    """One config entry in the parsed-config shape."""
+    entry = {
+        'teams': teams,
+        'W_next': w_next,
+        'L_next': l_next,
+        'M_round': round_no,
+        'is_winnerbracket': 'true',
+        'format': fmt,
+    }
+    entry.update(extra)
+    return entry
+
+def generate_single_elim_config(num_teams):
     """
-    Propagates the winner/loser of the *specific* completed match (match_id)
-    to the next games, with GF/GGF reset logic.
+    Standard seeded single-elimination bracket. Top seeds receive the byes
+    when the field is not a power of two; semi-final losers meet in a
+    3rd-place match; earlier losers are placed by the round they fell in.
     """
-    global current_match_res_buttons, TOURNAMENT_RANKINGS
+    size = 1 << max(1, (num_teams - 1).bit_length())
+    order = [1]
+    while len(order) < size:
+        mirror = len(order) * 2 + 1
+        order = [x for seed in order for x in (seed, mirror - seed)]
 
-    log_message(f"Resolving match {match_id}: {winner} ({winning_color}) defeated {loser}")
+    config = {}
+    rounds = []              # per round: match ids created in it
+    entries = []             # current round's feeders: ('T', seed) or ('M', match_id)
+    for a, b in zip(order[0::2], order[1::2]):
+        real = [s for s in (a, b) if s <= num_teams]
+        entries.append(('T', real[0]) if len(real) == 1 else ('M', (a, b)))
+
+    next_id = 1
+    round_no = 1
+    created = []
+    for i, (kind, val) in enumerate(entries):
+        if kind == 'M':
+            mid = f"G{next_id}"; next_id += 1
+            config[mid] = _generated_match('S', [f"T{val[0]}", f"T{val[1]}"], round_no)
+            entries[i] = ('M', mid)
+            created.append(mid)
+    rounds.append(created)
+
+    while len(entries) > 1:
+        round_no += 1
+        created = []
+        paired = []
+        for src_a, src_b in zip(entries[0::2], entries[1::2]):
+            paired.append((src_a, src_b))
+        is_final = len(paired) == 1
+        third_place = None
+        if is_final and len(rounds[-1]) == 2:
+            third_place = f"G{next_id}"; next_id += 1
+        nxt = []
+        for src_a, src_b in paired:
+            mid = f"G{next_id}"; next_id += 1
+            teams = [None, None]
+            for slot, (kind, val) in enumerate((src_a, src_b)):
+                if kind == 'T':
+                    teams[slot] = f"T{val}"
+                else:
+                    config[val]['W_next'] = (mid, slot)
+            config[mid] = _generated_match('S', teams, round_no)
+            created.append(mid)
+            nxt.append(('M', mid))
+        if third_place:
+            semis = rounds[-1]
+            config[third_place] = _generated_match('S', [None, None], round_no,
+                                                   w_next='PLACED[3RD]', l_next='ELIMINATED[4TH]')
+            for slot, semi in enumerate(semis):
+                config[semi]['L_next'] = (third_place, slot)
+        rounds.append(created)
+        entries = nxt
+
+    final_id = entries[0][1]
+    config[final_id]['W_next'] = 'CHAMPION'
+    config[final_id]['L_next'] = 'ELIMINATED[2ND]'
+
+    # Remaining losers, latest round first, take the next free places
+    place = 5 if len(rounds) > 1 and len(rounds[-2]) == 2 and num_teams >= 4 else 3
+    for round_ids in reversed(rounds[:-1]):
+        for mid in round_ids:
+            if config[mid]['L_next'] is None:
+                config[mid]['L_next'] = f"ELIMINATED[{_ordinal_label(place)}]"
+                place += 1
+    return config
 
-    if match_id == 'TOURNAMENT_OVER':
-         messagebox.showerror("Error", "Attempted to resolve 'TOURNAMENT_OVER' state.")
-         TOURNAMENT_STATE['active_match_id'] = find_next_active_match()
-         reset_game(update_teams=True)
-         log_message("Attempted to resolve TOURNAMENT_OVER state — aborting", "ERROR")
-         return
+def generate_round_robin_config(num_teams):
+    """Single pool, every team meets every other once (circle method)."""
+    seeds = list(range(1, num_teams + 1))
+    if len(seeds) % 2:
+        seeds.append(None)   # sitting out this round
+    n = len(seeds)
 
-    match_data = TOURNAMENT_STATE.get(match_id)
+    config = {}
+    next_id = 1
+    for round_no in range(1, n):
+        for i in range(n // 2):
+            a, b = seeds[i], seeds[n - 1 - i]
+            if a is None or b is None:
+                continue
+            if round_no % 2 == 0:
+                a, b = b, a   # alternate who starts on red
+            config[f"G{next_id}"] = _generated_match('R', [f"T{a}", f"T{b}"], round_no)
+            next_id += 1
+        seeds = [seeds[0], seeds[-1]] + seeds[1:-1]
+    return config
 
-    if not match_data or 'config' not in match_data:
-        log_message(f"Match {match_id} config missing or invalid — cannot resolve", "ERROR")
-        messagebox.showerror("Error", f"Match {match_id} configuration data is missing or invalid.")
-        TOURNAMENT_STATE['active_match_id'] = find_next_active_match()
-        reset_game(update_teams=True)
-        return
+def swiss_round_count(num_teams):
+    """Rounds needed for a single undefeated team to emerge."""
+    return max(1, ceil(log2(max(2, num_teams))))
 
-    match_config = match_data['config']
+def generate_swiss_config(num_teams):
+    """
+    Swiss schedule skeleton: round 1 is seeded top half vs bottom half,
+    later rounds are left empty and paired by the engine as each round
+    completes. With an odd field the last slot of every round is a bye.
+    """
+    config = {}
+    half = num_teams // 2
+    next_id = 1
+    for round_no in range(1, swiss_round_count(num_teams) + 1):
+        for i in range(half):
+            teams = [f"T{i + 1}", f"T{i + 1 + half}"] if round_no == 1 else [None, None]
+            config[f"G{next_id}"] = _generated_match('W', teams, round_no)
+            next_id += 1
+        if num_teams % 2:
+            teams = [f"T{num_teams}", None] if round_no == 1 else [None, None]
+            config[f"G{next_id}"] = _generated_match('W', teams, round_no, bye=True)
+            next_id += 1
+    return config
 
-    if match_data.get('winner') is not None and not match_data.get('is_reset', False):
-        log_message(f"Match {match_id} already resolved — skipping", "WARN")
-        messagebox.showinfo("Error", f"Match {match_id} already resolved.")
+BRACKET_GENERATORS = {
+    'S': generate_single_elim_config,
+    'R': generate_round_robin_config,
+    'W': generate_swiss_config,
+}
+
+def league_standings(state, compiled):
+    """
+    Standings for round-robin / Swiss play, best first. Each row is a dict
+    with team, wins, losses, byes and buchholz (sum of opponents' wins).
+    Ties fall back to first appearance in the schedule (i.e. the draw).
+    """
+    rows = {}
+    opponents = {}
+    for mid in compiled['ids']:
+        md = state.get(mid)
+        if md is None:
+            continue
+        for team in md['teams']:
+            if team and team not in rows:
+                rows[team] = {'team': team, 'wins': 0, 'losses': 0, 'byes': 0, 'buchholz': 0,
+                              'seed': len(rows)}
+                opponents[team] = []
+        winner = md.get('winner')
+        if not winner:
+            continue
+        if compiled['bye'][compiled['index'][mid]]:
+            rows[winner]['wins'] += 1
+            rows[winner]['byes'] += 1
+            continue
+        a, b = md['teams']
+        loser = b if winner == a else a
+        rows[winner]['wins'] += 1
+        rows[loser]['losses'] += 1
+        opponents[a].append(b)
+        opponents[b].append(a)
+
+    for team, row in rows.items():
+        row['buchholz'] = sum(rows[o]['wins'] for o in opponents[team])
+    return sorted(rows.values(), key=lambda r: (-r['wins'], -r['buchholz'], r['seed']))
+
+def _swiss_pairing(order, wins, played):
+    """
+    Minimum-cost perfect matching over `order` (best standing first).
+    Cost favours equal scores, then close standings, and heavily penalises
+    rematches. Exact branch-and-bound seeded with the greedy pairing; the
+    node budget keeps pathological fields bounded.
+    """
+    n = len(order)
+    cost = [[0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(i + 1, n):
+            c = (wins[order[i]] - wins[order[j]]) ** 2 * 100 + (j - i)
+            if frozenset((order[i], order[j])) in played:
+                c += SWISS_REMATCH_PENALTY
+            cost[i][j] = cost[j][i] = c
+
+    # Greedy start: best remaining team takes its cheapest partner
+    remaining = list(range(n))
+    greedy, greedy_cost = [], 0
+    while remaining:
+        i = remaining.pop(0)
+        j = min(remaining, key=lambda k: cost[i][k])
+        remaining.remove(j)
+        greedy.append((i, j))
+        greedy_cost += cost[i][j]
+    best = [greedy_cost, greedy]
+    budget = [SWISS_SEARCH_BUDGET]
+
+    def lower_bound(rest):
+        if not rest:
+            return 0
+        return sum(min(cost[i][j] for j in rest if j != i) for i in rest) / 2
+
+    def search(rest, acc, pairs):
+        budget[0] -= len(rest) ** 2   # the bound below reads every pair once
+        if budget[0] < 0 or acc + lower_bound(rest) >= best[0]:
+            return
+        if not rest:
+            best[0], best[1] = acc, list(pairs)
+            return
+        i = rest[0]
+        for j in sorted(rest[1:], key=lambda k: cost[i][k]):
+            pairs.append((i, j))
+            search([k for k in rest if k != i and k != j], acc + cost[i][j], pairs)
+            pairs.pop()
+
+    search(list(range(n)), 0, [])
+    return [(order[i], order[j]) for i, j in best[1]]
+
+def _pair_swiss_round(state, compiled, finished_round):
+    """Seats the next Swiss round once every match of `finished_round` has a result."""
+    ids = compiled['ids']
+    this_round = [m for i, m in enumerate(ids) if compiled['round'][i] == finished_round and m in state]
+    next_round = [i for i, m in enumerate(ids) if compiled['round'][i] == finished_round + 1 and m in state]
+    if not next_round or any(state[m]['winner'] is None for m in this_round):
         return
+    if any(any(state[ids[i]]['teams']) for i in next_round):
+        return
+
+    standings = league_standings(state, compiled)
+    order = [r['team'] for r in standings]
+    wins = {r['team']: r['wins'] for r in standings}
+    played = set()
+    for i, mid in enumerate(ids):
+        md = state.get(mid)
+        if md and md.get('winner') and not compiled['bye'][i]:
+            played.add(frozenset(md['teams']))
+
+    bye_slot = next((i for i in next_round if compiled['bye'][i]), None)
+    if bye_slot is not None:
+        had_bye = {r['team'] for r in standings if r['byes']}
+        bye_team = next((t for t in reversed(order) if t not in had_bye), order[-1])
+        order.remove(bye_team)
+        bye_match = state[ids[bye_slot]]
+        bye_match['teams'] = [bye_team, None]
+        bye_match['winner'] = bye_team
+
+    pairs = _swiss_pairing(order, wins, played)
+    for i, (a, b) in zip([i for i in next_round if not compiled['bye'][i]], pairs):
+        state[ids[i]]['teams'] = [a, b]
+    log_message(f"Swiss round {finished_round + 1} paired: "
+                f"{', '.join(f'{a} v {b}' for a, b in pairs)}", "DEBUG")
+
+def _finalize_league(state, rankings, compiled):
+    """Converts final standings into TOURNAMENT_RANKINGS places and crowns the leader."""
+    standings = league_standings(state, compiled)
+    for place, row in enumerate(standings, start=1):
+        rankings[_ordinal_label(place)] = row['team']
+    if not standings:
+        return
+    champion = standings[0]['team']
+    # Crown on the champion's last win so the bracket views highlight a real result
+    for mid in reversed(compiled['ids']):
+        md = state.get(mid)
+        if md and md.get('winner') == champion:
+            md['champion'] = champion
+            break
+
+# --- Bracket Engine ---
+# Pure result application shared by the live UI, the config validator and
+# anything else that needs to play a bracket forward. Works on any state dict
+# shaped like TOURNAMENT_STATE; never touches Tk or the tournament globals.
+
+RESULT_ADVANCED = 'ADVANCED'   # result routed onwards, bracket continues
+RESULT_GF_RESET = 'GF_RESET'   # LB finalist won GF, GGF is now live
+RESULT_GF_WON   = 'GF_WON'     # WB finalist won GF, tournament over
+RESULT_GGF_WON  = 'GGF_WON'    # reset match played, tournament over
+
+def next_playable_match(state, compiled):
+    """First match (play order) with both teams seated and no winner, else 'TOURNAMENT_OVER'."""
+    for k in compiled['ids']:
+        data = state.get(k)
+        if data is None or not k.startswith('G'):
+            continue
+        if data['teams'][0] and data['teams'][1] and data['winner'] is None:
+            return k
+    return 'TOURNAMENT_OVER'
+
+def _seat_team(state, match_id, slot, team, source_id, issues):
+    """Places a team into a slot, reporting (instead of silently dropping) a collision."""
+    seated = state[match_id]['teams'][slot]
+    if seated is None:
+        state[match_id]['teams'][slot] = team
+        return True
+    msg = (f"Slot collision: {source_id} routes {team} to {match_id} [slot {slot}], "
+           f"already held by {seated}")
+    if issues is not None:
+        issues.append(msg)
+    else:
+        log_message(msg, "WARN")
+    return False
 
+def apply_match_result(state, rankings, compiled, winner, loser, winning_color, match_id, issues=None):
+    """
+    Records a result on `state` and propagates it, including the GF/GGF
+    bracket-reset rules, then sets state['active_match_id'].
+    Slot collisions are appended to `issues` when given, otherwise logged.
+    Returns one of the RESULT_* codes. Removing GGF (RESULT_GF_WON) changes
+    the match set, so callers holding a compiled view should recompile.
+    """
+    match_data = state[match_id]
     match_data['winner'] = winner
     match_data['winner_color'] = winning_color
 
@@ -3893,90 +5193,136 @@ def handle_match_resolution(winner, loser, winning_color, match_id):
         if winner != wb_finalist and not match_data.get('is_reset', False):
             match_data['is_reset'] = True
             # KEEP the winner and color recorded - don't clear them
-
-            reset_game_id = next((k for k in TOURNAMENT_STATE if k == 'GGF'), 'GGF')
-
-            if reset_game_id in TOURNAMENT_STATE:
+            if 'GGF' in state:
                 # Use the actual names (winner/loser) since they're already resolved from GF
-                TOURNAMENT_STATE[reset_game_id]['teams'] = [winner, loser]
-                TOURNAMENT_STATE[reset_game_id]['is_reset'] = True
-
-            w_roster = " & ".join(TEAM_ROSTERS.get(winner, ["P1", "P2"]))
-            l_roster = " & ".join(TEAM_ROSTERS.get(loser, ["P3", "P4"]))
-            messagebox.showwarning("Final Round!",
-                                f"{w_roster} have demoted {l_roster} from undefeated status!")
-
-            TOURNAMENT_STATE['active_match_id'] = 'GGF'
-            log_message(f"GF bracket reset — {winner} vs {loser} in GGF")
-
-            reset_game()
-            return # EXIT after reset handling
+                state['GGF']['teams'] = [winner, loser]
+                state['GGF']['is_reset'] = True
+            state['active_match_id'] = 'GGF'
+            return RESULT_GF_RESET
 
         # Case 2: WB Winner (winner) defeats LB Winner (loser) in GF -> TOURNAMENT OVER
         elif winner == wb_finalist:
             match_data['champion'] = winner
-            TOURNAMENT_RANKINGS['1ST'] = winner
-            TOURNAMENT_RANKINGS['2ND'] = loser
-            TOURNAMENT_STATE['active_match_id'] = 'TOURNAMENT_OVER'
+            rankings['1ST'] = winner
+            rankings['2ND'] = loser
+            state['active_match_id'] = 'TOURNAMENT_OVER'
             # GGF is not needed — remove it entirely so it never appears in the bracket
-            TOURNAMENT_STATE.pop('GGF', None)
-            log_message(f"GF complete — Champion: {winner} (1st), Runner-up: {loser} (2nd)")
-            if full_bracket_canvas:
-                draw_large_bracket(full_bracket_canvas)
-            reset_game()
-            return
+            state.pop('GGF', None)
+            return RESULT_GF_WON
 
     elif match_id == 'GGF':
         # Case 3: GGF is played -> TOURNAMENT OVER
-        match_data['champion'] = winner  # Also set champion on GGF
-        TOURNAMENT_STATE[match_id]['champion'] = winner
-        TOURNAMENT_RANKINGS['1ST'] = winner
-        gfgf_loser = TOURNAMENT_STATE[match_id]['teams'][0] if winner == TOURNAMENT_STATE[match_id]['teams'][1] else TOURNAMENT_STATE[match_id]['teams'][1]
-        TOURNAMENT_RANKINGS['2ND'] = gfgf_loser
-
-        TOURNAMENT_STATE['active_match_id'] = 'TOURNAMENT_OVER'
-        log_message(f"Reset match {match_id} complete — 1st: {winner}, 2nd: {gfgf_loser}. Tournament over.")
-
-        # Redraw the bracket to show GGF champion
-        if full_bracket_canvas:
-            draw_large_bracket(full_bracket_canvas)
-
-        reset_game()
-        return
+        match_data['champion'] = winner
+        rankings['1ST'] = winner
+        teams = match_data['teams']
+        rankings['2ND'] = teams[0] if winner == teams[1] else teams[1]
+        state['active_match_id'] = 'TOURNAMENT_OVER'
+        return RESULT_GGF_WON
+
+    ids = compiled['ids']
+    idx = compiled['index'][match_id]
+
+    # League formats have no routing: pair the next Swiss round when this
+    # one completes, and rank everyone off the table once nothing is left.
+    if compiled['format'] in LEAGUE_FORMATS:
+        if compiled['format'] == 'W':
+            _pair_swiss_round(state, compiled, compiled['round'][idx])
+        state['active_match_id'] = next_playable_match(state, compiled)
+        if state['active_match_id'] == 'TOURNAMENT_OVER':
+            _finalize_league(state, rankings, compiled)
+        return RESULT_ADVANCED
 
     # 2. Propagate Winner
-    w_target = match_config.get('W_next')
-    if isinstance(w_target, tuple):
-        next_match_id, slot = w_target
-        if next_match_id in TOURNAMENT_STATE and TOURNAMENT_STATE[next_match_id]['teams'][slot] is None:
-            TOURNAMENT_STATE[next_match_id]['teams'][slot] = winner
-            log_message(f"  -> Winner {winner} → {next_match_id} [slot {slot}]", "DEBUG")
-    elif w_target == 'CHAMPION':
-         match_data['champion'] = winner
-         TOURNAMENT_RANKINGS['1ST'] = winner
-         log_message(f"Champion crowned: {winner} (match {match_id})")
-
-    # 3. Propagate Loser and Assign Elimination Rank (MODIFIED)
-    l_target = match_config.get('L_next')
-
-    if isinstance(l_target, tuple):
-        loser_match_id, slot = l_target
-        if loser_match_id in TOURNAMENT_STATE and TOURNAMENT_STATE[loser_match_id]['teams'][slot] is None:
-            TOURNAMENT_STATE[loser_match_id]['teams'][slot] = loser
-            log_message(f"  -> Loser {loser} → {loser_match_id} [slot {slot}]", "DEBUG")
-    elif l_target and l_target.startswith('ELIMINATED'):
-        rank_match = re.search(r'\[(\w+)\]', l_target)
-        if rank_match:
-            rank = rank_match.group(1)
-            if rank not in TOURNAMENT_RANKINGS:
-                TOURNAMENT_RANKINGS[rank] = loser
-                log_message(f"  -> {loser} eliminated, ranked {rank}", "DEBUG")
-
-    elif l_target and l_target.endswith('_CONDITIONAL'):
-        pass
+    w_dest = compiled['w_dest'][idx]
+    w_rank = compiled['w_rank'][idx]
+    if w_dest >= 0:
+        if _seat_team(state, ids[w_dest], compiled['w_slot'][idx], winner, match_id, issues):
+            log_message(f"  -> Winner {winner} → {ids[w_dest]} [slot {compiled['w_slot'][idx]}]", "DEBUG")
+    elif w_dest == DEST_CHAMPION:
+        match_data['champion'] = winner
+        rankings['1ST'] = winner
+    elif w_rank:
+        rank = compiled['rank_labels'][w_rank]
+        if rank not in rankings:
+            rankings[rank] = winner
+            log_message(f"  -> {winner} finishes {rank}", "DEBUG")
+
+    # 3. Propagate Loser and Assign Elimination Rank
+    l_dest = compiled['l_dest'][idx]
+    l_rank = compiled['l_rank'][idx]
+
+    if l_dest >= 0:
+        if _seat_team(state, ids[l_dest], compiled['l_slot'][idx], loser, match_id, issues):
+            log_message(f"  -> Loser {loser} → {ids[l_dest]} [slot {compiled['l_slot'][idx]}]", "DEBUG")
+    elif l_rank:
+        rank = compiled['rank_labels'][l_rank]
+        if rank not in rankings:
+            rankings[rank] = loser
+            log_message(f"  -> {loser} eliminated, ranked {rank}", "DEBUG")
 
-    # Record to history
-    if match_id != 'TOURNAMENT_OVER' and winner and loser:
+    # 4. Find the next actively playable match
+    state['active_match_id'] = next_playable_match(state, compiled)
+    return RESULT_ADVANCED
+
+def handle_match_resolution(winner, loser, winning_color, match_id):
+    """
+    Propagates the winner/loser of the *specific* completed match (match_id)
+    to the next games, with GF/GGF reset logic.
+    """
+    global current_match_res_buttons, TOURNAMENT_RANKINGS
+
+    log_message(f"Resolving match {match_id}: {winner} ({winning_color}) defeated {loser}")
+
+    if match_id == 'TOURNAMENT_OVER':
+         messagebox.showerror("Error", "Attempted to resolve 'TOURNAMENT_OVER' state.")
+         TOURNAMENT_STATE['active_match_id'] = find_next_active_match()
+         reset_game(update_teams=True)
+         log_message("Attempted to resolve TOURNAMENT_OVER state — aborting", "ERROR")
+         return
+
+    match_data = TOURNAMENT_STATE.get(match_id)
+
+    if not match_data or 'config' not in match_data:
+        log_message(f"Match {match_id} config missing or invalid — cannot resolve", "ERROR")
+        messagebox.showerror("Error", f"Match {match_id} configuration data is missing or invalid.")
+        TOURNAMENT_STATE['active_match_id'] = find_next_active_match()
+        reset_game(update_teams=True)
+        return
+
+    if match_data.get('winner') is not None and not match_data.get('is_reset', False):
+        log_message(f"Match {match_id} already resolved — skipping", "WARN")
+        messagebox.showinfo("Error", f"Match {match_id} already resolved.")
+        return
+
+    outcome = apply_match_result(TOURNAMENT_STATE, TOURNAMENT_RANKINGS, get_compiled_bracket(),
+                                 winner, loser, winning_color, match_id)
+
+    if outcome == RESULT_GF_RESET:
+        w_roster = " & ".join(TEAM_ROSTERS.get(winner, ["P1", "P2"]))
+        l_roster = " & ".join(TEAM_ROSTERS.get(loser, ["P3", "P4"]))
+        messagebox.showwarning("Final Round!",
+                            f"{w_roster} have demoted {l_roster} from undefeated status!")
+        log_message(f"GF bracket reset — {winner} vs {loser} in GGF")
+        reset_game()
+        return
+
+    if outcome in (RESULT_GF_WON, RESULT_GGF_WON):
+        if outcome == RESULT_GF_WON:
+            invalidate_compiled_bracket()
+            log_message(f"GF complete — Champion: {winner} (1st), Runner-up: {loser} (2nd)")
+        else:
+            log_message(f"Reset match {match_id} complete — 1st: {winner}, "
+                        f"2nd: {TOURNAMENT_RANKINGS['2ND']}. Tournament over.")
+        if full_bracket_canvas:
+            draw_large_bracket(full_bracket_canvas)
+        reset_game()
+        return
+
+    if match_data.get('champion') == winner:
+        log_message(f"Champion crowned: {winner} (match {match_id})")
+
+    # Record to history
+    if winner and loser:
         MATCH_HISTORY.append({
             'id': match_id,
             'winner': winner,
@@ -3984,12 +5330,11 @@ def handle_match_resolution(winner, loser, winning_color, match_id):
             'color': winning_color
         })
 
-    # 4. Find the next actively playable match
-    TOURNAMENT_STATE['active_match_id'] = find_next_active_match()
     log_message(f"Match {match_id} resolved. Next: {TOURNAMENT_STATE['active_match_id']}")
 
     reset_game(update_teams=False)
 
+@traced()
 def draw_small_bracket_view(canvas, state):
     """
     Simplified bracket view that now reconstructs GF winner in strict
@@ -4009,10 +5354,8 @@ def draw_small_bracket_view(canvas, state):
     if H < 50:
         H = 100
 
-    sorted_match_keys = sorted(
-        [k for k in state.keys() if k.startswith('G') or k in ('GF','GGF')],
-        key=sort_match_keys
-    )
+    compiled = get_compiled_bracket() if state is TOURNAMENT_STATE else compile_bracket(state)
+    sorted_match_keys = [k for k in compiled['ids'] if k.startswith('G')]
 
     if not sorted_match_keys:
         return
@@ -4028,10 +5371,10 @@ def draw_small_bracket_view(canvas, state):
             final_matches.append(mid)
             continue
 
-        l_next = data['config'].get('L_next')
-        if isinstance(l_next, tuple):
-            wb_matches.append(mid)
-        elif l_next and 'ELIMINATED' in str(l_next):
+        # Losers still alive after this match came from the WB; a loser
+        # finishing on a place means this was an LB match.
+        i = compiled['index'][mid]
+        if compiled['l_dest'][i] < 0 and compiled['l_rank'][i]:
             lb_matches.append(mid)
         else:
             wb_matches.append(mid)
@@ -4181,19 +5524,457 @@ def swap_teams():
     current_match_teams['blue'] = temp
 
     update_scoreboard_display()
+    live_publish()
+
+# =============================================================================
+# --- PDF Report ---
+# The report is built by _build_results_pdf() from a plain payload (the
+# FINAL_STATS dict plus rosters and durations), so it can run in a worker
+# process: export_results_pdf() collects the payload on the Tk thread, hands
+# it to a single long-lived worker and shows progress with a Cancel button.
+# The worker keeps ReportLab loaded and its paragraph/table styles cached
+# between exports.
+# =============================================================================
+
+PDF_POLL_MS = 100
+PDF_HISTORY_ROWS_PER_PAGE = 36   # for the progress estimate only
+
+_PDF_STYLES = {}          # built once per process by _pdf_styles()
+_PDF_EXECUTOR = None      # ProcessPoolExecutor(max_workers=1), created on first export
+_PDF_PROGRESS_QUEUE = None
+_PDF_CANCEL_EVENT = None
+_pdf_export_dialog = None
+
+class PdfExportCancelled(Exception):
+    """Raised inside the PDF build when the user cancels the export."""
+
+def _pdf_styles():
+    """Colours, paragraph styles and the stat table style, created on first use."""
+    if _PDF_STYLES:
+        return _PDF_STYLES
+    s = _PDF_STYLES
+    # ── Colour palette mirroring THEME ──────────────────────────────────
+    s['C_BG']    = colors.HexColor('#263238')
+    s['C_CARD']  = colors.HexColor('#37474F')
+    s['C_GOLD']  = colors.HexColor('#FFD700')
+    s['C_FG']    = colors.HexColor('#ECEFF1')
+    s['C_FG2']   = colors.HexColor('#B0BEC5')
+    s['C_RED']   = colors.HexColor('#E53935')
+    s['C_BLUE']  = colors.HexColor('#1E88E5')
+    s['C_ALT']   = colors.HexColor('#2E3C43')
+
+    # ── Paragraph styles ────────────────────────────────────────────────
+    base = ParagraphStyle('base', fontName='Helvetica',
+                          fontSize=10, textColor=s['C_FG'],
+                          backColor=s['C_BG'], leading=14)
+    s['base'] = base
+    s['title'] = ParagraphStyle('title', parent=base, fontName='Helvetica-Bold',
+                                fontSize=18, textColor=s['C_GOLD'],
+                                alignment=TA_CENTER, spaceAfter=4)
+    s['champ_hdr'] = ParagraphStyle('ct', parent=base, fontName='Helvetica-Bold',
+                                    fontSize=10, textColor=s['C_GOLD'], alignment=TA_CENTER)
+    s['champ_name'] = ParagraphStyle('champName', parent=base, fontName='Helvetica-Bold',
+                                     fontSize=15, textColor=s['C_FG'], alignment=TA_CENTER)
+    s['sec_hdr'] = ParagraphStyle('secHdr', parent=base, fontName='Helvetica-Bold',
+                                  fontSize=10, textColor=s['C_GOLD'],
+                                  spaceBefore=10, spaceAfter=4)
+    s['footer'] = ParagraphStyle('footer', parent=base, fontSize=8,
+                                 textColor=s['C_FG2'], alignment=TA_CENTER)
+
+    # ── Table cell styles ────────────────────────────────────────────────
+    s['label'] = ParagraphStyle('lbl', parent=base, fontSize=9, textColor=s['C_FG2'])
+    s['value'] = ParagraphStyle('val', parent=base, fontName='Helvetica-Bold',
+                                fontSize=9, textColor=s['C_FG'])
+    s['hist_hdr'] = ParagraphStyle('mhHdr', parent=base, fontName='Helvetica-Bold',
+                                   fontSize=8, textColor=s['C_GOLD'])
+    s['hist_cell'] = ParagraphStyle('mhCell', parent=base, fontSize=8, textColor=s['C_FG'])
+    s['tinted'] = {}      # (parent style name, colour) -> ParagraphStyle
+
+    # ── Shared table styles ──────────────────────────────────────────────
+    s['stat_table'] = TableStyle([
+        ('BACKGROUND',  (0, 0), (-1, -1), s['C_CARD']),
+        ('TEXTCOLOR',   (0, 0), (-1, -1), s['C_FG']),
+        ('ROWBACKGROUNDS', (0, 0), (-1, -1), [s['C_CARD'], s['C_ALT']]),
+        ('LEFTPADDING',  (0, 0), (-1, -1), 8),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+        ('TOPPADDING',   (0, 0), (-1, -1), 4),
+        ('BOTTOMPADDING',(0, 0), (-1, -1), 4),
+    ])
+    s['hist_table'] = TableStyle([
+        ('BACKGROUND',    (0, 0), (-1, 0),  s['C_CARD']),
+        ('ROWBACKGROUNDS',(0, 1), (-1, -1), [s['C_CARD'], s['C_ALT']]),
+        ('LINEBELOW',     (0, 0), (-1, 0),  1, s['C_GOLD']),
+        ('LEFTPADDING',   (0, 0), (-1, -1), 6),
+        ('RIGHTPADDING',  (0, 0), (-1, -1), 6),
+        ('TOPPADDING',    (0, 0), (-1, -1), 3),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
+    ])
+    return s
+
+def _pdf_tinted(styles, key, color):
+    """`styles[key]` recoloured, cached per colour."""
+    cache_key = (key, color.hexval() if color is not None else None)
+    style = styles['tinted'].get(cache_key)
+    if style is None:
+        style = ParagraphStyle('v', parent=styles[key], textColor=color or styles['C_FG'])
+        styles['tinted'][cache_key] = style
+    return style
+
+def pdf_report_payload(champion):
+    """Everything _build_results_pdf() needs, as plain picklable data. Runs on the Tk thread."""
+    return {
+        'champion': champion,
+        'stats': _compute_final_stats(champion),
+        'rosters': {team: list(roster) for team, roster in TEAM_ROSTERS.items()},
+        'durations': list(MATCH_DURATIONS),
+        'generated': datetime.datetime.now().strftime("%B %d, %Y  %I:%M %p"),
+        'version': SHUF_VERSION,
+    }
+
+def report_stat_rows(payload):
+    """
+    The two columns of the results report as plain rows, shared by the PDF
+    and HTML exports. Each row is ('section', title) or
+    ('row', label, value, tone), tone being None, 'gold', 'fg2', 'red' or 'blue'.
+    """
+    champion = payload['champion']
+    stats = payload['stats']
+    rosters = payload['rosters']
+    history = stats.get('match_history', [])
+
+    def roster(team, sep=" & "):
+        return sep.join(rosters.get(team, ['?', '?']))
+
+    left_rows  = []
+    right_rows = []
+
+    # LEFT — Final Standings
+    left_rows.append(('section', "Final Standings"))
+    places = {'1ST': ('1st Place', 'gold'), '2ND': ('2nd Place', None), '3RD': ('3rd Place', 'fg2')}
+    for entry in stats.get('standings', []):
+        label_text, tone = places[entry['rank']]
+        left_rows.append(('row', f"{label_text}  (W/L {entry['wins']}/{entry['losses']})",
+                          roster(entry['team'], " / "), tone))
+
+    # LEFT — Tournament Stats
+    left_rows.append(('section', "Tournament Stats"))
+    left_rows.append(('row', "Teams",          str(stats['total_teams']), None))
+    left_rows.append(('row', "Players",        str(stats['total_players']), None))
+    left_rows.append(('row', "Matches played", str(stats['total_matches']), None))
+    left_rows.append(('row', "Total time",     format_seconds(stats['total_time_s']), None))
+    left_rows.append(('row', "Avg match time", format_seconds(stats['avg_time_s']), None))
+
+    streak = stats.get('longest_streak')
+    if streak and streak['team']:
+        left_rows.append(('row', "Longest win streak", f"{roster(streak['team'])}  ({streak['count']})", None))
+
+    # Champion win rate
+    champ_wins, champ_losses = stats['champion_wins'], stats['champion_losses']
+    champ_played = champ_wins + champ_losses
+    champ_pct = int(champ_wins / champ_played * 100) if champ_played else 0
+    left_rows.append(('row', "Champion win rate", f"{champ_wins}W-{champ_losses}L  ({champ_pct}%)", 'gold'))
+
+    # WB vs LB match split
+    parts = []
+    if stats['wb_played']:  parts.append(f"{stats['wb_played']} WB")
+    if stats['lb_played']:  parts.append(f"{stats['lb_played']} LB")
+    if stats['fin_played']: parts.append(f"{stats['fin_played']} Finals")
+    if parts:
+        left_rows.append(('row', "Match breakdown", "  /  ".join(parts), None))
+
+    # RIGHT — Match Breakdown
+    right_rows.append(('section', "Match Breakdown"))
+    total_h   = len(history)
+    red_wins, blue_wins = stats['red_wins'], stats['blue_wins']
+    red_pct   = int(red_wins  / total_h * 100) if total_h else 0
+    blue_pct  = int(blue_wins / total_h * 100) if total_h else 0
+    right_rows.append(('row', "Red side wins",  f"{red_wins} ({red_pct}%)", 'red'))
+    right_rows.append(('row', "Blue side wins", f"{blue_wins} ({blue_pct}%)", 'blue'))
+
+    if 'longest_match' in stats:
+        longest, shortest = stats['longest_match'], stats['shortest_match']
+        right_rows.append(('row', "Longest match",
+                           f"{format_seconds(longest['duration_s'])}  ({roster(longest['winner'])})", None))
+        right_rows.append(('row', "Shortest match",
+                           f"{format_seconds(shortest['duration_s'])}  ({roster(shortest['winner'])})", None))
+
+    if 'most_wins' in stats:
+        right_rows.append(('row', "Most wins",
+                           f"{roster(stats['most_wins']['team'])} ({stats['most_wins']['count']})", 'gold'))
+
+    # RIGHT — Scoring Stats (only when score data present)
+    scoring = stats.get('scoring')
+    if scoring:
+        right_rows.append(('row', "High score",
+                           f"{scoring['high_score']}-{scoring['high_score_low']}  "
+                           f"({scoring['high_score_id']}, {roster(scoring['high_score_winner'])})", None))
+
+        right_rows.append(('section', "Scoring Stats"))
+        right_rows.append(('row', "Avg winning margin", f"{scoring['avg_margin']:.1f} pts", None))
+        right_rows.append(('row', "Avg final score",
+                           f"{scoring['avg_win']:.1f} - {scoring['avg_loss']:.1f}", None))
+
+        for label_text, key in (("Closest match", 'closest'), ("Most lopsided", 'blowout')):
+            m = scoring[key]
+            right_rows.append(('row', label_text,
+                               f"{m['win']}-{m['loss']} (delta {m['win'] - m['loss']})  "
+                               f"{m['id']}  {roster(m['winner'])}", None))
+
+        if 'top_scorer' in scoring:
+            top = scoring['top_scorer']
+            right_rows.append(('row', "Most pts scored", f"{roster(top['team'])} ({top['pts']} pts)", 'gold'))
+
+    if 'most_active' in stats:
+        right_rows.append(('row', "Most active",
+                           f"{roster(stats['most_active']['team'])} ({stats['most_active']['count']})", None))
+
+    if 'best_lb_run' in stats:
+        run = stats['best_lb_run']
+        right_rows.append(('row', "Best LB Run", f"{roster(run['team'])} ({run['wins']}W-{run['losses']}L)", None))
+
+    if 'quickest_exit' in stats:
+        quick = stats['quickest_exit']
+        right_rows.append(('row', "Quickest Exit",
+                           f"{roster(quick['team'])} ({quick['matches']} match{'es' if quick['matches'] != 1 else ''})",
+                           None))
+
+    had_reset = stats.get('had_gf_reset', False)
+    right_rows.append(('row', "Undefeated Teams", "None" if had_reset else roster(champion, " / "),
+                       'fg2' if had_reset else 'gold'))
+    return left_rows, right_rows
+
+def report_history_rows(payload):
+    """Match history as (match id, winner roster, loser roster, score, duration, winning colour) rows."""
+    rosters, durations = payload['rosters'], payload['durations']
+    rows = []
+    for idx, rec in enumerate(payload['stats'].get('match_history', [])):
+        score_str = ""
+        if 'red_score' in rec and 'blue_score' in rec:
+            score_str = f"{rec['red_score']}-{rec['blue_score']}"
+        dur_str = format_seconds(durations[idx]) if idx < len(durations) else "-"
+        rows.append((rec.get('id', '-'),
+                     " & ".join(rosters.get(rec['winner'], ['?', '?'])),
+                     " & ".join(rosters.get(rec['loser'], ['?', '?'])),
+                     score_str, dur_str, rec.get('color')))
+    return rows
+
+def _build_results_pdf(filepath, payload, progress=None, cancel=None):
+    """
+    Writes the tournament results PDF for a pdf_report_payload() dict.
+    progress(fraction, message) is called as the build advances; when
+    cancel() returns true the build stops with PdfExportCancelled and no
+    file is left behind.
+    """
+    def step(fraction, message):
+        if cancel and cancel():
+            raise PdfExportCancelled()
+        if progress:
+            progress(fraction, message)
+
+    step(0.0, "Preparing report")
+    load_reportlab()
+    st = _pdf_styles()
+    C_BG, C_GOLD = st['C_BG'], st['C_GOLD']
+    C_FG2, C_RED, C_BLUE = st['C_FG2'], st['C_RED'], st['C_BLUE']
+
+    champion = payload['champion']
+    history = payload['stats'].get('match_history', [])
+
+    def lbl(text):
+        return Paragraph(text, st['label'])
+
+    def val(text, color=None):
+        return Paragraph(text, _pdf_tinted(st, 'value', color))
+
+    def section(text):
+        return Paragraph(text, st['sec_hdr'])
+
+    def hr():
+        return HRFlowable(width="100%", thickness=1,
+                          color=C_GOLD, spaceAfter=6, spaceBefore=2)
+
+    # ── Build story ──────────────────────────────────────────────────────
+    doc = SimpleDocTemplate(
+        filepath,
+        pagesize=letter,
+        leftMargin=0.6*inch, rightMargin=0.6*inch,
+        topMargin=0.6*inch,  bottomMargin=0.6*inch,
+    )
+
+    W = letter[0] - 1.2*inch   # usable width
+    COL_W = (W - 0.15*inch) / 2  # two equal columns
+
+    story = []
+
+    # ── Header ───────────────────────────────────────────────────────────
+    story.append(Paragraph("TOURNAMENT COMPLETE", st['title']))
+    story.append(hr())
+
+    # ── Champion block ───────────────────────────────────────────────────
+    champ_table = Table(
+        [[Paragraph("CHAMPIONS", st['champ_hdr'])],
+         [Paragraph(" / ".join(payload['rosters'].get(champion, ['?', '?'])), st['champ_name'])],
+        ],
+        colWidths=[W]
+    )
+    champ_table.setStyle(TableStyle([
+        ('BACKGROUND',   (0, 0), (-1, -1), colors.HexColor('#455A64')),
+        ('ALIGN',        (0, 0), (-1, -1), 'CENTER'),
+        ('TOPPADDING',   (0, 0), (-1, -1), 6),
+        ('BOTTOMPADDING',(0, 0), (-1, -1), 6),
+    ]))
+    story.append(champ_table)
+    story.append(hr())
+
+    # ── Stat rows for the left / right columns ────────────────────────────
+    tones = {None: None, 'gold': C_GOLD, 'fg2': C_FG2, 'red': C_RED, 'blue': C_BLUE}
+    def to_cells(rows):
+        return [[section(row[1]), ""] if row[0] == 'section'
+                else [lbl(row[1]), val(row[2], tones[row[3]])]
+                for row in rows]
+    left_rows, right_rows = map(to_cells, report_stat_rows(payload))
+
+    # ── Build individual column tables ───────────────────────────────────
+    INNER_L = COL_W * 0.45  # label sub-column
+    INNER_V = COL_W * 0.55  # value sub-column
+
+    left_table  = Table(left_rows,  colWidths=[INNER_L, INNER_V])
+    right_table = Table(right_rows, colWidths=[INNER_L, INNER_V])
+    left_table.setStyle(st['stat_table'])
+    right_table.setStyle(st['stat_table'])
+
+    # ── Combine into a two-column wrapper ────────────────────────────────
+    two_col = Table(
+        [[left_table, right_table]],
+        colWidths=[COL_W, COL_W],
+        hAlign='LEFT',
+    )
+    two_col.setStyle(TableStyle([
+        ('VALIGN',       (0, 0), (-1, -1), 'TOP'),
+        ('LEFTPADDING',  (0, 0), (-1, -1), 0),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+        ('TOPPADDING',   (0, 0), (-1, -1), 0),
+        ('BOTTOMPADDING',(0, 0), (-1, -1), 0),
+        ('COLPADDING',   (0, 0), (-1, -1), 6),
+    ]))
+    story.append(two_col)
+    story.append(hr())
+
+    # ── Match History table ──────────────────────────────────────────────
+    if history:
+        step(0.1, "Building match history")
+        story.append(section("Match History"))
+
+        def mhdr(t): return Paragraph(t, st['hist_hdr'])
+        def mcell(t, color=None): return Paragraph(t, _pdf_tinted(st, 'hist_cell', color))
+
+        history_data = [[mhdr("Match"), mhdr("Winner"), mhdr("Loser"),
+                         mhdr("Score"), mhdr("Duration")]]
+        for idx, (mid, w_roster, l_roster, score_str, dur_str, color) in enumerate(report_history_rows(payload)):
+            if idx % 100 == 99:
+                step(0.1 + 0.2 * idx / len(history), "Building match history")
+            history_data.append([
+                mcell(mid),
+                mcell(w_roster, C_RED if color == 'red' else C_BLUE),
+                mcell(l_roster),
+                mcell(score_str),
+                mcell(dur_str),
+            ])
+
+        col_w = W / 5
+        hist_table = Table(history_data, colWidths=[col_w]*5)
+        hist_table.setStyle(st['hist_table'])
+        story.append(hist_table)
+
+    story.append(Spacer(1, 14))
+
+    # ── Footer ───────────────────────────────────────────────────────────
+    story.append(Paragraph(
+        f"Moose Lodge Shuffleboard  •  Generated {payload['generated']}  •  v{payload['version']}",
+        st['footer']
+    ))
+
+    # ── Page background colour via onPage callback ────────────────────────
+    def dark_background(canvas_obj, doc_obj):
+        canvas_obj.saveState()
+        canvas_obj.setFillColor(C_BG)
+        canvas_obj.rect(0, 0, letter[0], letter[1], fill=1, stroke=0)
+        canvas_obj.restoreState()
+
+    # Layout is most of the work and the history table dominates it, so
+    # progress is pages done against the pages that table should need.
+    est_pages = 1 + len(history) / PDF_HISTORY_ROWS_PER_PAGE
+    def on_layout(kind, value):
+        if kind == 'PAGE':
+            step(0.3 + 0.65 * min(1.0, (value - 1) / est_pages), f"Laying out page {value}")
+    doc.setProgressCallBack(on_layout)
+
+    step(0.3, "Laying out pages")
+    try:
+        doc.build(story, onFirstPage=dark_background, onLaterPages=dark_background)
+    except PdfExportCancelled:
+        if os.path.exists(filepath):
+            os.remove(filepath)
+        raise
+    if progress:
+        progress(1.0, "Done")
+    return filepath
+
+def _pdf_worker_init(progress_queue, cancel_event):
+    """Initializer for the PDF worker process."""
+    global _PDF_PROGRESS_QUEUE, _PDF_CANCEL_EVENT, LOG_CONSOLE
+    _PDF_PROGRESS_QUEUE, _PDF_CANCEL_EVENT = progress_queue, cancel_event
+    LOG_CONSOLE = False
+    load_reportlab()   # import while the worker idles, not during the first export
+
+def _pdf_worker_job(filepath, payload):
+    """Runs in the worker: one export, reporting through the shared queue and event."""
+    return _build_results_pdf(filepath, payload,
+                              progress=lambda f, msg: _PDF_PROGRESS_QUEUE.put((f, msg)),
+                              cancel=_PDF_CANCEL_EVENT.is_set)
+
+def _get_pdf_executor():
+    """The PDF worker pool, (re)started on demand in a clean spawned process."""
+    global _PDF_EXECUTOR, _PDF_PROGRESS_QUEUE, _PDF_CANCEL_EVENT
+    if _PDF_EXECUTOR is None:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        ctx = multiprocessing.get_context('spawn')   # never fork the Tk process
+        _PDF_PROGRESS_QUEUE = ctx.Queue()
+        _PDF_CANCEL_EVENT = ctx.Event()
+        _PDF_EXECUTOR = ProcessPoolExecutor(max_workers=1, mp_context=ctx,
+                                            initializer=_pdf_worker_init,
+                                            initargs=(_PDF_PROGRESS_QUEUE, _PDF_CANCEL_EVENT))
+    return _PDF_EXECUTOR
+
+def shutdown_pdf_worker():
+    """Stops the PDF worker, abandoning any export in progress."""
+    global _PDF_EXECUTOR
+    if _PDF_EXECUTOR is not None:
+        _PDF_CANCEL_EVENT.set()
+        _PDF_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+        _PDF_EXECUTOR = None
 
 def export_results_pdf(champion):
     """
     Exports the tournament final screen stats to a PDF file using ReportLab.
-    Mirrors the data logic of display_final_rankings().
+    The document is built in the PDF worker process while a progress dialog
+    keeps the UI responsive; see _build_results_pdf() for the layout.
     """
-    if not REPORTLAB_AVAILABLE:
+    from concurrent.futures.process import BrokenProcessPool
+    global _pdf_export_dialog
+
+    if not reportlab_installed():
         messagebox.showerror(
             "Missing Library",
             "ReportLab is not installed.\n\nRun:  pip install reportlab\n\nthen restart the app."
         )
         return
 
+    if _pdf_export_dialog is not None and _pdf_export_dialog.winfo_exists():
+        _pdf_export_dialog.lift()
+        return
+
     filepath = filedialog.asksaveasfilename(
         defaultextension=".pdf",
         filetypes=[("PDF files", "*.pdf")],
@@ -4203,420 +5984,83 @@ def export_results_pdf(champion):
     if not filepath:
         return  # User cancelled
 
+    export_started = time.perf_counter_ns()   # traced from here: the save dialog is user time
     try:
-        # ── Colour palette mirroring THEME ──────────────────────────────────
-        C_BG        = colors.HexColor('#263238')
-        C_CARD      = colors.HexColor('#37474F')
-        C_GOLD      = colors.HexColor('#FFD700')
-        C_FG        = colors.HexColor('#ECEFF1')
-        C_FG2       = colors.HexColor('#B0BEC5')
-        C_RED       = colors.HexColor('#E53935')
-        C_BLUE      = colors.HexColor('#1E88E5')
-        C_WHITE     = colors.white
-
-        # ── Paragraph styles ────────────────────────────────────────────────
-        base = ParagraphStyle('base', fontName='Helvetica',
-                              fontSize=10, textColor=C_FG,
-                              backColor=C_BG, leading=14)
-        title_style = ParagraphStyle('title', parent=base,
-                                     fontName='Helvetica-Bold',
-                                     fontSize=18, textColor=C_GOLD,
-                                     alignment=TA_CENTER, spaceAfter=4)
-        champ_name  = ParagraphStyle('champName', parent=base,
-                                     fontName='Helvetica-Bold',
-                                     fontSize=15, textColor=C_FG,
-                                     alignment=TA_CENTER)
-        champ_sub   = ParagraphStyle('champSub', parent=base,
-                                     fontSize=10, textColor=C_FG2,
-                                     alignment=TA_CENTER, spaceAfter=8)
-        sec_hdr     = ParagraphStyle('secHdr', parent=base,
-                                     fontName='Helvetica-Bold',
-                                     fontSize=10, textColor=C_GOLD,
-                                     spaceBefore=10, spaceAfter=4)
-        footer_style= ParagraphStyle('footer', parent=base,
-                                     fontSize=8, textColor=C_FG2,
-                                     alignment=TA_CENTER)
-
-        # ── Table cell styles ────────────────────────────────────────────────
-        LABEL_STYLE = ParagraphStyle('lbl', parent=base,
-                                     fontSize=9, textColor=C_FG2)
-        VALUE_STYLE = ParagraphStyle('val', parent=base,
-                                     fontName='Helvetica-Bold',
-                                     fontSize=9, textColor=C_FG)
-
-        def lbl(text):
-            return Paragraph(text, LABEL_STYLE)
-
-        def val(text, color=None):
-            s = ParagraphStyle('v', parent=VALUE_STYLE,
-                               textColor=color or C_FG)
-            return Paragraph(text, s)
-
-        def section(text):
-            return Paragraph(text, sec_hdr)
-
-        def hr():
-            return HRFlowable(width="100%", thickness=1,
-                              color=C_GOLD, spaceAfter=6, spaceBefore=2)
-
-        # ── Shared table style ───────────────────────────────────────────────
-        def stat_table_style():
-            return TableStyle([
-                ('BACKGROUND',  (0, 0), (-1, -1), C_CARD),
-                ('TEXTCOLOR',   (0, 0), (-1, -1), C_FG),
-                ('ROWBACKGROUNDS', (0, 0), (-1, -1), [C_CARD, colors.HexColor('#2E3C43')]),
-                ('LEFTPADDING',  (0, 0), (-1, -1), 8),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-                ('TOPPADDING',   (0, 0), (-1, -1), 4),
-                ('BOTTOMPADDING',(0, 0), (-1, -1), 4),
-            ])
-
-        # ── Build story ──────────────────────────────────────────────────────
-        doc = SimpleDocTemplate(
-            filepath,
-            pagesize=letter,
-            leftMargin=0.6*inch, rightMargin=0.6*inch,
-            topMargin=0.6*inch,  bottomMargin=0.6*inch,
-        )
-
-        W = letter[0] - 1.2*inch   # usable width
-        COL_W = (W - 0.15*inch) / 2  # two equal columns
-
-        story = []
-
-        # ── Header ───────────────────────────────────────────────────────────
-        story.append(Paragraph("TOURNAMENT COMPLETE", title_style))
-        story.append(hr())
+        payload = pdf_report_payload(champion)
+        executor = _get_pdf_executor()
+        while True:   # drop progress left over from a cancelled export
+            try:
+                _PDF_PROGRESS_QUEUE.get_nowait()
+            except queue.Empty:
+                break
+        _PDF_CANCEL_EVENT.clear()
+        future = executor.submit(_pdf_worker_job, filepath, payload)
+    except Exception as e:
+        log_message(f"PDF export failed: {e}", "ERROR")
+        messagebox.showerror("Export Failed", f"Could not create PDF:\n{e}")
+        return
 
-        # ── Champion block ───────────────────────────────────────────────────
-        champ_roster = " / ".join(TEAM_ROSTERS.get(champion, ['?', '?']))
-        champ_table = Table(
-            [[Paragraph("CHAMPIONS", ParagraphStyle('ct', parent=base,
-                         fontName='Helvetica-Bold', fontSize=10,
-                         textColor=C_GOLD, alignment=TA_CENTER)),],
-             [Paragraph(champ_roster, champ_name)],
-            ],
-            colWidths=[W]
-        )
-        champ_table.setStyle(TableStyle([
-            ('BACKGROUND',   (0, 0), (-1, -1), colors.HexColor('#455A64')),
-            ('ALIGN',        (0, 0), (-1, -1), 'CENTER'),
-            ('TOPPADDING',   (0, 0), (-1, -1), 6),
-            ('BOTTOMPADDING',(0, 0), (-1, -1), 6),
-        ]))
-        story.append(champ_table)
-        story.append(hr())
-
-        # ── Collect all stat rows for left / right columns ────────────────────
-        left_rows  = []
-        right_rows = []
-
-        # LEFT — Final Standings
-        left_rows.append([section("Final Standings"), ""])
-        places = [
-            ('1st Place', '1ST', C_GOLD),
-            ('2nd Place', '2ND', C_FG),
-            ('3rd Place', '3RD', C_FG2),
-        ]
-        for label_text, key, color in places:
-            team = TOURNAMENT_RANKINGS.get(key)
-            if not team:
-                continue
-            roster = " / ".join(TEAM_ROSTERS.get(team, ['?', '?']))
-            wins, losses = get_team_record(team)
-            left_rows.append([lbl(f"{label_text}  (W/L {wins}/{losses})"),
-                               val(roster, color)])
-
-        # LEFT — Tournament Stats
-        left_rows.append([section("Tournament Stats"), ""])
-        total_teams   = len(TEAMS)
-        total_players = sum(len(r) for r in TEAM_ROSTERS.values())
-        total_matches = len(MATCH_DURATIONS)
-        total_time    = sum(MATCH_DURATIONS)
-        avg_time      = int(total_time / total_matches) if total_matches else 0
-
-        left_rows.append([lbl("Teams"),           val(str(total_teams))])
-        left_rows.append([lbl("Players"),         val(str(total_players))])
-        left_rows.append([lbl("Matches played"),  val(str(total_matches))])
-        left_rows.append([lbl("Total time"),      val(format_seconds(total_time))])
-        left_rows.append([lbl("Avg match time"),  val(format_seconds(avg_time))])
-
-        # Longest win streak (consecutive wins by one team across MATCH_HISTORY order)
-        if MATCH_HISTORY:
-            best_streak, best_team_s = 0, None
-            cur_streak,  cur_team    = 0, None
-            for rec in MATCH_HISTORY:
-                if rec['winner'] == cur_team:
-                    cur_streak += 1
-                else:
-                    cur_team   = rec['winner']
-                    cur_streak = 1
-                if cur_streak > best_streak:
-                    best_streak, best_team_s = cur_streak, cur_team
-            if best_streak > 1 and best_team_s:
-                streak_roster = " & ".join(TEAM_ROSTERS.get(best_team_s, ['?', '?']))
-                left_rows.append([lbl("Longest win streak"),
-                                   val(f"{streak_roster}  ({best_streak})")])
-
-        # Champion win rate
-        champ_wins, champ_losses = get_team_record(champion)
-        champ_played = champ_wins + champ_losses
-        champ_pct = int(champ_wins / champ_played * 100) if champ_played else 0
-        left_rows.append([lbl("Champion win rate"),
-                           val(f"{champ_wins}W-{champ_losses}L  ({champ_pct}%)", C_GOLD)])
-
-        # WB vs LB match split
-        wb_count = sum(1 for r in MATCH_HISTORY
-                       if not (r.get('id', '').startswith('G') and
-                               any(r.get('id', '') == mid
-                                   for mid, md in TOURNAMENT_STATE.items()
-                                   if isinstance(md, dict) and not md.get('is_winnerbracket', True))))
-        # Simpler: count by match ID prefix patterns — GF/GGF are finals, Gx depends on is_winnerbracket
-        wb_ids = {mid for mid, md in TOURNAMENT_STATE.items()
-                  if isinstance(md, dict) and md.get('is_winnerbracket') is True}
-        lb_ids = {mid for mid, md in TOURNAMENT_STATE.items()
-                  if isinstance(md, dict) and md.get('is_winnerbracket') is False}
-        fin_ids= {'GF', 'GGF'}
-        wb_played  = sum(1 for r in MATCH_HISTORY if r.get('id') in wb_ids)
-        lb_played  = sum(1 for r in MATCH_HISTORY if r.get('id') in lb_ids)
-        fin_played = sum(1 for r in MATCH_HISTORY if r.get('id') in fin_ids)
-        if wb_played or lb_played or fin_played:
-            parts = []
-            if wb_played:  parts.append(f"{wb_played} WB")
-            if lb_played:  parts.append(f"{lb_played} LB")
-            if fin_played: parts.append(f"{fin_played} Finals")
-            left_rows.append([lbl("Match breakdown"), val("  /  ".join(parts))])
-
-        # RIGHT — Match Breakdown
-        right_rows.append([section("Match Breakdown"), ""])
-        total_h   = len(MATCH_HISTORY)
-        red_wins  = sum(1 for x in MATCH_HISTORY if x['color'] == 'red')
-        blue_wins = sum(1 for x in MATCH_HISTORY if x['color'] == 'blue')
-        red_pct   = int(red_wins  / total_h * 100) if total_h else 0
-        blue_pct  = int(blue_wins / total_h * 100) if total_h else 0
-        right_rows.append([lbl("Red side wins"),  val(f"{red_wins} ({red_pct}%)", C_RED)])
-        right_rows.append([lbl("Blue side wins"), val(f"{blue_wins} ({blue_pct}%)", C_BLUE)])
-
-        if MATCH_DURATIONS and MATCH_HISTORY:
-            paired = list(zip(MATCH_DURATIONS, MATCH_HISTORY))
-            long_dur, long_rec = max(paired, key=lambda x: x[0])
-            shrt_dur, shrt_rec = min(paired, key=lambda x: x[0])
-            lw = " & ".join(TEAM_ROSTERS.get(long_rec['winner'], ['?', '?']))
-            sw = " & ".join(TEAM_ROSTERS.get(shrt_rec['winner'], ['?', '?']))
-            right_rows.append([lbl("Longest match"),  val(f"{format_seconds(long_dur)}  ({lw})")])
-            right_rows.append([lbl("Shortest match"), val(f"{format_seconds(shrt_dur)}  ({sw})")])
-
-        team_wins = {}
-        for rec in MATCH_HISTORY:
-            team_wins[rec['winner']] = team_wins.get(rec['winner'], 0) + 1
-        if team_wins:
-            top_team   = max(team_wins, key=team_wins.get)
-            top_roster = " & ".join(TEAM_ROSTERS.get(top_team, ['?', '?']))
-            right_rows.append([lbl("Most wins"),
-                                val(f"{top_roster} ({team_wins[top_team]})", C_GOLD)])
-
-        # RIGHT — Scoring Stats (only when score data present)
-        scored_recs = [r for r in MATCH_HISTORY if 'red_score' in r and 'blue_score' in r]
-        if scored_recs:
-            high_rec   = max(scored_recs, key=lambda x: max(x['red_score'], x['blue_score']))
-            high_score = max(high_rec['red_score'], high_rec['blue_score'])
-            low_score  = min(high_rec['red_score'], high_rec['blue_score'])
-            high_roster = " & ".join(TEAM_ROSTERS.get(high_rec['winner'], ['?', '?']))
-            right_rows.append([lbl("High score"),
-                                val(f"{high_score}-{low_score}  ({high_rec['id']}, {high_roster})")])
-
-            right_rows.append([section("Scoring Stats"), ""])
-
-            margins    = [abs(r['red_score'] - r['blue_score']) for r in scored_recs]
-            win_scores = [max(r['red_score'], r['blue_score']) for r in scored_recs]
-            loss_scores= [min(r['red_score'], r['blue_score']) for r in scored_recs]
-
-            avg_margin = sum(margins) / len(margins)
-            avg_win    = sum(win_scores)  / len(win_scores)
-            avg_loss   = sum(loss_scores) / len(loss_scores)
-            right_rows.append([lbl("Avg winning margin"), val(f"{avg_margin:.1f} pts")])
-            right_rows.append([lbl("Avg final score"),    val(f"{avg_win:.1f} - {avg_loss:.1f}")])
-
-            closest_rec = min(scored_recs, key=lambda x: abs(x['red_score'] - x['blue_score']))
-            c_gap  = abs(closest_rec['red_score'] - closest_rec['blue_score'])
-            c_win  = max(closest_rec['red_score'], closest_rec['blue_score'])
-            c_loss = min(closest_rec['red_score'], closest_rec['blue_score'])
-            c_roster = " & ".join(TEAM_ROSTERS.get(closest_rec['winner'], ['?', '?']))
-            right_rows.append([lbl("Closest match"),
-                                val(f"{c_win}-{c_loss} (delta {c_gap})  {closest_rec['id']}  {c_roster}")])
-
-            blowout_rec = max(scored_recs, key=lambda x: abs(x['red_score'] - x['blue_score']))
-            b_gap  = abs(blowout_rec['red_score'] - blowout_rec['blue_score'])
-            b_win  = max(blowout_rec['red_score'], blowout_rec['blue_score'])
-            b_loss = min(blowout_rec['red_score'], blowout_rec['blue_score'])
-            b_roster = " & ".join(TEAM_ROSTERS.get(blowout_rec['winner'], ['?', '?']))
-            right_rows.append([lbl("Most lopsided"),
-                                val(f"{b_win}-{b_loss} (delta {b_gap})  {blowout_rec['id']}  {b_roster}")])
-
-            team_pts = {}
-            for rec in scored_recs:
-                r_score = rec['red_score']
-                b_score = rec['blue_score']
-                if rec['color'] == 'red':
-                    win_team,  win_pts  = rec['winner'], r_score
-                    loss_team, loss_pts = rec['loser'],  b_score
-                else:
-                    win_team,  win_pts  = rec['winner'], b_score
-                    loss_team, loss_pts = rec['loser'],  r_score
-                team_pts[win_team]  = team_pts.get(win_team,  0) + win_pts
-                team_pts[loss_team] = team_pts.get(loss_team, 0) + loss_pts
-            if team_pts:
-                top_scorer        = max(team_pts, key=team_pts.get)
-                top_scorer_roster = " & ".join(TEAM_ROSTERS.get(top_scorer, ['?', '?']))
-                right_rows.append([lbl("Most pts scored"),
-                                    val(f"{top_scorer_roster} ({team_pts[top_scorer]} pts)", C_GOLD)])
-
-        # Most active
-        team_matches = {}
-        for rec in MATCH_HISTORY:
-            for t in [rec['winner'], rec['loser']]:
-                team_matches[t] = team_matches.get(t, 0) + 1
-        if team_matches:
-            busiest     = max(team_matches, key=team_matches.get)
-            busy_roster = " & ".join(TEAM_ROSTERS.get(busiest, ['?', '?']))
-            right_rows.append([lbl("Most active"),
-                                val(f"{busy_roster} ({team_matches[busiest]})")])
-
-        # Best LB run
-        lb_runs = {}
-        for rec in MATCH_HISTORY:
-            lb_runs[rec['winner']] = lb_runs.get(rec['winner'], 0) + 1
-        lb_contenders = {t: w for t, w in lb_runs.items()
-                         if sum(1 for x in MATCH_HISTORY if x['loser'] == t) > 0}
-        if lb_contenders:
-            grinder      = max(lb_contenders, key=lb_contenders.get)
-            grind_roster = " & ".join(TEAM_ROSTERS.get(grinder, ['?', '?']))
-            grind_losses = sum(1 for x in MATCH_HISTORY if x['loser'] == grinder)
-            right_rows.append([lbl("Best LB Run"),
-                                val(f"{grind_roster} ({lb_contenders[grinder]}W-{grind_losses}L)")])
-
-        # Quickest exit
-        all_teams_in_history = set()
-        for rec in MATCH_HISTORY:
-            all_teams_in_history.add(rec['winner'])
-            all_teams_in_history.add(rec['loser'])
-        team_total_matches = {t: sum(1 for x in MATCH_HISTORY
-                                     if x['winner'] == t or x['loser'] == t)
-                              for t in all_teams_in_history}
-        eliminated = {t: m for t, m in team_total_matches.items() if t != champion}
-        if eliminated:
-            quickest     = min(eliminated, key=eliminated.get)
-            quick_roster = " & ".join(TEAM_ROSTERS.get(quickest, ['?', '?']))
-            right_rows.append([lbl("Quickest Exit"),
-                                val(f"{quick_roster} ({eliminated[quickest]} match{'es' if eliminated[quickest] != 1 else ''})")])
-
-        # GF reset?
-        gf_data  = TOURNAMENT_STATE.get('GF', {})
-        had_reset = isinstance(gf_data, dict) and gf_data.get('is_reset', False)
-        champ_roster_str = " / ".join(TEAM_ROSTERS.get(champion, ['?', '?']))
-        right_rows.append([lbl("Undefeated Teams"),
-                            val("None" if had_reset else champ_roster_str,
-                                C_FG2 if had_reset else C_GOLD)])
-
-        # ── Build individual column tables ───────────────────────────────────
-        INNER_L = COL_W * 0.45  # label sub-column
-        INNER_V = COL_W * 0.55  # value sub-column
-
-        left_table  = Table(left_rows,  colWidths=[INNER_L, INNER_V])
-        right_table = Table(right_rows, colWidths=[INNER_L, INNER_V])
-        left_table.setStyle(stat_table_style())
-        right_table.setStyle(stat_table_style())
-
-        # ── Combine into a two-column wrapper ────────────────────────────────
-        two_col = Table(
-            [[left_table, right_table]],
-            colWidths=[COL_W, COL_W],
-            hAlign='LEFT',
-        )
-        two_col.setStyle(TableStyle([
-            ('VALIGN',       (0, 0), (-1, -1), 'TOP'),
-            ('LEFTPADDING',  (0, 0), (-1, -1), 0),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 0),
-            ('TOPPADDING',   (0, 0), (-1, -1), 0),
-            ('BOTTOMPADDING',(0, 0), (-1, -1), 0),
-            ('COLPADDING',   (0, 0), (-1, -1), 6),
-        ]))
-        story.append(two_col)
-        story.append(hr())
-
-        # ── Match History table ──────────────────────────────────────────────
-        if MATCH_HISTORY:
-            story.append(section("Match History"))
-            hdr_style = ParagraphStyle('mhHdr', parent=base,
-                                       fontName='Helvetica-Bold',
-                                       fontSize=8, textColor=C_GOLD)
-            cell_style = ParagraphStyle('mhCell', parent=base,
-                                        fontSize=8, textColor=C_FG)
-
-            def mhdr(t): return Paragraph(t, hdr_style)
-            def mcell(t, color=None):
-                s = ParagraphStyle('mc', parent=cell_style,
-                                   textColor=color or C_FG)
-                return Paragraph(t, s)
-
-            history_data = [[mhdr("Match"), mhdr("Winner"), mhdr("Loser"),
-                              mhdr("Score"), mhdr("Duration")]]
-            for rec in MATCH_HISTORY:
-                w_roster = " & ".join(TEAM_ROSTERS.get(rec['winner'], ['?', '?']))
-                l_roster = " & ".join(TEAM_ROSTERS.get(rec['loser'],  ['?', '?']))
-                score_str = ""
-                if 'red_score' in rec and 'blue_score' in rec:
-                    score_str = f"{rec['red_score']}-{rec['blue_score']}"
-                idx = MATCH_HISTORY.index(rec)
-                dur_str = format_seconds(MATCH_DURATIONS[idx]) if idx < len(MATCH_DURATIONS) else "-"
-                w_color = C_RED if rec.get('color') == 'red' else C_BLUE
-                history_data.append([
-                    mcell(rec.get('id', '-')),
-                    mcell(w_roster, w_color),
-                    mcell(l_roster),
-                    mcell(score_str),
-                    mcell(dur_str),
-                ])
-
-            col_w = W / 5
-            hist_table = Table(history_data, colWidths=[col_w]*5)
-            hist_table.setStyle(TableStyle([
-                ('BACKGROUND',    (0, 0), (-1, 0),  C_CARD),
-                ('ROWBACKGROUNDS',(0, 1), (-1, -1), [C_CARD, colors.HexColor('#2E3C43')]),
-                ('LINEBELOW',     (0, 0), (-1, 0),  1, C_GOLD),
-                ('LEFTPADDING',   (0, 0), (-1, -1), 6),
-                ('RIGHTPADDING',  (0, 0), (-1, -1), 6),
-                ('TOPPADDING',    (0, 0), (-1, -1), 3),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
-            ]))
-            story.append(hist_table)
-
-        story.append(Spacer(1, 14))
-
-        # ── Footer ───────────────────────────────────────────────────────────
-        ts = datetime.datetime.now().strftime("%B %d, %Y  %I:%M %p")
-        story.append(Paragraph(
-            f"Moose Lodge Shuffleboard  •  Generated {ts}  •  v{SHUF_VERSION}",
-            footer_style
-        ))
-
-        # ── Page background colour via onPage callback ────────────────────────
-        def dark_background(canvas_obj, doc_obj):
-            canvas_obj.saveState()
-            canvas_obj.setFillColor(C_BG)
-            canvas_obj.rect(0, 0, letter[0], letter[1], fill=1, stroke=0)
-            canvas_obj.restoreState()
+    # ── Progress dialog ──────────────────────────────────────────────────
+    dialog = tk.Toplevel(main_root)
+    _pdf_export_dialog = dialog
+    dialog.title("Exporting PDF")
+    dialog.configure(bg=THEME['bg_main'])
+    dialog.resizable(False, False)
+    dialog.geometry(scaled_geo(360, 150))
+
+    status_lbl = tk.Label(dialog, text="Preparing report…", font=THEME['font_main'],
+                          bg=THEME['bg_main'], fg=THEME['fg_primary'])
+    status_lbl.pack(pady=(SF(18), SF(8)))
+    bar = ttk.Progressbar(dialog, mode='determinate', maximum=100, length=SF(300))
+    bar.pack(padx=SF(20))
+
+    def _cancel():
+        _PDF_CANCEL_EVENT.set()
+        cancel_btn.config(state='disabled')
+        status_lbl.config(text="Cancelling…")
+
+    cancel_btn = tk.Button(dialog, text="Cancel", bg=THEME['btn_cancel'], fg='white',
+                           relief='flat', padx=SF(16), pady=SF(5), font=THEME['font_main'],
+                           command=_cancel)
+    cancel_btn.pack(pady=SF(12))
+    dialog.protocol("WM_DELETE_WINDOW", _cancel)
+
+    def _poll():
+        global _pdf_export_dialog, _PDF_EXECUTOR
+        latest = None
+        while True:
+            try:
+                latest = _PDF_PROGRESS_QUEUE.get_nowait()
+            except queue.Empty:
+                break
+        if latest and not _PDF_CANCEL_EVENT.is_set():
+            bar['value'] = latest[0] * 100
+            status_lbl.config(text=latest[1])
+        if not future.done():
+            dialog.after(PDF_POLL_MS, _poll)
+            return
 
-        doc.build(story, onFirstPage=dark_background, onLaterPages=dark_background)
+        dialog.destroy()
+        _pdf_export_dialog = None
+        trace_record('export_results_pdf', export_started, time.perf_counter_ns())
+        try:
+            future.result()
+        except PdfExportCancelled:
+            log_message(f"PDF export cancelled: {filepath}")
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                _PDF_EXECUTOR = None   # restart the worker next time
+            log_message(f"PDF export failed: {e}", "ERROR")
+            messagebox.showerror("Export Failed",
+                                 f"Could not create PDF:\n{e}")
+        else:
+            log_message(f"PDF exported: {filepath}")
+            messagebox.showinfo("Export Successful",
+                                f"Tournament results saved to:\n{filepath}")
 
-        log_message(f"PDF exported: {filepath}")
-        messagebox.showinfo("Export Successful",
-                            f"Tournament results saved to:\n{filepath}")
+    dialog.after(PDF_POLL_MS, _poll)
 
-    except Exception as e:
-        log_message(f"PDF export failed: {e}", "ERROR")
-        messagebox.showerror("Export Failed",
-                             f"Could not create PDF:\n{e}")
+# =============================================================================
 
 
 def display_final_rankings(champion):
@@ -4973,9 +6417,28 @@ def setup_main_gui(root):
     # Watchdog: silently reconnects if the Flipper drops mid-session
     start_flipper_watchdog()
 
+    # Heartbeat that measures UI freezes (see Event-Loop Lag Monitor)
+    start_lag_monitor(root)
+
+    # Debug: periodic Tk object counts (see Leak Detector)
+    if LEAK_CHECK_ENABLED:
+        start_leak_monitor(root)
+
     # F12 → send IR power command to scoreboard
     root.bind('<F12>', lambda e: ir_send('power'))
 
+    # F9 → save the performance trace (see Performance Trace)
+    root.bind('<F9>', lambda e: save_trace_snapshot())
+
+    # F8 → toggle the event-loop lag overlay in the footer
+    root.bind('<F8>', lambda e: toggle_lag_overlay(root))
+
+    # F7 → log the leak-check trend so far
+    root.bind('<F7>', lambda e: log_leak_report())
+
+    # F6 → open the TV/projector display in its own process (see TV Display)
+    root.bind('<F6>', lambda e: open_tv_display(root))
+
     root.geometry(screen_geometry(root, width_ratio=0.42, height_ratio=0.72, min_w=470, min_h=600))
     root.minsize(SF(470), SF(600))
 
@@ -5141,26 +6604,15 @@ def show_draw_summary(player_draws, TEAMS, TEAM_ROSTERS, num_teams, total_pool,
 
     summary_root.mainloop()
 
-def generate_dynamic_bracket(teams, config=None):
+def build_bracket_state(teams, config):
     """
-    Loads the bracket structure from the config file, initializes TOURNAMENT_STATE,
-    and seeds the starting matches with teams (T1, T2, etc.).
+    Builds a fresh TOURNAMENT_STATE-shaped dict from a parsed config and
+    seeds the starting matches with teams (T1, T2, etc.). Does not pick the
+    active match; see next_playable_match().
     """
-    global TOURNAMENT_STATE
-    TOURNAMENT_STATE.clear()
-
-    num_teams = len(teams)
-    log_message(f"Generating bracket for {num_teams} teams")
-
-    if config is None:
-        try:
-            config, _ = load_bracket_config(num_teams, 'D')
-        except Exception as e:
-            messagebox.showerror("Configuration Error", str(e))
-            return
-
+    state = {}
     for match_id, match_config in config.items():
-        TOURNAMENT_STATE[match_id] = {
+        state[match_id] = {
             'config': {
                 'W_next': match_config['W_next'],
                 'L_next': match_config['L_next'],
@@ -5173,6 +6625,9 @@ def generate_dynamic_bracket(teams, config=None):
             'is_reset': match_id == 'GGF',
             'is_winnerbracket': match_config.get('is_winnerbracket', 'unknown')
         }
+        for key in ('format', 'bye'):
+            if key in match_config:
+                state[match_id]['config'][key] = match_config[key]
 
     for match_id, match_data in config.items():
         if match_id.startswith('G'):
@@ -5189,10 +6644,37 @@ def generate_dynamic_bracket(teams, config=None):
                 if match_t_id:
                     t_num = int(match_t_id.group(1)) - 1
                     if t_num < len(teams):
-                        TOURNAMENT_STATE[match_id]['teams'][i] = teams[t_num]
+                        state[match_id]['teams'][i] = teams[t_num]
                         log_message(f"  -> Seeded {teams[t_num]} into {match_id} [slot {i}]", "DEBUG")
                     else:
-                        TOURNAMENT_STATE[match_id]['teams'][i] = None
+                        state[match_id]['teams'][i] = None
+
+    # A seeded bye is a walkover for whoever sits in it
+    for match_id, match_data in state.items():
+        if match_data['config'].get('bye') and match_data['teams'][0]:
+            match_data['winner'] = match_data['teams'][0]
+    return state
+
+def generate_dynamic_bracket(teams, config=None):
+    """
+    Loads the bracket structure from the config file, initializes TOURNAMENT_STATE,
+    and seeds the starting matches with teams (T1, T2, etc.).
+    """
+    global TOURNAMENT_STATE
+    TOURNAMENT_STATE.clear()
+    invalidate_compiled_bracket()
+
+    num_teams = len(teams)
+    log_message(f"Generating bracket for {num_teams} teams")
+
+    if config is None:
+        try:
+            config, _ = load_bracket_config(num_teams, TOURNAMENT_FORMAT)
+        except Exception as e:
+            messagebox.showerror("Configuration Error", str(e))
+            return
+
+    TOURNAMENT_STATE.update(build_bracket_state(teams, config))
 
     initial_active_match = find_next_active_match()
     TOURNAMENT_STATE['active_match_id'] = initial_active_match
@@ -5201,30 +6683,22 @@ def generate_dynamic_bracket(teams, config=None):
 # --- Logging File Management ---
 def toggle_log_game(log_var):
     """Toggles file logging based on checkbox state and manages the log file."""
-    global LOG_GAME_TO_FILE, LOG_FILE_HANDLE
+    global LOG_GAME_TO_FILE
 
     LOG_GAME_TO_FILE = log_var.get()
 
     if LOG_GAME_TO_FILE:
-        log_dir = 'logs'
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
-
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        filename = os.path.join(log_dir, f"shuffleboard_{timestamp}.log")
-
         try:
-            LOG_FILE_HANDLE = open(filename, 'a', buffering=1)
-            log_message(f"File logging enabled: {filename}")
+            handle, filename = open_log_file()
         except Exception as e:
             LOG_GAME_TO_FILE = False
-            LOG_FILE_HANDLE = None
-            messagebox.showerror("Logging Error", f"Failed to open log file {filename}: {e}")
+            messagebox.showerror("Logging Error", f"Failed to open log file in {LOG_DIR}: {e}")
+            return
+        set_log_file(handle)
+        log_message(f"File logging enabled: {filename}")
     else:
-        if LOG_FILE_HANDLE:
-            LOG_FILE_HANDLE.close()
-            LOG_FILE_HANDLE = None
-            print("[Log Manager] File logging stopped.")
+        set_log_file(None)
+        print("[Log Manager] File logging stopped.")
 
 def get_player_setup_dialog(parent):
     """
@@ -5250,8 +6724,23 @@ def get_player_setup_dialog(parent):
     is_manual_draw = tk.BooleanVar(value=False)
     log_game_var = tk.BooleanVar(value=LOG_GAME_TO_FILE)
     all_paid_var = tk.BooleanVar(value=False)
+    format_var = tk.StringVar(value=TOURNAMENT_FORMATS[TOURNAMENT_FORMAT])
+    balanced_draw_var = tk.BooleanVar(value=False)
+    player_ratings = get_player_ratings(refresh=True)
     current_player_count = MIN_PLAYERS
     player_entries = []
+    # Running per-row state so a keystroke costs the same with 6 or 60 rows:
+    # an edit moves only its own row between the name/draw buckets and the
+    # tallies, and other rows are repainted only when a duplicate appears or
+    # clears.
+    row_state = {}       # name_entry -> cached fields of that row (see _read_row)
+    rows_by_name = {}    # stripped name -> name_entries using it
+    rows_by_draw = {}    # in-range draw number -> name_entries holding it
+    taken_keys = Counter()   # _player_key of every entered name
+    tally = Counter()    # rows that are 'paid', 'named' (real name) and 'ready' to start
+    dup_draws = 0        # draw numbers held by more than one row
+    row_updaters = {}    # name_entry -> its row's update_row_status
+    rows_building = False    # render_inputs is adding rows; it refreshes the summary once at the end
     status_banner_refs = None
     header_frame_ref = None
     btn_add = None
@@ -5260,6 +6749,7 @@ def get_player_setup_dialog(parent):
 
     def _on_mousewheel(event):
         """Handle mousewheel scrolling"""
+        _hide_suggestions()
         content_height = canvas.bbox("all")[3] if canvas.bbox("all") else 0
         visible_height = canvas.winfo_height()
         if content_height <= visible_height:
@@ -5335,11 +6825,11 @@ def get_player_setup_dialog(parent):
 
         def update_status():
             """Update banner with current state"""
-            if not player_entries:
+            if not row_state:
                 return
 
-            total = len(player_entries)
-            paid = sum(1 for _, paid_var, _, _ in player_entries if paid_var.get())
+            total = len(row_state)
+            paid = tally['paid']
 
             count_circle.config(text=str(total))
 
@@ -5390,98 +6880,135 @@ def get_player_setup_dialog(parent):
         tk.Label(header_frame, text="Status", width=10, font=THEME['font_bold'],
                 bg=THEME['bg_canvas'], fg=THEME['fg_secondary']).pack(side='right', padx=SF(5))
 
+        tk.Label(header_frame, text="Elo", width=5, font=THEME['font_bold'],
+                bg=THEME['bg_canvas'], fg=THEME['fg_secondary']).pack(side='right', padx=SF(5))
+
         header_frame_ref = header_frame
 
     # ========================================================================
     # VISUALS AND UPDATES
     # ========================================================================
 
+    _DEFAULT_NAME_RE = re.compile(r'^Player\s*\d+$', re.IGNORECASE)
+    _EMPTY_ROW = {'name': '', 'key': '', 'slot': None, 'draw_state': None,
+                  'paid': False, 'named': False, 'ready': False}
+
+    def _read_row(widgets):
+        """Current field values of one row, plus the flags the tallies count."""
+        name_entry, paid_var, draw_entry, _ = widgets
+        name = name_entry.get().strip()
+        paid = paid_var.get()
+        draw_state, slot = None, None
+        if is_manual_draw.get() and draw_entry:
+            try:
+                draw_num = int(draw_entry.get().strip())
+                if 1 <= draw_num <= current_player_count:
+                    draw_state, slot = 'ok', draw_num
+                else:
+                    draw_state = 'range'
+            except (ValueError, AttributeError):
+                draw_state = 'invalid'
+        return {
+            'name': name,
+            'key': _player_key(name),
+            'slot': slot,
+            'draw_state': draw_state,
+            'paid': paid,
+            'named': bool(name) and not _DEFAULT_NAME_RE.match(name),
+            # Continue needs a real name, payment and (manual draw) a usable number
+            'ready': bool(name) and not name.lower().startswith('player ') and paid
+                     and draw_state in (None, 'ok'),
+        }
+
+    def _move_bucket(buckets, old, new, entry):
+        """Moves entry between buckets (None = no bucket); returns keys whose duplicate status flipped."""
+        flipped = []
+        if old == new:
+            return flipped
+        if old is not None:
+            members = buckets[old]
+            members.discard(entry)
+            if len(members) == 1:
+                flipped.append(old)
+            if not members:
+                del buckets[old]
+        if new is not None:
+            members = buckets.setdefault(new, set())
+            members.add(entry)
+            if len(members) == 2:
+                flipped.append(new)
+        return flipped
+
+    def _apply_row_state(name_entry, new):
+        """Swaps a row's cached state for `new`, updating buckets and tallies. Returns other rows to repaint."""
+        nonlocal dup_draws
+        old = row_state.get(name_entry, _EMPTY_ROW)
+        for flag in ('paid', 'named', 'ready'):
+            tally[flag] += new[flag] - old[flag]
+        if old['key'] != new['key']:
+            if old['key']:
+                taken_keys[old['key']] -= 1
+                if not taken_keys[old['key']]:
+                    del taken_keys[old['key']]
+            if new['key']:
+                taken_keys[new['key']] += 1
+
+        repaint = set()
+        for name in _move_bucket(rows_by_name, old['name'] or None, new['name'] or None, name_entry):
+            repaint |= rows_by_name.get(name, set())
+        for slot in _move_bucket(rows_by_draw, old['slot'], new['slot'], name_entry):
+            members = rows_by_draw.get(slot, set())
+            dup_draws += 1 if len(members) > 1 else -1
+            repaint |= members
+        row_state[name_entry] = new
+        repaint.discard(name_entry)
+        return repaint
+
+    def _forget_row(widgets):
+        """Drops a row that is about to be destroyed; repaints rows it was duplicating."""
+        name_entry = widgets[0]
+        repaint = _apply_row_state(name_entry, _EMPTY_ROW)
+        del row_state[name_entry]
+        row_updaters.pop(name_entry, None)
+        for other in repaint:
+            row_updaters[other](propagate=False)
+
+    def _reset_row_tracking():
+        nonlocal dup_draws
+        row_state.clear()
+        rows_by_name.clear()
+        rows_by_draw.clear()
+        taken_keys.clear()
+        tally.clear()
+        row_updaters.clear()
+        dup_draws = 0
+
+    def _is_duplicate_draw(name_entry):
+        slot = row_state[name_entry]['slot']
+        return slot is not None and len(rows_by_draw[slot]) > 1
+
+    def _paint_name_entry(name_entry):
+        state = row_state[name_entry]
+        if state['name'] and len(rows_by_name[state['name']]) > 1:
+            name_entry.config(bg='#711717', fg='white')
+        elif not state['paid']:
+            name_entry.config(bg='#CED119', fg='black')
+        else:
+            name_entry.config(bg=THEME['bg_main'], fg=THEME['fg_primary'])
+
     def update_visuals(event=None):
-        """Update visual state of all player entries and button state"""
+        """Update the status banner and continue button from the running tallies."""
         # Skip if we're in the middle of rebuilding rows
-        if not player_entries:
+        if not row_state:
             return
 
-        from collections import Counter
-        current_names = [w[0].get().strip() for w in player_entries]
-        counts = Counter(current_names)
-
-        # Get all draw numbers if manual draw is enabled
-        draw_numbers = []
-        if is_manual_draw.get():
-            for widgets in player_entries:
-                draw_entry = widgets[2]
-                if draw_entry:
-                    try:
-                        draw_num = int(draw_entry.get().strip())
-                        # Only count valid range numbers
-                        if 1 <= draw_num <= current_player_count:
-                            draw_numbers.append(draw_num)
-                    except (ValueError, AttributeError):
-                        pass
-
-        draw_counts = Counter(draw_numbers) if draw_numbers else Counter()
-
-        for widgets in player_entries:
-            name_entry, paid_var = widgets[0], widgets[1]
-            val = name_entry.get().strip()
-
-            if val and counts[val] > 1:
-                name_entry.config(bg='#711717', fg='white')
-            elif not paid_var.get():
-                name_entry.config(bg='#CED119', fg='black')
-            else:
-                name_entry.config(bg=THEME['bg_main'], fg=THEME['fg_primary'])
-
         # Update status banner
         if status_banner_refs:
             status_banner_refs['update']()
 
         # Update continue button state: only enable if all conditions met
         if continue_btn:
-            can_continue = True
-
-            if not player_entries:
-                can_continue = False
-            else:
-                for i, widgets in enumerate(player_entries):
-                    name_entry, paid_var, draw_entry, status_label = widgets
-                    name = name_entry.get().strip()
-                    is_paid = paid_var.get()
-
-                    # Check 1: Must have a name
-                    if not name:
-                        can_continue = False
-                        break
-
-                    # Check 2: No default names (Player 1, Player 2, etc)
-                    if name.lower().startswith('player '):
-                        can_continue = False
-                        break
-
-                    # Check 3: Must be marked as paid
-                    if not is_paid:
-                        can_continue = False
-                        break
-
-                    # Check 4: If manual draw enabled, must have valid, unique, and in-range draw number
-                    if is_manual_draw.get() and draw_entry:
-                        try:
-                            draw_num = int(draw_entry.get().strip())
-
-                            # Check if draw number is in valid range
-                            if draw_num < 1 or draw_num > current_player_count:
-                                can_continue = False
-                                break
-
-                            # Check if this draw number is unique
-                            if draw_counts[draw_num] > 1:
-                                can_continue = False
-                                break
-                        except (ValueError, AttributeError):
-                            can_continue = False
-                            break
-
+            can_continue = tally['ready'] == len(row_state) and dup_draws == 0
             try:
                 if can_continue:
                     continue_btn.config(state='normal', fg='white')
@@ -5497,11 +7024,77 @@ def get_player_setup_dialog(parent):
         # Set the paid variable for each player
         for widgets in player_entries:
             widgets[1].set(state)
+            row_updaters[widgets[0]](propagate=False)
 
         # Update visuals after all are set
         update_visuals()
         _update_manual_draw_state()
 
+    # ========================================================================
+    # NAME SUGGESTIONS
+    # ========================================================================
+
+    _SUGGEST_NAV_KEYS = ('Up', 'Down', 'Return', 'Tab', 'Escape')
+    suggest_box = tk.Listbox(dialog, font=THEME['font_main'], bg=THEME['bg_main'],
+                             fg=THEME['fg_primary'], selectbackground=THEME['accent_gold'],
+                             selectforeground='black', activestyle='none',
+                             relief='flat', highlightthickness=1, exportselection=False)
+    suggest_target = None
+
+    def _hide_suggestions(event=None):
+        nonlocal suggest_target
+        suggest_box.place_forget()
+        suggest_target = None
+
+    def _show_suggestions(name_entry):
+        """Drop-down of historical names under the entry being typed in."""
+        nonlocal suggest_target
+        text = name_entry.get().strip()
+        if len(text) < 2 or text.lower().startswith('player '):
+            _hide_suggestions()
+            return
+        # Names already entered (this row's own text included) are not offered
+        matches = suggest_names(get_player_name_index(), text, exclude=taken_keys)
+        if not matches:
+            _hide_suggestions()
+            return
+        suggest_box.delete(0, 'end')
+        for m in matches:
+            suggest_box.insert('end', m)
+        suggest_box.config(height=len(matches))
+        suggest_box.place(x=name_entry.winfo_rootx() - dialog.winfo_rootx(),
+                          y=name_entry.winfo_rooty() - dialog.winfo_rooty() + name_entry.winfo_height(),
+                          width=name_entry.winfo_width())
+        suggest_box.lift()
+        suggest_target = name_entry
+
+    def _move_suggestion(name_entry, step):
+        if suggest_target is not name_entry:
+            return
+        sel = suggest_box.curselection()
+        idx = (sel[0] + step) if sel else (0 if step > 0 else suggest_box.size() - 1)
+        idx = max(0, min(suggest_box.size() - 1, idx))
+        suggest_box.selection_clear(0, 'end')
+        suggest_box.selection_set(idx)
+        suggest_box.see(idx)
+        return 'break'
+
+    def _accept_suggestion(name_entry=None, event=None):
+        """Fills the entry with the highlighted suggestion; no-op (normal key handling) if none."""
+        target = name_entry or suggest_target
+        if target is None or suggest_target is not target or not suggest_box.curselection():
+            return
+        choice = suggest_box.get(suggest_box.curselection()[0])
+        _hide_suggestions()
+        target.delete(0, 'end')
+        target.insert(0, choice)
+        target.icursor('end')
+        target.focus_set()
+        row_updaters[target]()
+        return 'break'
+
+    suggest_box.bind('<<ListboxSelect>>', lambda e: _accept_suggestion())
+
     # ========================================================================
     # ROW CONSTRUCTION (IMPROVED)
     # ========================================================================
@@ -5584,41 +7177,27 @@ def get_player_setup_dialog(parent):
                                bg=row_bg, fg=THEME['accent_gold'], width=12)
         status_label.pack(side='right', padx=SF(5))
 
+        # Career Elo (from the replay library)
+        rating_label = tk.Label(row_frame, text="", font=THEME['font_main'],
+                                bg=row_bg, fg=THEME['fg_secondary'], width=5)
+        rating_label.pack(side='right', padx=SF(5))
+
         # Update Row Status Function
-        def update_row_status():
-            """Update row appearance based on name and payment status"""
+        def update_row_status(propagate=True):
+            """
+            Update row appearance based on name and payment status. With
+            `propagate`, also repaint rows whose duplicate state this edit
+            changed and refresh the dialog-wide banner and buttons.
+            """
             nonlocal original_bg, row_bg
 
-            name = name_entry.get().strip()
-            is_paid = paid_var.get()
-            draw_num = None
-            draw_valid = True
-            draw_duplicate = False
-            draw_out_of_range = False
-
-            # Check draw number if manual draw is enabled
-            if is_manual_draw.get() and draw_entry:
-                try:
-                    draw_num = int(draw_entry.get().strip())
-                    # Check if draw number is in valid range (1 to current_player_count)
-                    if draw_num < 1 or draw_num > current_player_count:
-                        draw_out_of_range = True
-                    else:
-                        # Check if this draw number appears in other rows
-                        draw_count = 0
-                        for other_widgets in player_entries:
-                            other_draw_entry = other_widgets[2]
-                            if other_draw_entry:
-                                try:
-                                    other_draw_num = int(other_draw_entry.get().strip())
-                                    if other_draw_num == draw_num:
-                                        draw_count += 1
-                                except (ValueError, AttributeError):
-                                    pass
-                        if draw_count > 1:
-                            draw_duplicate = True
-                except (ValueError, AttributeError):
-                    draw_valid = False
+            repaint = _apply_row_state(name_entry, _read_row((name_entry, paid_var, draw_entry, status_label)))
+            state = row_state[name_entry]
+            name = state['name']
+            is_paid = state['paid']
+            draw_valid = state['draw_state'] != 'invalid'
+            draw_out_of_range = state['draw_state'] == 'range'
+            draw_duplicate = _is_duplicate_draw(name_entry)
 
             if not name:
                 new_bg = '#3d2424'
@@ -5657,12 +7236,32 @@ def get_player_setup_dialog(parent):
             row_frame.config(bg=new_bg)
             chk.config(bg=new_bg, selectcolor=new_bg, activebackground=new_bg)
             status_label.config(bg=new_bg, text=status_text, fg=status_color)
+            rating_label.config(bg=new_bg, text=format_player_rating(name, player_ratings))
 
-            update_visuals()
-            _update_manual_draw_state()
+            _paint_name_entry(name_entry)
+
+            if propagate:
+                for other in repaint:
+                    row_updaters[other](propagate=False)
+                if not rows_building:
+                    update_visuals()
+                    _update_manual_draw_state()
 
         # Bind updates
-        name_entry.bind('<KeyRelease>', lambda e: update_row_status())
+        def on_name_key(event):
+            if event.keysym in _SUGGEST_NAV_KEYS:
+                return
+            update_row_status()
+            _show_suggestions(name_entry)
+
+        name_entry.bind('<KeyRelease>', on_name_key)
+        name_entry.bind('<Down>', lambda e: _move_suggestion(name_entry, 1))
+        name_entry.bind('<Up>', lambda e: _move_suggestion(name_entry, -1))
+        name_entry.bind('<Return>', lambda e: _accept_suggestion(name_entry))
+        name_entry.bind('<Tab>', lambda e: _accept_suggestion(name_entry))
+        name_entry.bind('<Escape>', _hide_suggestions)
+        name_entry.bind('<FocusOut>', lambda e: dialog.after(200, _hide_suggestions))
+        row_updaters[name_entry] = update_row_status
         chk.config(command=update_row_status)
 
         # Bind scrolling
@@ -5678,8 +7277,33 @@ def get_player_setup_dialog(parent):
 
         return (name_entry, paid_var, draw_entry, status_label)
 
-    def render_inputs():
-        """Render/refresh all player input rows"""
+    def render_inputs(rebuild=False):
+        """
+        Bring the player rows in line with current_player_count. Only the
+        added or removed rows are touched unless `rebuild` is set (needed when
+        the column layout changes, e.g. the draw column appearing).
+        """
+        nonlocal rows_building
+        _hide_suggestions()
+        rows_building = True
+
+        if not rebuild and player_entries:
+            for widgets in player_entries[current_player_count:]:
+                _forget_row(widgets)
+                widgets[0].master.destroy()
+            del player_entries[current_player_count:]
+            if is_manual_draw.get():
+                # The valid draw range follows the player count
+                for widgets in player_entries:
+                    row_updaters[widgets[0]](propagate=False)
+            for i in range(len(player_entries), current_player_count):
+                existing = {'name': '', 'paid': True, 'draw': ''} if all_paid_var.get() else None
+                player_entries.append(create_player_row(input_container, i, existing))
+            rows_building = False
+            update_visuals()
+            _update_manual_draw_state()
+            return
+
         saved_data = []
         for w in player_entries:
             saved_data.append({
@@ -5695,6 +7319,7 @@ def get_player_setup_dialog(parent):
                 continue
             widget.destroy()
         player_entries.clear()
+        _reset_row_tracking()
 
         for i in range(current_player_count):
             existing = saved_data[i] if i < len(saved_data) else None
@@ -5706,7 +7331,9 @@ def get_player_setup_dialog(parent):
             full_widgets = create_player_row(input_container, i, existing)
             player_entries.append(full_widgets)  # Keep all 4 values (name, paid, draw, status_label)
 
+        rows_building = False
         update_visuals()  # Call once after all rows are created
+        _update_manual_draw_state()
 
     # ========================================================================
     # CREATE STATUS BANNER (call it now)
@@ -5738,7 +7365,7 @@ def get_player_setup_dialog(parent):
         if header_frame_ref:
             header_frame_ref.destroy()
         _create_column_headers()
-        render_inputs()
+        render_inputs(rebuild=True)
 
     # Manual Draw
     manual_frame = tk.Frame(settings_col, bg=THEME['bg_card'])
@@ -5759,16 +7386,12 @@ def get_player_setup_dialog(parent):
 
     def _update_manual_draw_state():
         """Enable manual draw only when all players are paid and have non-default names."""
-        if not player_entries:
+        if not row_state:
             manual_chk.config(state='disabled')
             manual_draw_hint.config(text="(add players first)")
             return
-        default_pattern = re.compile(r'^Player\s*\d+$', re.IGNORECASE)
-        all_paid = all(w[1].get() for w in player_entries)
-        all_named = all(
-            w[0].get().strip() and not default_pattern.match(w[0].get().strip())
-            for w in player_entries
-        )
+        all_paid = tally['paid'] == len(row_state)
+        all_named = tally['named'] == len(row_state)
         if all_paid and all_named:
             manual_chk.config(state='normal')
             manual_draw_hint.config(text="")
@@ -5785,6 +7408,18 @@ def get_player_setup_dialog(parent):
                 is_manual_draw.set(False)
                 toggle_manual_draw()
 
+    # Balanced Draw (ignored when drawing manually)
+    balanced_frame = tk.Frame(settings_col, bg=THEME['bg_card'])
+    balanced_frame.pack(anchor='w', pady=2, fill='x')
+    tk.Checkbutton(balanced_frame, text="⚖️ Balanced Draw",
+                   variable=balanced_draw_var,
+                   bg=THEME['bg_card'], fg=THEME['fg_secondary'],
+                   selectcolor=THEME['bg_main'],
+                   borderwidth=0, highlightthickness=0,
+                   font=THEME['font_main']).pack(side='left')
+    tk.Label(balanced_frame, text="(even teams from past results)", font=scaled_font('Selawik', 8),
+             bg=THEME['bg_card'], fg=THEME['fg_secondary']).pack(side='left', padx=8)
+
     # Log Game
     log_frame = tk.Frame(settings_col, bg=THEME['bg_card'])
     log_frame.pack(anchor='w', pady=2, fill='x')
@@ -5814,6 +7449,16 @@ def get_player_setup_dialog(parent):
                                bg=THEME['bg_card'], fg=THEME['accent_gold'])
     all_paid_status.pack(side='left', padx=8)
 
+    # Format
+    format_frame = tk.Frame(settings_col, bg=THEME['bg_card'])
+    format_frame.pack(anchor='w', pady=(6, 2), fill='x')
+    tk.Label(format_frame, text="🏆 Format:", font=THEME['font_main'],
+             bg=THEME['bg_card'], fg=THEME['fg_secondary']).pack(side='left')
+    format_menu = tk.OptionMenu(format_frame, format_var, *TOURNAMENT_FORMATS.values())
+    format_menu.config(bg=THEME['btn_default'], fg='white', relief='flat',
+                       highlightthickness=0, font=THEME['font_main'])
+    format_menu.pack(side='left', padx=8)
+
     # Vertical divider
     tk.Frame(combined_card, bg=THEME['bg_main'], width=2).pack(side='left', fill='y', padx=(0, 20))
 
@@ -5832,29 +7477,44 @@ def get_player_setup_dialog(parent):
     btn_row = tk.Frame(team_col, bg=THEME['bg_card'])
     btn_row.pack(anchor='w', pady=2)
 
+    def _max_players():
+        """Player cap for the format currently selected."""
+        fmt = next(k for k, v in TOURNAMENT_FORMATS.items() if v == format_var.get())
+        return FORMAT_MAX_PLAYERS.get(fmt, MAX_PLAYERS)
+
     def _update_button_states():
         """Enable/disable buttons based on player count"""
+        max_players = _max_players()
         if current_player_count <= MIN_PLAYERS:
             btn_remove.config(state='disabled', fg='#666666')
         else:
             btn_remove.config(state='normal', fg='white')
 
-        if current_player_count >= MAX_PLAYERS:
+        if current_player_count >= max_players:
             btn_add.config(state='disabled', fg='#666666')
             btn_add.config(text="+ Add Team (max)")
         else:
-            remaining = MAX_PLAYERS - current_player_count
+            remaining = max_players - current_player_count
             btn_add.config(state='normal', fg='white')
             btn_add.config(text=f"+ Add Team ({remaining} slots)")
+        range_lbl.config(text=f"({MIN_PLAYERS}-{max_players} players total)")
 
     def change_count(n):
         nonlocal current_player_count
-        if MIN_PLAYERS <= current_player_count + n <= MAX_PLAYERS:
+        if MIN_PLAYERS <= current_player_count + n <= _max_players():
             current_player_count += n
             lbl_count.config(text=f"Total Players: {current_player_count}")
             _update_button_states()
             render_inputs()
 
+    def _on_format_change(*_):
+        """Switching to a format with a lower cap drops the surplus rows."""
+        surplus = current_player_count - _max_players()
+        if surplus > 0:
+            change_count(-surplus)
+        else:
+            _update_button_states()
+
     btn_add = tk.Button(btn_row, text=f"+ Add Team ({MAX_PLAYERS - current_player_count} slots)",
                         command=lambda: change_count(2),
                         bg=THEME['btn_default'], fg='white', relief='flat',
@@ -5866,9 +7526,11 @@ def get_player_setup_dialog(parent):
                            padx=12, pady=4, font=THEME['font_main'])
     btn_remove.pack(side='left')
 
-    tk.Label(team_col, text=f"({MIN_PLAYERS}-{MAX_PLAYERS} players total)",
-             font=scaled_font('Selawik', 8), bg=THEME['bg_card'],
-             fg=THEME['fg_secondary']).pack(anchor='w', pady=(4, 0))
+    range_lbl = tk.Label(team_col, text=f"({MIN_PLAYERS}-{MAX_PLAYERS} players total)",
+                         font=scaled_font('Selawik', 8), bg=THEME['bg_card'],
+                         fg=THEME['fg_secondary'])
+    range_lbl.pack(anchor='w', pady=(4, 0))
+    format_var.trace_add('write', _on_format_change)
 
     # ========================================================================
     # SCROLLABLE PLAYER LIST
@@ -5935,7 +7597,9 @@ def get_player_setup_dialog(parent):
             messagebox.showerror("Validation Error", error_msg)
             return
 
-        result = (is_manual_draw.get(), data)
+        fmt = next(k for k, v in TOURNAMENT_FORMATS.items() if v == format_var.get())
+        result = (is_manual_draw.get(), data,
+                  {'format': fmt, 'balanced': balanced_draw_var.get()})
         dialog.destroy()
 
     # Create buttons in header
@@ -5959,76 +7623,619 @@ def get_player_setup_dialog(parent):
     dialog.wait_window()
     return result
 
-def reset_global_state():
-    """Clears all tournament globals in one place before starting a new game or replay."""
-    global TEAMS, TEAM_ROSTERS, TOURNAMENT_STATE, TOURNAMENT_RANKINGS
-    global MATCH_HISTORY, MATCH_DURATIONS, REPLAY_FILEPATH
-    global last_assigned_match_id, TOURNAMENT_START_TIME, PRIZES
-
-    TEAMS.clear()
-    TEAM_ROSTERS.clear()
-    TOURNAMENT_STATE.clear()
-    TOURNAMENT_RANKINGS.clear()
-    MATCH_HISTORY.clear()
-    MATCH_DURATIONS.clear()
-    PRIZES.clear()
-    REPLAY_FILEPATH = None
-    last_assigned_match_id = None
-    TOURNAMENT_START_TIME = None
-
-
-def start_tournament():
-    """
-    Prompts for players using the unified dialog, sets up teams,
-    generates the bracket, and launches the GUI.
-    """
-    global REPLAY_FILEPATH, TEAMS, TEAM_ROSTERS, PRIZES
+# =============================================================================
+# --- Player Ratings & Balanced Draw ---
+# Elo ratings built from the replay library (replays/game_<epoch>.json) in
+# chronological order. Only completed tournaments (those with FINAL_STATS)
+# count. Ratings persist in ratings/player_ratings.json together with a
+# watermark of the replays already applied, so each run only reads new files.
+# The balanced draw pairs players so team strengths are as even as possible.
+# =============================================================================
 
-    reset_global_state()
-    log_message("Tournament initialization started")
+REPLAY_DIR = "replays"
+RATINGS_FILE = os.path.join("ratings", "player_ratings.json")
+RATINGS_VERSION = 2               # 2: grand finals are rated
+DEFAULT_PLAYER_RATING = 1500.0   # Elo for players with no history
+ELO_K = 24                       # update step once a player is established
+ELO_K_PROVISIONAL = 40           # larger step while a player has few games
+ELO_PROVISIONAL_GAMES = 10
 
-    dialog_root = tk.Tk()
-    dialog_root.withdraw()
+_PLAYER_RATINGS = None   # in-memory copy of RATINGS_FILE's 'players', loaded on demand
+_PLAYER_NAME_INDEX = None   # autocomplete index over _PLAYER_RATINGS, built on first use
 
-    # --- 1. Combined Player Setup Step ---
-    player_input_result = get_player_setup_dialog(dialog_root)
+def _player_key(name):
+    """Players are matched across nights by case-insensitive, trimmed name."""
+    return " ".join(name.split()).lower()
 
-    if player_input_result is None:
-        dialog_root.destroy()
-        log_message("Tournament setup cancelled by user", "WARN")
-        return
+def _replay_epoch(fname):
+    """game_1712345678.json -> 1712345678 (None for anything else)."""
+    m = re.match(r'game_(\d+)\.json$', fname)
+    return int(m.group(1)) if m else None
 
-    is_manual_draw, player_data_list = player_input_result
-    num_players = len(player_data_list)
+def read_replay_summary(path):
+    """
+    One pass over a replay file. Returns (last SNAPSHOT, FINAL_STATS record),
+    either of which may be None.
+    """
+    snapshot = final = None
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                obj = json.loads(line)
+            except Exception:
+                continue
+            if isinstance(obj, dict):
+                if obj.get("type") == "SNAPSHOT":
+                    snapshot = obj
+                elif obj.get("type") == "FINAL_STATS":
+                    final = obj
+    return snapshot, final
+
+def replay_match_records(snapshot, final=None):
+    """
+    The played matches of a replay as MATCH_HISTORY records, in play order.
+    MATCH_HISTORY has no GF/GGF records, so decided finals are added from
+    the snapshot's match state.
+    """
+    history = ((final or {}).get("stats") or {}).get("match_history") or snapshot.get("match_history", [])
+    records = list(history)
+    seen = {rec.get('id') for rec in records}
+    state = snapshot.get('state', {})
+    for mid in ('GF', 'GGF'):
+        md = state.get(mid)
+        if mid in seen or not md or not (md.get('winner') or md.get('champion')):
+            continue
+        winner = md.get('winner') or md.get('champion')
+        loser = next((t for t in md.get('teams', []) if t and t != winner), None)
+        records.append({'id': mid, 'winner': winner, 'loser': loser, 'color': md.get('winner_color'),
+                        'red_score': md.get('red_score'), 'blue_score': md.get('blue_score')})
+    return records
+
+def _apply_elo_result(players, winners, losers, timestamp):
+    """Team Elo: each side plays at its members' mean rating; every member moves by the team delta."""
+    for name in winners + losers:
+        key = _player_key(name)
+        if key not in players:
+            players[key] = {'name': name, 'rating': DEFAULT_PLAYER_RATING,
+                            'games': 0, 'wins': 0, 'last_played': None}
+    if not winners or not losers:
+        return
+    r_win = sum(players[_player_key(n)]['rating'] for n in winners) / len(winners)
+    r_lose = sum(players[_player_key(n)]['rating'] for n in losers) / len(losers)
+    expected = 1.0 / (1.0 + 10 ** ((r_lose - r_win) / 400.0))
+    for names, sign in ((winners, 1), (losers, -1)):
+        for name in names:
+            p = players[_player_key(name)]
+            k = ELO_K_PROVISIONAL if p['games'] < ELO_PROVISIONAL_GAMES else ELO_K
+            p['rating'] += sign * k * (1.0 - expected)
+            p['games'] += 1
+            p['wins'] += 1 if sign > 0 else 0
+            p['last_played'] = timestamp
+            p['name'] = name   # keep the most recent spelling for display
+
+def _apply_replay_ratings(players, snapshot, final):
+    """Feeds every match of one completed replay through the Elo update."""
+    rosters = snapshot.get("rosters", {})
+    for rec in replay_match_records(snapshot, final):
+        _apply_elo_result(players,
+                          rosters.get(rec.get("winner"), []),
+                          rosters.get(rec.get("loser"), []),
+                          final.get("timestamp"))
+
+def _read_rating_summary(fname):
+    """read_replay_summary() for a file in REPLAY_DIR, or None (logged) if it cannot be read."""
+    try:
+        return read_replay_summary(os.path.join(REPLAY_DIR, fname))
+    except Exception as e:
+        log_message(f"Ratings: skipping unreadable replay {fname}: {e}", "WARN")
+        return None
 
-    dialog_root.destroy()
+def update_player_ratings():
+    """
+    Brings RATINGS_FILE up to date with the replay library and returns its
+    'players' dict. New completed replays are applied incrementally; if an
+    already-applied replay changed or disappeared, or a newly completed one
+    predates the watermark, ratings are rebuilt from scratch to keep the order
+    exact. Unfinished replays are remembered by mtime and only looked at
+    again once they change.
+    """
+    global _PLAYER_RATINGS, _PLAYER_NAME_INDEX
 
-    # All players are paid now, enforced by the dialog
-    log_message(f"Player setup complete — {num_players} players, manual draw: {is_manual_draw}")
+    data = None
+    if os.path.exists(RATINGS_FILE):
+        try:
+            with open(RATINGS_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != RATINGS_VERSION:
+                data = None
+        except Exception as e:
+            log_message(f"Ratings file unreadable, rebuilding: {e}", "WARN")
+            data = None
+    if data is None:
+        data = {"version": RATINGS_VERSION, "processed": {}, "unfinished": {}, "last_epoch": 0, "players": {}}
+
+    files = {}
+    if os.path.isdir(REPLAY_DIR):
+        for fname in os.listdir(REPLAY_DIR):
+            epoch = _replay_epoch(fname)
+            if epoch is not None:
+                files[fname] = (epoch, os.path.getmtime(os.path.join(REPLAY_DIR, fname)))
+
+    processed = data["processed"]
+    known_unfinished = data.get("unfinished", {})
+    unfinished = {fname: mtime for fname, mtime in known_unfinished.items()
+                  if fname in files and files[fname][1] == mtime}
+    data["unfinished"] = unfinished
+    stale = any(fname not in files or files[fname][1] != mtime for fname, mtime in processed.items())
+    pending = sorted((epoch, fname) for fname, (epoch, _) in files.items()
+                     if fname not in processed and fname not in unfinished)
+    summaries = {}
+    if not stale:
+        for epoch, fname in pending:
+            if epoch >= data["last_epoch"]:
+                break
+            # Predates the watermark: only a rebuild if it has been completed
+            summaries[fname] = _read_rating_summary(fname)
+            if summaries[fname] and summaries[fname][1]:
+                stale = True
+                break
+            unfinished[fname] = files[fname][1]
+        pending = [(epoch, fname) for epoch, fname in pending if fname not in unfinished]
+    if stale:
+        log_message("Replay library changed under existing ratings — rebuilding from scratch")
+        data = {"version": RATINGS_VERSION, "processed": {}, "unfinished": {}, "last_epoch": 0, "players": {}}
+        processed, unfinished = data["processed"], data["unfinished"]
+        pending = sorted((epoch, fname) for fname, (epoch, _) in files.items())
+
+    applied = 0
+    for epoch, fname in pending:
+        summary = summaries[fname] if fname in summaries else _read_rating_summary(fname)
+        if summary is None:
+            continue
+        snapshot, final = summary
+        if not snapshot or not final:
+            # Unfinished (or abandoned) tournament: skipped until its file
+            # changes; if it is completed later and predates the watermark,
+            # that triggers a rebuild
+            unfinished[fname] = files[fname][1]
+            continue
+        _apply_replay_ratings(data["players"], snapshot, final)
+        processed[fname] = files[fname][1]
+        data["last_epoch"] = max(data["last_epoch"], epoch)
+        applied += 1
+
+    if applied or stale or data["unfinished"] != known_unfinished:
+        try:
+            os.makedirs(os.path.dirname(RATINGS_FILE), exist_ok=True)
+            tmp = RATINGS_FILE + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=1)
+            os.replace(tmp, RATINGS_FILE)
+            log_message(f"Ratings updated from {applied} new replay(s) — {len(data['players'])} players")
+        except Exception as e:
+            log_message(f"Could not save ratings: {e}", "ERROR")
+
+    _PLAYER_RATINGS = data["players"]
+    _PLAYER_NAME_INDEX = None
+    return _PLAYER_RATINGS
+
+def get_player_ratings(refresh=False):
+    """{player_key: Elo}. Loads (and brings up to date) the ratings file on first use or on refresh."""
+    if _PLAYER_RATINGS is None or refresh:
+        update_player_ratings()
+    return {k: p['rating'] for k, p in _PLAYER_RATINGS.items()}
+
+def format_player_rating(name, ratings):
+    """Display string for a player's rating ('—' when unrated)."""
+    r = ratings.get(_player_key(name)) if name else None
+    return f"{r:.0f}" if r is not None else "—"
+
+# --- Player Name Index ---
+# As-you-type suggestions for the setup dialog. Prefix matches come from a
+# sorted key list (bisect), on the full name and on later words so "smi"
+# finds "Jo Smith". Typos ("jhon" -> "John") are caught by a bigram index
+# that narrows the candidates, then an edit-distance check against the
+# same-length prefix. Names seen in more games rank first.
+
+NAME_SUGGEST_LIMIT = 6
+
+def _name_bigrams(key):
+    padded = f" {key}"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+def edit_distance(a, b):
+    """Optimal string alignment distance (Levenshtein plus adjacent transpositions)."""
+    prev2, prev = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        prev2, prev = prev, cur
+    return prev[-1]
+
+def name_typo_limit(query):
+    """Edits tolerated when fuzzy-matching a query of this length."""
+    return 0 if len(query) < 3 else 1 if len(query) <= 5 else 2
+
+def build_name_index(entries):
+    """entries: iterable of (display_name, weight). Returns the index dict used by suggest_names."""
+    names = {}
+    for name, weight in entries:
+        key = _player_key(name)
+        if key and (key not in names or weight > names[key][1]):
+            names[key] = (name, weight)
+    keys = sorted(names)
+    words = sorted((word, key) for key in keys for word in key.split()[1:])
+    grams = {}
+    for key in keys:
+        for g in _name_bigrams(key):
+            grams.setdefault(g, []).append(key)
+    return {'names': names, 'keys': keys, 'words': words, 'grams': grams}
+
+def get_player_name_index():
+    """Index over every player in the ratings file (i.e. every completed replay)."""
+    global _PLAYER_NAME_INDEX
+    if _PLAYER_NAME_INDEX is None:
+        if _PLAYER_RATINGS is None:
+            update_player_ratings()
+        _PLAYER_NAME_INDEX = build_name_index((p['name'], p['games'])
+                                              for p in _PLAYER_RATINGS.values())
+    return _PLAYER_NAME_INDEX
+
+def suggest_names(index, text, limit=NAME_SUGGEST_LIMIT, exclude=(), substring=False):
+    """
+    Best `limit` display names for partially typed `text`, skipping keys in
+    `exclude`. With `substring`, names containing the text anywhere ("mit"
+    -> "Smith") are included below the prefix and typo matches.
+    """
+    q = _player_key(text)
+    if not q:
+        return []
+    names, keys, words = index['names'], index['keys'], index['words']
+    tier = {}
+
+    i = bisect.bisect_left(keys, q)
+    while i < len(keys) and keys[i].startswith(q):
+        tier[keys[i]] = 3
+        i += 1
+    i = bisect.bisect_left(words, (q, ''))
+    while i < len(words) and words[i][0].startswith(q):
+        tier.setdefault(words[i][1], 2)
+        i += 1
+
+    max_edits = name_typo_limit(q)
+    if len(tier) < limit and max_edits:
+        candidates = set()
+        for g in _name_bigrams(q):
+            candidates.update(index['grams'].get(g, ()))
+        for key in candidates - set(tier):
+            d = edit_distance(q, key[:len(q)])
+            if d <= max_edits:
+                tier[key] = 1 + (max_edits - d + 1) / (2 * (max_edits + 1))   # below any prefix hit
+
+    if substring:
+        for key in keys:
+            if key not in tier and q in key:
+                tier[key] = 0.5
+
+    ranked = sorted((k for k in tier if k not in exclude),
+                    key=lambda k: (-tier[k], -names[k][1], k))
+    return [names[k][0] for k in ranked[:limit]]
+
+def build_roster_search_index(rosters):
+    """Name index over the players in `rosters` ({team: [p1, p2]}), with each player's teams."""
+    teams_by_key = {}
+    for team, roster in rosters.items():
+        for name in roster:
+            teams_by_key.setdefault(_player_key(name), []).append(team)
+    return {'names': build_name_index((name, 0) for roster in rosters.values() for name in roster),
+            'teams': teams_by_key}
+
+def search_roster(index, text):
+    """[(team, player)] whose player matches `text` (prefix, typo or substring), best first, one per team."""
+    hits, seen = [], set()
+    for name in suggest_names(index['names'], text, limit=len(index['teams']), substring=True):
+        for team in index['teams'][_player_key(name)]:
+            if team not in seen:
+                seen.add(team)
+                hits.append((team, name))
+    return hits
+
+def balanced_pairs(players, ratings, rng=random):
+    """
+    Splits `players` (even count) into pairs whose summed ratings are as
+    equal as possible. Greedy strongest-with-weakest start, then pairwise
+    member swaps until no swap lowers the spread (sum of squared team
+    totals — the mean is fixed, so this is the variance). Equal ratings are
+    broken randomly so unrated fields still get a random draw.
+    """
+    pool = list(players)
+    rng.shuffle(pool)
+    pool.sort(key=lambda p: ratings.get(_player_key(p), DEFAULT_PLAYER_RATING), reverse=True)
+    r = [ratings.get(_player_key(p), DEFAULT_PLAYER_RATING) for p in pool]
+
+    half = len(pool) // 2
+    teams = [[i, len(pool) - 1 - i] for i in range(half)]
+    totals = [r[a] + r[b] for a, b in teams]
+
+    improved = True
+    while improved:
+        improved = False
+        for x in range(half):
+            for y in range(x + 1, half):
+                for i in (0, 1):
+                    for j in (0, 1):
+                        a, b = teams[x][i], teams[y][j]
+                        d = r[b] - r[a]
+                        new_x, new_y = totals[x] + d, totals[y] - d
+                        if new_x * new_x + new_y * new_y < totals[x] ** 2 + totals[y] ** 2 - 1e-12:
+                            teams[x][i], teams[y][j] = b, a
+                            totals[x], totals[y] = new_x, new_y
+                            improved = True
+
+    rng.shuffle(teams)
+    return [(pool[a], pool[b]) for a, b in teams]
+
+# =============================================================================
+# --- Career Stats Database ---
+# Lifetime per-player results in an indexed SQLite file, so questions like
+# "top 10 win rates this season" or "all results for Ethel" don't re-parse
+# every replay. One row per player per completed tournament; a replay is
+# re-read only when its mtime changes, and dropped when the file goes away.
+# =============================================================================
+
+CAREER_DB_FILE = os.path.join("ratings", "career_stats.db")
+CAREER_DB_VERSION = 2   # 2: grand finals count toward W-L and points
+CAREER_MIN_GAMES = 5   # leaderboard floor for rate-based stats
+
+CAREER_LEADERBOARD_STATS = OrderedDict([
+    ('win_rate',     'CAST(SUM(wins) AS REAL) / SUM(wins + losses)'),
+    ('titles',       'SUM(title)'),
+    ('wins',         'SUM(wins)'),
+    ('tournaments',  'COUNT(*)'),
+    ('point_diff',   'SUM(points_for) - SUM(points_against)'),
+])
+
+_CAREER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS replays (
+    file        TEXT PRIMARY KEY,
+    mtime       REAL NOT NULL,
+    played_at   REAL,
+    season      INTEGER,
+    format      TEXT,
+    champion    TEXT,
+    completed   INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    file            TEXT NOT NULL REFERENCES replays(file) ON DELETE CASCADE,
+    player_key      TEXT NOT NULL,
+    player_name     TEXT NOT NULL,
+    team            TEXT NOT NULL,
+    partner         TEXT,
+    placement       INTEGER,
+    title           INTEGER NOT NULL,
+    wins            INTEGER NOT NULL,
+    losses          INTEGER NOT NULL,
+    points_for      INTEGER NOT NULL,
+    points_against  INTEGER NOT NULL,
+    season          INTEGER,
+    played_at       REAL
+);
+CREATE INDEX IF NOT EXISTS idx_results_player ON results(player_key, played_at);
+CREATE INDEX IF NOT EXISTS idx_results_season ON results(season, player_key);
+CREATE INDEX IF NOT EXISTS idx_results_file   ON results(file);
+"""
+
+def open_career_db(path=None):
+    """Opens (creating if needed) the career database; rebuilt if the schema version changed."""
+    import sqlite3
+    path = path or CAREER_DB_FILE
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    if conn.execute("PRAGMA user_version").fetchone()[0] != CAREER_DB_VERSION:
+        conn.executescript("DROP TABLE IF EXISTS results; DROP TABLE IF EXISTS replays;")
+        conn.execute(f"PRAGMA user_version = {CAREER_DB_VERSION}")
+    conn.executescript(_CAREER_SCHEMA)
+    return conn
+
+def _career_rows(fname, snapshot, final):
+    """results rows for one completed replay."""
+    rosters = snapshot.get("rosters", {})
+    state = snapshot.get("state", {})
+    history = replay_match_records(snapshot, final)
+    played_at = final.get("timestamp") or _replay_epoch(fname)
+    season = datetime.datetime.fromtimestamp(played_at).year if played_at else None
+    champion = final.get("champion")
+
+    placements = {}
+    for rank, team in (snapshot.get("rankings") or {}).items():
+        m = re.match(r'(\d+)', rank)
+        if m and team:
+            placements[team] = int(m.group(1))
+
+    tally = {team: [0, 0, 0, 0] for team in rosters}   # wins, losses, pts for, pts against
+    for rec in history:
+        w, l = rec.get("winner"), rec.get("loser")
+        if w not in tally or l not in tally:
+            continue
+        scores = rec if 'red_score' in rec else state.get(rec.get("id"), {})
+        red, blue = scores.get('red_score'), scores.get('blue_score')
+        hi, lo = (max(red, blue), min(red, blue)) if red is not None and blue is not None else (0, 0)
+        tally[w][0] += 1
+        tally[w][2] += hi
+        tally[w][3] += lo
+        tally[l][1] += 1
+        tally[l][2] += lo
+        tally[l][3] += hi
+
+    rows = []
+    for team, roster in rosters.items():
+        wins, losses, pf, pa = tally[team]
+        for name in roster:
+            partner = next((p for p in roster if p != name), None)
+            rows.append((fname, _player_key(name), name, team, partner,
+                         placements.get(team), int(team == champion),
+                         wins, losses, pf, pa, season, played_at))
+    return rows, played_at, season, snapshot.get("format", "D"), champion
+
+def update_career_db(conn=None, replay_dir=None):
+    """
+    Syncs the database with the replay library: new or modified replays are
+    (re)loaded, deleted ones removed. Returns the number of replays read.
+    """
+    own = conn is None
+    conn = conn or open_career_db()
+    replay_dir = replay_dir or REPLAY_DIR
+    try:
+        on_disk = {}
+        if os.path.isdir(replay_dir):
+            for fname in os.listdir(replay_dir):
+                if _replay_epoch(fname) is not None:
+                    on_disk[fname] = os.path.getmtime(os.path.join(replay_dir, fname))
+        known = {r['file']: r['mtime'] for r in conn.execute("SELECT file, mtime FROM replays")}
+
+        gone = [f for f in known if f not in on_disk]
+        changed = sorted(f for f, mtime in on_disk.items() if known.get(f) != mtime)
+
+        with conn:
+            conn.executemany("DELETE FROM replays WHERE file = ?", [(f,) for f in gone + changed])
+            for fname in changed:
+                try:
+                    snapshot, final = read_replay_summary(os.path.join(replay_dir, fname))
+                except Exception as e:
+                    log_message(f"Career stats: skipping unreadable replay {fname}: {e}", "WARN")
+                    continue
+                if not snapshot or not final:
+                    # Recorded so it isn't re-read until it changes (e.g. gets finished)
+                    conn.execute("INSERT INTO replays VALUES (?, ?, NULL, NULL, NULL, NULL, 0)",
+                                 (fname, on_disk[fname]))
+                    continue
+                rows, played_at, season, fmt, champion = _career_rows(fname, snapshot, final)
+                conn.execute("INSERT INTO replays VALUES (?, ?, ?, ?, ?, ?, 1)",
+                             (fname, on_disk[fname], played_at, season, fmt, champion))
+                conn.executemany("INSERT INTO results VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)", rows)
+
+        if changed or gone:
+            log_message(f"Career stats: {len(changed)} replay(s) loaded, {len(gone)} removed")
+        return len(changed)
+    finally:
+        if own:
+            conn.close()
+
+def career_player_summary(conn, name, season=None):
+    """Lifetime (or one season's) totals for a player, or None if they never played."""
+    where, args = "player_key = ?", [_player_key(name)]
+    if season is not None:
+        where += " AND season = ?"
+        args.append(season)
+    row = conn.execute(f"""
+        SELECT MAX(player_name) AS name, COUNT(*) AS tournaments, SUM(title) AS titles,
+               SUM(wins) AS wins, SUM(losses) AS losses,
+               SUM(points_for) AS points_for, SUM(points_against) AS points_against,
+               MIN(placement) AS best_placement
+        FROM results WHERE {where}""", args).fetchone()
+    if not row['tournaments']:
+        return None
+    summary = dict(row)
+    games = summary['wins'] + summary['losses']
+    summary['win_rate'] = summary['wins'] / games if games else None
+    summary['placements'] = {r['placement']: r['n'] for r in conn.execute(f"""
+        SELECT placement, COUNT(*) AS n FROM results
+        WHERE {where} AND placement IS NOT NULL GROUP BY placement ORDER BY placement""", args)}
+    summary['partners'] = [dict(r) for r in conn.execute(f"""
+        SELECT partner, COUNT(*) AS tournaments, SUM(wins) AS wins, SUM(losses) AS losses
+        FROM results WHERE {where} AND partner IS NOT NULL
+        GROUP BY partner ORDER BY tournaments DESC, wins DESC""", args)]
+    return summary
+
+def career_player_results(conn, name):
+    """Every tournament a player entered, newest first."""
+    return [dict(r) for r in conn.execute("""
+        SELECT file, played_at, season, team, partner, placement, title,
+               wins, losses, points_for, points_against
+        FROM results WHERE player_key = ? ORDER BY played_at DESC""", (_player_key(name),))]
+
+def career_leaderboard(conn, stat='win_rate', season=None, limit=10, min_games=CAREER_MIN_GAMES):
+    """Top players by one of CAREER_LEADERBOARD_STATS, optionally for a single season."""
+    expr = CAREER_LEADERBOARD_STATS[stat]
+    where, args = "", []
+    if season is not None:
+        where, args = "WHERE season = ?", [season]
+    return [dict(r) for r in conn.execute(f"""
+        SELECT MAX(player_name) AS name, {expr} AS value,
+               COUNT(*) AS tournaments, SUM(wins) AS wins, SUM(losses) AS losses
+        FROM results {where}
+        GROUP BY player_key
+        HAVING SUM(wins + losses) >= ?
+        ORDER BY value DESC, wins DESC
+        LIMIT ?""", args + [min_games, limit])]
+
+def reset_global_state():
+    """Clears all tournament globals in one place before starting a new game or replay."""
+    global TEAMS, TEAM_ROSTERS, TOURNAMENT_STATE, TOURNAMENT_RANKINGS
+    global MATCH_HISTORY, MATCH_DURATIONS, REPLAY_FILEPATH
+    global last_assigned_match_id, TOURNAMENT_START_TIME, PRIZES, TOURNAMENT_FORMAT
 
-    # --- 2. Process Draw and Team Setup ---
     TEAMS.clear()
     TEAM_ROSTERS.clear()
+    TOURNAMENT_STATE.clear()
+    invalidate_compiled_bracket()
+    TOURNAMENT_RANKINGS.clear()
+    MATCH_HISTORY.clear()
+    MATCH_DURATIONS.clear()
+    PRIZES.clear()
+    REPLAY_FILEPATH = None
+    last_assigned_match_id = None
+    TOURNAMENT_START_TIME = None
+    TOURNAMENT_FORMAT = 'D'
 
-    if is_manual_draw:
-        # Sort by draw number (item 0)
-        player_draws = sorted([(d, n) for d, n, p in player_data_list], key=lambda x: x[0])
-    else:
-        # Extract names only
-        player_names = [n for d, n, p in player_data_list]
-        draw_numbers = list(range(1, num_players + 1))
-        random.shuffle(draw_numbers)
 
+def draw_players(player_names, balanced=False):
+    """
+    Random (or rating-balanced) draw: returns [(draw number, name)] sorted by
+    draw number, so consecutive pairs form the teams.
+    """
+    num_players = len(player_names)
+    if balanced:
+        # Consecutive draw numbers per team keep the pairing in assign_teams()
+        # and the draw summary working unchanged
+        ratings = get_player_ratings()
+        pairs = balanced_pairs(list(player_names), ratings)
         player_draws = []
-        for player_name in player_names:
-            draw_num = draw_numbers.pop()
-            player_draws.append((draw_num, player_name))
-
-        player_draws.sort(key=lambda x: x[0])
-        log_message(f"Auto-draw complete — {num_players} players assigned", "DEBUG")
-
-    num_teams = num_players // 2
-    for i in range(num_teams):
+        for i, (p1, p2) in enumerate(pairs):
+            player_draws.append((i * 2 + 1, p1))
+            player_draws.append((i * 2 + 2, p2))
+        totals = [ratings.get(_player_key(a), DEFAULT_PLAYER_RATING) +
+                  ratings.get(_player_key(b), DEFAULT_PLAYER_RATING) for a, b in pairs]
+        log_message(f"Balanced draw complete — {num_players} players, team strength "
+                    f"{min(totals):.2f}–{max(totals):.2f}")
+        return player_draws
+
+    draw_numbers = list(range(1, num_players + 1))
+    random.shuffle(draw_numbers)
+
+    player_draws = []
+    for player_name in player_names:
+        draw_num = draw_numbers.pop()
+        player_draws.append((draw_num, player_name))
+
+    player_draws.sort(key=lambda x: x[0])
+    log_message(f"Auto-draw complete — {num_players} players assigned", "DEBUG")
+    return player_draws
+
+def assign_teams(player_draws):
+    """Fills TEAMS / TEAM_ROSTERS from a sorted draw, two consecutive draws per team."""
+    TEAMS.clear()
+    TEAM_ROSTERS.clear()
+    for i in range(len(player_draws) // 2):
         team_name = f'Team {i+1}'
         player1 = player_draws[i*2][1]
         player2 = player_draws[i*2 + 1][1]
@@ -6037,9 +8244,50 @@ def start_tournament():
         TEAM_ROSTERS[team_name] = [player1, player2]
         log_message(f"  -> {team_name}: {player1} & {player2} (draws #{player_draws[i*2][0]}, #{player_draws[i*2+1][0]})", "DEBUG")
 
+def start_tournament():
+    """
+    Prompts for players using the unified dialog, sets up teams,
+    generates the bracket, and launches the GUI.
+    """
+    global REPLAY_FILEPATH, TEAMS, TEAM_ROSTERS, PRIZES, TOURNAMENT_FORMAT
+
+    reset_global_state()
+    log_message("Tournament initialization started")
+
+    dialog_root = tk.Tk()
+    dialog_root.withdraw()
+
+    # --- 1. Combined Player Setup Step ---
+    player_input_result = get_player_setup_dialog(dialog_root)
+
+    if player_input_result is None:
+        dialog_root.destroy()
+        log_message("Tournament setup cancelled by user", "WARN")
+        return
+
+    is_manual_draw, player_data_list, options = player_input_result
+    num_players = len(player_data_list)
+    TOURNAMENT_FORMAT = options.get('format', 'D')
+
+    dialog_root.destroy()
+
+    # All players are paid now, enforced by the dialog
+    log_message(f"Player setup complete — {num_players} players, manual draw: {is_manual_draw}, "
+                f"format: {TOURNAMENT_FORMATS[TOURNAMENT_FORMAT]}")
+
+    # --- 2. Process Draw and Team Setup ---
+    if is_manual_draw:
+        # Sort by draw number (item 0)
+        player_draws = sorted([(d, n) for d, n, p in player_data_list], key=lambda x: x[0])
+    else:
+        player_draws = draw_players([n for d, n, p in player_data_list], options.get('balanced'))
+
+    num_teams = num_players // 2
+    assign_teams(player_draws)
+
     # --- 3. Load Bracket Config and Prizes ---
     try:
-        config, prizes_from_file = load_bracket_config(num_teams, 'D')
+        config, prizes_from_file = load_bracket_config(num_teams, TOURNAMENT_FORMAT)
     except Exception as e:
         messagebox.showerror("Configuration Error", str(e))
         return
@@ -6116,9 +8364,2546 @@ def confirm_match_resolution(winner, loser, winning_color, match_id):
             append_final_stats_to_file(REPLAY_FILEPATH, champion)
 
     reset_game()
+    live_publish()
+
+# =============================================================================
+# --- Bracket Config Validation ---
+# `python sb.py validate [configs...]` statically checks every bracket config
+# and then plays thousands of random outcome sequences through the real
+# engine (apply_match_result) in worker processes.
+# =============================================================================
+
+VALIDATE_DEFAULT_RUNS = 2000
+# Generated formats cover every field size, and Swiss pairing with rematch
+# avoidance costs up to ~0.3 s per tournament at 17-30 teams, so unless
+# --runs is given they get VALIDATE_DEFAULT_RUNS / teams² random runs each
+VALIDATE_GENERATED_MIN_RUNS = 3
+
+def validate_generated_runs(num_teams):
+    """Default random runs for one generated field size."""
+    return max(VALIDATE_GENERATED_MIN_RUNS, VALIDATE_DEFAULT_RUNS // (num_teams * num_teams))
+
+_CONFIG_FILENAME_RE = re.compile(r'(\d+)team([A-Z])\.json$')
+
+def _read_bracket_config_file(filepath):
+    """Parses one config file and applies the same finals patch as load_bracket_config()."""
+    with open(filepath, 'r') as f:
+        content = json.load(f)
+    state, prizes = _parse_json_config_content(content)
+    _inject_finals(state)
+    return state, prizes
+
+def check_bracket_config(config, num_teams):
+    """
+    Static checks on a parsed (finals-injected) config.
+    Returns a list of human-readable problems; empty means the config is sound.
+    """
+    problems = []
+    compiled = compile_bracket(config)
+    ids = compiled['ids']
+    n = len(ids)
+
+    for mid, key, target in compiled['dangling']:
+        problems.append(f"{mid} {key} routes to unknown match '{target}'")
+
+    if compiled['format'] in LEAGUE_FORMATS:
+        return problems + _check_league_config(config, compiled, num_teams)
+
+    # Every slot needs exactly one source: a starting seed or a routed result.
+    # GGF is seated by the bracket-reset rule rather than by routing.
+    seeds = {}
+    sources = {}
+    for i, mid in enumerate(ids):
+        for slot, ref in enumerate(config[mid].get('teams', [None, None])[:2]):
+            m = re.match(r'T(\d+)$', str(ref or ''))
+            if m:
+                seeds.setdefault(int(m.group(1)), []).append(f"{mid}[{slot}]")
+                sources.setdefault((i, slot), []).append(f"seed T{m.group(1)}")
+        for src_i, kind, slot in compiled['feeders'][i]:
+            sources.setdefault((i, slot), []).append(f"{kind}-{ids[src_i]}")
+
+    for t in range(1, num_teams + 1):
+        where = seeds.get(t, [])
+        if len(where) != 1:
+            problems.append(f"Team T{t} is seeded {len(where)} times {where}")
+    for t in sorted(seeds):
+        if t > num_teams:
+            problems.append(f"Seed T{t} exceeds the {num_teams}-team field ({seeds[t]})")
+
+    for i, mid in enumerate(ids):
+        if mid == 'GGF':
+            continue
+        for slot in (0, 1):
+            fed = sources.get((i, slot), [])
+            if not fed:
+                problems.append(f"{mid} [slot {slot}] is never filled — bracket would stall")
+            elif len(fed) > 1:
+                problems.append(f"{mid} [slot {slot}] slot collision: {', '.join(fed)}")
+
+    # Reachability from the seeded matches
+    seeded = {i for (i, _slot), fed in sources.items() if any(f.startswith('seed') for f in fed)}
+    reached = 0
+    for i in seeded:
+        reached |= compiled['reach'][i]
+    for i, mid in enumerate(ids):
+        if not reached >> i & 1:
+            problems.append(f"{mid} is unreachable from any seeded match")
+
+    # Termination: routing must be acyclic
+    colour = [0] * n   # 0 = unvisited, 1 = on stack, 2 = done
+    for start in range(n):
+        if colour[start]:
+            continue
+        stack = [(start, iter(d for d in (compiled['w_dest'][start], compiled['l_dest'][start]) if d >= 0))]
+        colour[start] = 1
+        while stack:
+            i, nexts = stack[-1]
+            for d in nexts:
+                if colour[d] == 1:
+                    problems.append(f"Routing cycle through {ids[i]} -> {ids[d]}")
+                elif colour[d] == 0:
+                    colour[d] = 1
+                    stack.append((d, iter(x for x in (compiled['w_dest'][d], compiled['l_dest'][d]) if x >= 0)))
+                    break
+            else:
+                colour[i] = 2
+                stack.pop()
+
+    # Every place below the top must be awarded by exactly one result. Double
+    # elimination settles 1st/2nd in GF/GGF, so its table starts at 3rd.
+    first_placed = 3 if 'GF' in compiled['index'] else 2
+    placed = {}
+    for i in range(n):
+        for code in (compiled['w_rank'][i], compiled['l_rank'][i]):
+            if code:
+                placed.setdefault(code, []).append(ids[i])
+    for place in range(first_placed, num_teams + 1):
+        if place not in placed:
+            problems.append(f"No match eliminates into place {place}")
+        elif len(placed[place]) > 1:
+            problems.append(f"Place {place} awarded by several matches: {', '.join(placed[place])}")
+    for place in sorted(placed):
+        if place < first_placed or place > num_teams:
+            problems.append(f"Place {place} is outside {first_placed}..{num_teams} "
+                            f"({', '.join(placed[place])})")
+    if DEST_CHAMPION not in compiled['w_dest']:
+        problems.append("No match crowns a champion")
+
+    return problems
+
+def _check_league_config(config, compiled, num_teams):
+    """Static checks for round-robin / Swiss schedules."""
+    problems = []
+    if compiled['format'] == 'R':
+        seen = {}
+        for mid in compiled['ids']:
+            pair = frozenset(config[mid]['teams'])
+            seen.setdefault(pair, []).append(mid)
+        expected = num_teams * (num_teams - 1) // 2
+        if len(compiled['ids']) != expected:
+            problems.append(f"{len(compiled['ids'])} matches, expected {expected}")
+        for pair, mids in seen.items():
+            if len(pair) != 2 or len(mids) > 1:
+                problems.append(f"Pairing {sorted(str(t) for t in pair)} scheduled as {', '.join(mids)}")
+    else:
+        per_round = {}
+        for i, mid in enumerate(compiled['ids']):
+            per_round.setdefault(compiled['round'][i], []).append(mid)
+        for rnd, mids in sorted(per_round.items()):
+            if len(mids) != (num_teams + 1) // 2:
+                problems.append(f"Round {rnd} has {len(mids)} matches, expected {(num_teams + 1) // 2}")
+    return problems
+
+def fuzz_bracket_config(config, num_teams, runs, seed=0):
+    """
+    Plays `runs` random outcome sequences through apply_match_result().
+    Returns a list of problems (one example per distinct failure kind), each
+    with the 0/1 outcome sequence that reproduces it.
+    """
+    rng = random.Random(seed)
+    teams = [f"T{i + 1}" for i in range(num_teams)]
+    base = build_bracket_state(teams, config)
+    compiled = compile_bracket(base)
+    max_steps = len(compiled['ids']) + 1
+    found = {}
+
+    for _ in range(runs):
+        state = {mid: dict(md, teams=list(md['teams'])) for mid, md in base.items()}
+        rankings = {}
+        issues = []
+        picks = []
+        active = next_playable_match(state, compiled)
+        steps = 0
+        while active != 'TOURNAMENT_OVER' and steps < max_steps:
+            a, b = state[active]['teams']
+            pick = rng.randrange(2)
+            picks.append(str(pick))
+            winner, loser = (a, b) if pick == 0 else (b, a)
+            apply_match_result(state, rankings, compiled, winner, loser,
+                               'red' if pick == 0 else 'blue', active, issues)
+            active = state['active_match_id']
+            steps += 1
+
+        kinds = []
+        if active != 'TOURNAMENT_OVER':
+            kinds.append(("no-termination", f"still running after {steps} matches"))
+        if issues:
+            kinds.append(("collision", issues[0]))
+        stranded = [mid for mid in compiled['ids'] if mid in state and state[mid]['winner'] is None
+                    and any(state[mid]['teams']) and mid != 'GGF']
+        if active == 'TOURNAMENT_OVER' and stranded:
+            kinds.append(("stuck", f"ended with unplayed matches {stranded}"))
+        ranked = list(rankings.values())
+        if sorted(ranked) != sorted(teams):
+            missing = sorted(set(teams) - set(ranked))
+            doubled = sorted({t for t in ranked if ranked.count(t) > 1})
+            kinds.append(("rankings", f"{len(rankings)} places for {num_teams} teams"
+                                      f" (unranked {missing}, ranked twice {doubled})"))
+        for kind, detail in kinds:
+            found.setdefault(kind, f"{detail} — outcomes {''.join(picks)}")
+
+    return [f"fuzz {kind}: {detail}" for kind, detail in found.items()]
+
+def _validate_config_worker(job):
+    """Process-pool entry point: validates one config file. Returns a plain result dict."""
+    source, runs, seed = job
+    global LOG_CONSOLE
+    LOG_CONSOLE = False
+    started = time.perf_counter()
+
+    if isinstance(source, tuple):
+        # Generated format: (format key, team count)
+        fmt, num_teams = source
+        result = {'path': f"<generated {TOURNAMENT_FORMATS[fmt]}, {num_teams} teams>",
+                  'teams': num_teams, 'matches': 0, 'runs': runs, 'problems': []}
+        m = None
+    else:
+        result = {'path': source, 'teams': None, 'matches': 0, 'runs': runs, 'problems': []}
+        m = _CONFIG_FILENAME_RE.search(os.path.basename(source))
+        if not m:
+            result['problems'].append("Filename does not follow <N>team<TYPE>.json")
+
+    if isinstance(source, tuple) or m:
+        if m:
+            num_teams = int(m.group(1))
+            result['teams'] = num_teams
+        try:
+            if isinstance(source, tuple):
+                config = BRACKET_GENERATORS[source[0]](num_teams)
+            elif m.group(2) == 'D':
+                config, _ = _read_bracket_config_file(source)
+            else:
+                with open(source, 'r') as f:
+                    config, _ = _parse_json_config_content(json.load(f))
+        except Exception as e:
+            result['problems'].append(f"Unreadable: {e}")
+        else:
+            result['matches'] = len(config)
+            result['problems'] = check_bracket_config(config, num_teams)
+            # Fuzzing a structurally broken config mostly repeats the static findings
+            if not result['problems'] and runs > 0:
+                result['problems'] = fuzz_bracket_config(config, num_teams, runs, seed)
+
+    result['seconds'] = time.perf_counter() - started
+    return result
+
+def run_validate_cli(argv):
+    """`sb.py validate` — returns a process exit code."""
+    import argparse
+    import glob
+    from concurrent.futures import ProcessPoolExecutor
+
+    parser = argparse.ArgumentParser(prog='sb.py validate',
+                                     description='Check bracket configs statically and by random play.')
+    parser.add_argument('configs', nargs='*', help='config files (default: data/*.json)')
+    parser.add_argument('--runs', type=int, default=None,
+                        help=f'random tournaments per config (default {VALIDATE_DEFAULT_RUNS} per file; '
+                             f'{VALIDATE_DEFAULT_RUNS}/teams², at least {VALIDATE_GENERATED_MIN_RUNS}, '
+                             f'per generated field size)')
+    parser.add_argument('--seed', type=int, default=0, help='base RNG seed')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--formats', default='',
+                        help='also check generated formats for every supported field size, '
+                             'e.g. S,R,W')
+    args = parser.parse_args(argv)
+
+    global LOG_CONSOLE
+    LOG_CONSOLE = False
+
+    paths = args.configs or sorted(glob.glob(os.path.join('data', '*.json')),
+                                   key=lambda p: [int(t) if t.isdigit() else t
+                                                  for t in re.split(r'(\d+)', p)])
+    file_runs = VALIDATE_DEFAULT_RUNS if args.runs is None else args.runs
+    sources = [(path, file_runs) for path in paths]
+    for fmt in filter(None, (f.strip().upper() for f in args.formats.split(','))):
+        if fmt not in BRACKET_GENERATORS:
+            parser.error(f"unknown generated format '{fmt}' (choose from {', '.join(BRACKET_GENERATORS)})")
+        sources.extend(((fmt, n), validate_generated_runs(n) if args.runs is None else args.runs)
+                       for n in range(MIN_PLAYERS // 2, FORMAT_MAX_PLAYERS[fmt] // 2 + 1))
+    if not sources:
+        print("No bracket configs found.")
+        return 1
+
+    started = time.perf_counter()
+    jobs = [(src, runs, args.seed + i) for i, (src, runs) in enumerate(sources)]
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        results = list(pool.map(_validate_config_worker, jobs))
+
+    failed = 0
+    for r in results:
+        status = 'OK  ' if not r['problems'] else 'FAIL'
+        failed += bool(r['problems'])
+        print(f"{status} {r['path']}  ({r['teams']} teams, {r['matches']} matches, "
+              f"{r['runs']} runs, {r['seconds']:.2f}s)")
+        for p in r['problems']:
+            print(f"       - {p}")
+
+    print(f"{len(results) - failed}/{len(results)} configs passed in "
+          f"{time.perf_counter() - started:.2f}s")
+    return 1 if failed else 0
+
+def run_stats_cli(argv):
+    """`sb.py stats` — career stats from the replay library."""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='sb.py stats',
+                                     description='Player career stats from all replays.')
+    parser.add_argument('--player', help='show one player\'s totals, partners and results')
+    parser.add_argument('--top', type=int, default=10, help='leaderboard size (default 10)')
+    parser.add_argument('--by', choices=list(CAREER_LEADERBOARD_STATS), default='win_rate',
+                        help='leaderboard stat (default win_rate)')
+    parser.add_argument('--season', type=int, help='restrict to one year, e.g. 2025')
+    parser.add_argument('--min-games', type=int, default=CAREER_MIN_GAMES,
+                        help=f'leaderboard games floor (default {CAREER_MIN_GAMES})')
+    args = parser.parse_args(argv)
+
+    global LOG_CONSOLE
+    LOG_CONSOLE = False
+
+    conn = open_career_db()
+    try:
+        update_career_db(conn)
+        started = time.perf_counter()
+        if args.player:
+            summary = career_player_summary(conn, args.player, args.season)
+            if summary is None:
+                print(f"No results for '{args.player}'.")
+                return 1
+            games = summary['wins'] + summary['losses']
+            rate = f"{summary['win_rate']:.1%}" if games else "--"
+            print(f"{summary['name']}: {summary['tournaments']} tournaments, "
+                  f"{summary['titles']} titles, {summary['wins']}-{summary['losses']} ({rate}), "
+                  f"points {summary['points_for']}-{summary['points_against']}")
+            if summary['placements']:
+                print("  Placements: " + ", ".join(f"{_ordinal_label(p)} x{n}"
+                                                   for p, n in summary['placements'].items()))
+            for p in summary['partners']:
+                print(f"  with {p['partner']}: {p['tournaments']} tournaments, {p['wins']}-{p['losses']}")
+            if args.season is None:
+                for r in career_player_results(conn, args.player):
+                    day = datetime.datetime.fromtimestamp(r['played_at']).strftime('%Y-%m-%d')
+                    place = _ordinal_label(r['placement']) if r['placement'] else '--'
+                    print(f"  {day}  {place:>5}  {r['wins']}-{r['losses']}  "
+                          f"w/ {r['partner'] or '?'}  ({r['file']})")
+        else:
+            rows = career_leaderboard(conn, args.by, args.season, args.top, args.min_games)
+            for i, r in enumerate(rows, start=1):
+                value = f"{r['value']:.1%}" if args.by == 'win_rate' else r['value']
+                print(f"{i:>3}. {r['name']:<24} {value:>8}   "
+                      f"({r['tournaments']} tournaments, {r['wins']}-{r['losses']})")
+            if not rows:
+                print("No players meet the criteria.")
+        log_message(f"stats query took {(time.perf_counter() - started) * 1000:.1f} ms", "DEBUG")
+        return 0
+    finally:
+        conn.close()
+
+# =============================================================================
+# --- Headless Tournament CLI ---
+# `python sb.py cli <action>` runs a tournament with no display, e.g. over SSH
+# to the scorer's machine: `new` draws teams from a roster file and starts a
+# replay file, `result` records the active match, and `status`, `schedule`
+# and `standings` print where things stand. Each action loads the replay's
+# last snapshot and `new` / `result` append a fresh one, so the GUI can load
+# or resume the same file at any point. The replay defaults to the newest
+# file in replays/; every action except `new` takes --replay to pick another.
+# =============================================================================
+
+def record_match_result(match_id, winner, loser, colour, red_score=None, blue_score=None, duration=None):
+    """
+    Applies a finished match to the tournament globals without any UI, as
+    confirm_match_resolution() does: duration, bracket routing, history and
+    scores. Returns the apply_match_result() outcome.
+    """
+    md = TOURNAMENT_STATE[match_id]
+    if duration is not None:
+        if not md.get('start_time'):
+            md['start_time'] = time.time() - duration
+        md['duration'] = duration
+        MATCH_DURATIONS.append(duration)
+    outcome = apply_match_result(TOURNAMENT_STATE, TOURNAMENT_RANKINGS, get_compiled_bracket(),
+                                 winner, loser, colour, match_id)
+    if outcome == RESULT_GF_WON:
+        invalidate_compiled_bracket()
+    scored = red_score is not None and blue_score is not None
+    if outcome == RESULT_ADVANCED:
+        record = {'id': match_id, 'winner': winner, 'loser': loser, 'color': colour}
+        if scored:
+            record['red_score'], record['blue_score'] = red_score, blue_score
+        MATCH_HISTORY.append(record)
+    if scored:
+        md['red_score'], md['blue_score'] = red_score, blue_score
+    return outcome
+
+def read_roster_file(path):
+    """One player per line; blank lines and '#' comments are ignored."""
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = (line.split('#', 1)[0].strip() for line in f)
+        return [line for line in lines if line]
+
+def _cli_latest_replay():
+    """Newest replays/game_<epoch>.json, or None."""
+    if not os.path.isdir(REPLAY_DIR):
+        return None
+    files = [f for f in os.listdir(REPLAY_DIR) if _replay_epoch(f) is not None]
+    return os.path.join(REPLAY_DIR, max(files, key=_replay_epoch)) if files else None
+
+def _cli_load(path):
+    """Loads a replay's last snapshot into the globals. Returns the path, or None with a message printed."""
+    global REPLAY_FILEPATH
+    path = path or _cli_latest_replay()
+    if not path or not os.path.exists(path):
+        print(f"No replay file found{f' at {path}' if path else f' in {REPLAY_DIR}/'}.")
+        return None
+    snapshot, _ = read_replay_summary(path)
+    if not snapshot:
+        print(f"{path} has no snapshot to load.")
+        return None
+    reset_global_state()
+    restore_snapshot(snapshot)
+    REPLAY_FILEPATH = path
+    return path
+
+def _cli_roster(team):
+    return " / ".join(TEAM_ROSTERS.get(team, [team])) if team else "TBD"
+
+def _cli_active_teams(match_id):
+    """{'red': team, 'blue': team} for a match; red is the first slot, as on the scoreboard."""
+    teams = TOURNAMENT_STATE[match_id]['teams']
+    return {'red': teams[0], 'blue': teams[1]}
+
+def _cli_pick_winner(text, match_id):
+    """
+    Resolves the winner argument against the active match: 'red' / 'blue', a
+    team name ('Team 3' or just '3') or one of the players' names. Returns
+    (winner, loser, colour) or None.
+    """
+    sides = _cli_active_teams(match_id)
+    key = text.strip().lower()
+    if key in sides:
+        colour = key
+    else:
+        colour = None
+        for side, team in sides.items():
+            names = [team.lower(), team.lower().replace('team ', '')]
+            names += [_player_key(p) for p in TEAM_ROSTERS.get(team, [])]
+            if key in names or _player_key(text) in names:
+                colour = side
+        if colour is None:
+            return None
+    other = 'blue' if colour == 'red' else 'red'
+    return sides[colour], sides[other], colour
+
+def _cli_parse_duration(text):
+    """'754', '12:34' or '1:02:03' -> seconds."""
+    seconds = 0
+    for part in text.split(':'):
+        seconds = seconds * 60 + int(part)
+    return seconds
+
+def _cli_status_data():
+    active = TOURNAMENT_STATE.get('active_match_id')
+    matches = [mid for mid in get_compiled_bracket()['ids'] if mid in TOURNAMENT_STATE]
+    data = {
+        'replay': REPLAY_FILEPATH,
+        'format': TOURNAMENT_FORMAT,
+        'teams': {team: list(TEAM_ROSTERS.get(team, [])) for team in TEAMS},
+        'played': len([m for m in matches if TOURNAMENT_STATE[m].get('winner')]),
+        'matches': len(matches),
+        'active_match_id': active,
+        'rankings': dict(TOURNAMENT_RANKINGS),
+    }
+    if active and active != 'TOURNAMENT_OVER':
+        data['active'] = _cli_active_teams(active)
+    return data
+
+def _cli_schedule_data():
+    active = TOURNAMENT_STATE.get('active_match_id')
+    rows = []
+    for mid in sorted((k for k, v in TOURNAMENT_STATE.items() if isinstance(v, dict)), key=sort_match_keys):
+        md = TOURNAMENT_STATE[mid]
+        a, b = md['teams']
+        winner = md.get('winner')
+        if mid == active:
+            status = 'now'
+        elif winner:
+            status = 'done'
+        elif a and b:
+            status = 'ready'
+        else:
+            status = 'waiting'
+        rows.append({'id': mid, 'status': status, 'teams': [a, b], 'winner': winner,
+                     'red_score': md.get('red_score'), 'blue_score': md.get('blue_score')})
+    return rows
+
+def _cli_standings_data():
+    if TOURNAMENT_FORMAT in LEAGUE_FORMATS:
+        return league_standings(TOURNAMENT_STATE, get_compiled_bracket())
+    places = {team: _rank_code(label) or None for label, team in TOURNAMENT_RANKINGS.items() if team}
+    rows = []
+    for seed, team in enumerate(TEAMS):
+        wins, losses = get_team_record(team)
+        rows.append({'team': team, 'wins': wins, 'losses': losses, 'place': places.get(team), 'seed': seed})
+    return sorted(rows, key=lambda r: (r['place'] is None, r['place'] or 0, -r['wins'], r['losses'], r['seed']))
+
+def _cli_new(args):
+    global TOURNAMENT_FORMAT, REPLAY_FILEPATH
+    players = read_roster_file(args.roster)
+    if len(players) < 4 or len(players) % 2:
+        print(f"Need an even number of players (at least 4); {args.roster} lists {len(players)}.")
+        return 1
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    reset_global_state()
+    TOURNAMENT_FORMAT = args.format
+    if args.draw == 'order':
+        player_draws = list(enumerate(players, start=1))
+    else:
+        player_draws = draw_players(players, balanced=args.draw == 'balanced')
+    assign_teams(player_draws)
+    try:
+        config, prizes = load_bracket_config(len(TEAMS), TOURNAMENT_FORMAT)
+    except Exception as e:
+        print(f"Configuration error: {e}")
+        return 1
+    PRIZES.update(prizes)
+    generate_dynamic_bracket(TEAMS, config)
+
+    REPLAY_FILEPATH = args.out or os.path.join(REPLAY_DIR, f"game_{int(time.time())}.json")
+    if os.path.exists(REPLAY_FILEPATH):
+        print(f"{REPLAY_FILEPATH} already exists.")
+        return 1
+    append_snapshot_to_file(REPLAY_FILEPATH)
+    log_message(f"Replay file created from the command line: {REPLAY_FILEPATH}")
+
+    print(f"{TOURNAMENT_FORMATS[TOURNAMENT_FORMAT]}, {len(TEAMS)} teams -> {REPLAY_FILEPATH}")
+    for team in TEAMS:
+        print(f"  {team:<8} {_cli_roster(team)}")
+    _cli_print_next()
+    return 0
+
+def _cli_print_next():
+    active = TOURNAMENT_STATE.get('active_match_id')
+    if active == 'TOURNAMENT_OVER':
+        champion = TOURNAMENT_RANKINGS.get('1ST')
+        print(f"Tournament over. Champion: {champion} ({_cli_roster(champion)})")
+    else:
+        sides = _cli_active_teams(active)
+        print(f"Next: {active}  red {sides['red']} ({_cli_roster(sides['red'])})  vs  "
+              f"blue {sides['blue']} ({_cli_roster(sides['blue'])})")
+
+def _cli_result(args):
+    if not _cli_load(args.replay):
+        return 1
+    active = TOURNAMENT_STATE.get('active_match_id')
+    if active == 'TOURNAMENT_OVER':
+        print("The tournament is already over.")
+        return 1
+    if args.match and args.match.upper() != active:
+        print(f"The active match is {active}, not {args.match}.")
+        return 1
+    picked = _cli_pick_winner(args.winner, active)
+    if picked is None:
+        sides = _cli_active_teams(active)
+        print(f"'{args.winner}' is not in {active} (red {sides['red']}, blue {sides['blue']}).")
+        return 1
+    winner, loser, colour = picked
+
+    red_score = blue_score = None
+    if args.score:
+        try:
+            w_score, l_score = (int(x) for x in args.score.split('-'))
+        except ValueError:
+            print(f"Score must look like 15-9 (winner first), not '{args.score}'.")
+            return 1
+        red_score, blue_score = (w_score, l_score) if colour == 'red' else (l_score, w_score)
+    try:
+        duration = _cli_parse_duration(args.duration) if args.duration else None
+    except ValueError:
+        print(f"Duration must be seconds or mm:ss, not '{args.duration}'.")
+        return 1
+
+    log_message(f"Resolving match {active} from the command line: {winner} ({colour}) defeated {loser}")
+    record_match_result(active, winner, loser, colour, red_score, blue_score, duration)
+    append_snapshot_to_file(REPLAY_FILEPATH)
+    if TOURNAMENT_STATE.get('active_match_id') == 'TOURNAMENT_OVER' and TOURNAMENT_RANKINGS.get('1ST'):
+        append_final_stats_to_file(REPLAY_FILEPATH, TOURNAMENT_RANKINGS['1ST'])
+
+    score = f" {args.score}" if args.score else ""
+    print(f"{active}: {winner} ({_cli_roster(winner)}) defeated {loser} ({_cli_roster(loser)}){score}")
+    _cli_print_next()
+    return 0
+
+def _cli_status(args):
+    if not _cli_load(args.replay):
+        return 1
+    data = _cli_status_data()
+    if args.json:
+        print(json.dumps(data, indent=2))
+        return 0
+    print(f"{data['replay']}: {TOURNAMENT_FORMATS.get(data['format'], data['format'])}, "
+          f"{len(data['teams'])} teams, {data['played']}/{data['matches']} matches played")
+    _cli_print_next()
+    return 0
+
+def _cli_schedule(args):
+    if not _cli_load(args.replay):
+        return 1
+    rows = _cli_schedule_data()
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return 0
+    for row in rows:
+        if row['status'] == 'waiting' and not args.all:
+            continue
+        a, b = row['teams']
+        line = f"{row['status'].upper():<8} {row['id']:<5} {_cli_roster(a)}  vs  {_cli_roster(b)}"
+        if row['winner']:
+            line += f"  -> {row['winner']}"
+            if row['red_score'] is not None and row['blue_score'] is not None:
+                line += f" ({row['red_score']}-{row['blue_score']} red-blue)"
+        print(line)
+    return 0
+
+def _cli_standings(args):
+    if not _cli_load(args.replay):
+        return 1
+    rows = _cli_standings_data()
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return 0
+    for i, row in enumerate(rows, start=1):
+        if TOURNAMENT_FORMAT in LEAGUE_FORMATS:
+            place = f"{i}."
+            extra = f"  buchholz {row['buchholz']}" + (f", {row['byes']} bye" if row['byes'] else "")
+        else:
+            place = _ordinal_label(row['place']) if row['place'] else '--'
+            extra = ""
+        print(f"{place:>5} {row['team']:<8} {row['wins']}-{row['losses']}  {_cli_roster(row['team'])}{extra}")
+    return 0
+
+def run_headless_cli(argv):
+    """`sb.py cli` — create, score and inspect tournaments without the GUI."""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='sb.py cli',
+                                     description='Run a tournament from the command line (no display needed).')
+    sub = parser.add_subparsers(dest='action', required=True)
+
+    p = sub.add_parser('new', help='draw teams from a roster file and start a replay')
+    p.add_argument('roster', help='text file with one player per line')
+    p.add_argument('--format', choices=list(TOURNAMENT_FORMATS), default='D',
+                   help='D double, S single elimination, R round robin, W Swiss (default D)')
+    p.add_argument('--draw', choices=('random', 'balanced', 'order'), default='random',
+                   help="'order' pairs players as listed (default random)")
+    p.add_argument('--seed', type=int, help='seed for a reproducible random draw')
+    p.add_argument('--out', help=f'replay file (default {REPLAY_DIR}/game_<time>.json)')
+    p.set_defaults(run=_cli_new)
+
+    p = sub.add_parser('result', help='record the winner of the active match')
+    p.add_argument('winner', help="'red', 'blue', a team ('Team 3' or '3') or a player's name")
+    p.add_argument('--score', help='final score, winner first, e.g. 15-9')
+    p.add_argument('--duration', help='match length in seconds or mm:ss')
+    p.add_argument('--match', help='refuse unless this is the active match')
+    p.add_argument('--replay', help='replay file (default: newest)')
+    p.set_defaults(run=_cli_result)
+
+    for name, fn, text in (('status', _cli_status, 'progress and the match on deck'),
+                           ('schedule', _cli_schedule, 'played, current and upcoming matches'),
+                           ('standings', _cli_standings, 'team records and placings')):
+        p = sub.add_parser(name, help=text)
+        p.add_argument('--replay', help='replay file (default: newest)')
+        p.add_argument('--json', action='store_true', help='print JSON for scripts')
+        if name == 'schedule':
+            p.add_argument('--all', action='store_true', help='include matches still waiting on teams')
+        p.set_defaults(run=fn)
+
+    args = parser.parse_args(argv)
+
+    global LOG_CONSOLE
+    LOG_CONSOLE = False
+    return args.run(args)
+
+# =============================================================================
+# --- Batch PDF Export ---
+# `python sb.py export-pdf` renders a results PDF for every completed
+# tournament in replays/, in parallel worker processes. Each report's payload
+# comes from the replay's FINAL_STATS record (recomputed from the last
+# snapshot only for older files without one). A manifest in the output folder
+# records each payload's content hash, so unchanged reports are skipped.
+# =============================================================================
+
+REPORT_DIR = "reports"
+REPORT_MANIFEST = "manifest.json"
+
+def replay_report_payload(path, summary=None):
+    """
+    (payload, recomputed) for a replay file, or (None, reason) when the
+    tournament never finished. Like pdf_report_payload(), but from disk;
+    pass `summary` when read_replay_summary(path) has already been called.
+    """
+    snapshot, final = summary or read_replay_summary(path)
+    if snapshot is None:
+        return None, "no snapshot"
+    if final is not None:
+        champion, stats, stamp = final.get('champion'), final.get('stats'), final.get('timestamp')
+        recomputed = False
+    else:
+        reset_global_state()
+        restore_snapshot(snapshot)
+        champion = TOURNAMENT_RANKINGS.get('1ST')
+        if snapshot.get('active_match_id') != 'TOURNAMENT_OVER' or not champion:
+            return None, "tournament not finished"
+        stats, stamp = _compute_final_stats(champion), snapshot.get('timestamp')
+        recomputed = True
+    generated = datetime.datetime.fromtimestamp(stamp or os.path.getmtime(path))
+    return {
+        'champion': champion,
+        'stats': stats,
+        'rosters': snapshot.get('rosters', {}),
+        'durations': snapshot.get('match_durations', []),
+        'generated': generated.strftime("%B %d, %Y  %I:%M %p"),
+        'version': SHUF_VERSION,
+    }, recomputed
+
+def report_payload_hash(payload):
+    """Content hash of a report payload; the app version is part of it, so layout changes re-export."""
+    import hashlib
+    blob = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+def _export_replay_worker(job):
+    """Process-pool entry point: one replay -> one PDF. Returns a plain result dict."""
+    path, pdf_path, known_hash = job
+    global LOG_CONSOLE
+    LOG_CONSOLE = False
+    started = time.perf_counter()
+    result = {'replay': path, 'pdf': pdf_path, 'hash': known_hash, 'recomputed': False}
+    try:
+        payload, info = replay_report_payload(path)
+        if payload is None:
+            result.update(status='incomplete', detail=info)
+        else:
+            result['recomputed'] = info
+            result['hash'] = report_payload_hash(payload)
+            if result['hash'] == known_hash and os.path.exists(pdf_path):
+                result['status'] = 'skipped'
+            else:
+                _build_results_pdf(pdf_path, payload)
+                result['status'] = 'exported'
+    except Exception as e:
+        result.update(status='failed', detail=str(e))
+    result['seconds'] = time.perf_counter() - started
+    return result
+
+def run_export_pdf_cli(argv):
+    """`sb.py export-pdf` — returns 1 if any report failed."""
+    import argparse
+    import glob
+    from concurrent.futures import ProcessPoolExecutor
+
+    parser = argparse.ArgumentParser(prog='sb.py export-pdf',
+                                     description='Render results PDFs for every finished replay.')
+    parser.add_argument('replays', nargs='*', help=f'replay files (default: {REPLAY_DIR}/*.json)')
+    parser.add_argument('--out', default=REPORT_DIR, help=f'output folder (default {REPORT_DIR})')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='re-render even when the content hash matches')
+    args = parser.parse_args(argv)
+
+    global LOG_CONSOLE
+    LOG_CONSOLE = False
+
+    if not load_reportlab():
+        print("ReportLab is not installed (pip install reportlab).")
+        return 1
+
+    paths = args.replays or sorted(glob.glob(os.path.join(REPLAY_DIR, '*.json')))
+    if not paths:
+        print("No replay files found.")
+        return 0
+
+    os.makedirs(args.out, exist_ok=True)
+    manifest_path = os.path.join(args.out, REPORT_MANIFEST)
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+
+    jobs = []
+    for path in paths:
+        name = os.path.basename(path)
+        pdf_path = os.path.join(args.out, os.path.splitext(name)[0] + '.pdf')
+        known = None if args.force else manifest.get(name, {}).get('hash')
+        jobs.append((path, pdf_path, known))
+
+    started = time.perf_counter()
+    counts = Counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for r in pool.map(_export_replay_worker, jobs):
+            counts[r['status']] += 1
+            name = os.path.basename(r['replay'])
+            if r['status'] in ('exported', 'skipped'):
+                manifest[name] = {'hash': r['hash'], 'pdf': os.path.basename(r['pdf']),
+                                  'recomputed': r['recomputed']}
+            if r['status'] == 'skipped':
+                continue
+            note = r.get('detail') or ("stats recomputed from snapshot" if r['recomputed'] else "")
+            print(f"{r['status'].upper():<10} {name}  ({r['seconds']:.2f}s){'  ' + note if note else ''}")
+
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+    print(f"{counts['exported']} exported, {counts['skipped']} unchanged, "
+          f"{counts['incomplete']} unfinished, {counts['failed']} failed "
+          f"in {time.perf_counter() - started:.2f}s -> {args.out}")
+    return 1 if counts['failed'] else 0
+
+# =============================================================================
+# --- Static Web Export ---
+# `python sb.py export-web` publishes the replay library as static files
+# without Tk or a display: per finished tournament an SVG bracket (painted by
+# draw_large_bracket() onto SvgCanvas, so it matches the app's bracket
+# window), an HTML results page built from the same rows as the PDF, and an
+# index page linking them. Unchanged tournaments are skipped by content hash.
+# =============================================================================
+
+WEB_DIR = "site"
+WEB_BRACKET_WIDTH = 1200
+
+class SvgCanvas:
+    """
+    Stands in for tk.Canvas with the subset of calls draw_large_bracket()
+    and draw_match_box_internal() make, and writes the items out as SVG.
+    """
+    _ANCHORS = {  # Tk anchor -> (text-anchor, dominant-baseline)
+        'nw': ('start', 'hanging'), 'n': ('middle', 'hanging'), 'ne': ('end', 'hanging'),
+        'w': ('start', 'central'), 'center': ('middle', 'central'), 'e': ('end', 'central'),
+        'sw': ('start', 'text-after-edge'), 's': ('middle', 'text-after-edge'),
+        'se': ('end', 'text-after-edge'),
+    }
+
+    def __init__(self, width=WEB_BRACKET_WIDTH):
+        self.width = width
+        self.bg = THEME['bg_canvas']
+        self.items = []            # (kind, coords, options, tags)
+        self.scrollregion = None
+
+    def winfo_width(self):
+        return self.width
+
+    def update_idletasks(self):
+        pass
+
+    def delete(self, *tags):
+        self.items = [] if 'all' in tags else [i for i in self.items if not set(tags) & set(i[3])]
+
+    def configure(self, **options):
+        self.bg = options.get('bg', self.bg)
+        self.scrollregion = options.get('scrollregion', self.scrollregion)
+    config = configure
+
+    def _add(self, kind, coords, options):
+        tags = options.pop('tags', ())
+        self.items.append((kind, [float(c) for c in coords], options,
+                           (tags,) if isinstance(tags, str) else tuple(tags)))
+        return len(self.items)
+
+    def create_rectangle(self, *coords, **options):
+        return self._add('rect', coords, options)
+
+    def create_line(self, *coords, **options):
+        return self._add('line', coords, options)
+
+    def create_text(self, *coords, **options):
+        return self._add('text', coords, options)
+
+    def tag_lower(self, tag):
+        """Moves items with `tag` below everything else, keeping their order (as Tk does)."""
+        lowered = [i for i in self.items if tag in i[3]]
+        self.items = lowered + [i for i in self.items if tag not in i[3]]
+
+    def bbox(self, tag='all'):
+        xs, ys = [], []
+        for kind, coords, options, tags in self.items:
+            if tag == 'all' or tag in tags:
+                xs.extend(coords[0::2])
+                ys.extend(coords[1::2])
+        return (min(xs), min(ys), max(xs), max(ys)) if xs else None
+
+    def to_svg(self):
+        import html
+        if self.scrollregion:
+            width, height = self.scrollregion[2], self.scrollregion[3]
+        else:
+            box = self.bbox() or (0, 0, self.width, 0)
+            width, height = max(self.width, box[2]), box[3]
+        out = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" height="{height:.0f}" '
+               f'viewBox="0 0 {width:.0f} {height:.0f}">',
+               f'<rect width="100%" height="100%" fill="{self.bg}"/>']
+        for kind, c, o, _tags in self.items:
+            if kind == 'rect':
+                x1, x2 = sorted((c[0], c[2]))
+                y1, y2 = sorted((c[1], c[3]))
+                stroke = (f' stroke="{o["outline"]}" stroke-width="{o.get("width", 1)}"'
+                          if o.get('outline') else '')
+                out.append(f'<rect x="{x1:g}" y="{y1:g}" width="{x2 - x1:g}" height="{y2 - y1:g}" '
+                           f'fill="{o.get("fill") or "none"}"{stroke}/>')
+            elif kind == 'line':
+                pts = " ".join(f"{x:g},{y:g}" for x, y in zip(c[0::2], c[1::2]))
+                dash = f' stroke-dasharray="{" ".join(map(str, o["dash"]))}"' if o.get('dash') else ''
+                out.append(f'<polyline points="{pts}" fill="none" stroke="{o.get("fill", "black")}" '
+                           f'stroke-width="{o.get("width", 1)}"{dash}/>')
+            else:
+                face, size, *extras = o.get('font') or ('Selawik', SF(10))
+                anchor, baseline = self._ANCHORS[o.get('anchor', 'center')]
+                weight = ' font-weight="bold"' if 'bold' in extras else ''
+                out.append(f'<text x="{c[0]:g}" y="{c[1]:g}" fill="{o.get("fill", "black")}" '
+                           f'font-family="{face}, sans-serif" font-size="{size}pt"{weight} '
+                           f'text-anchor="{anchor}" dominant-baseline="{baseline}">'
+                           f'{html.escape(str(o.get("text", "")))}</text>')
+        out.append('</svg>')
+        return "\n".join(out)
+
+def render_bracket_svg(width=WEB_BRACKET_WIDTH):
+    """The current tournament's full bracket as an SVG document."""
+    canvas = SvgCanvas(width)
+    draw_large_bracket(canvas)
+    return canvas.to_svg()
+
+def render_results_html(payload, bracket_svg=None, bracket_href=None):
+    """Standalone HTML results page for a pdf_report_payload()-style dict."""
+    import html
+    esc = html.escape
+    champion = payload['champion']
+    champ_roster = " / ".join(payload['rosters'].get(champion, ['?', '?']))
+    tone_css = {None: THEME['fg_primary'], 'gold': THEME['accent_gold'], 'fg2': THEME['fg_secondary'],
+                'red': THEME['red_team'], 'blue': THEME['blue_team']}
+
+    def table(rows):
+        cells = []
+        for row in rows:
+            if row[0] == 'section':
+                cells.append(f'<tr><th colspan="2">{esc(row[1])}</th></tr>')
+            else:
+                cells.append(f'<tr><td class="lbl">{esc(row[1])}</td>'
+                             f'<td style="color:{tone_css[row[3]]}"><b>{esc(row[2])}</b></td></tr>')
+        return '<table class="stats">' + "".join(cells) + '</table>'
+
+    left_rows, right_rows = report_stat_rows(payload)
+    history = report_history_rows(payload)
+    parts = [
+        '<!DOCTYPE html>',
+        '<html><head><meta charset="utf-8">',
+        f'<title>Tournament Results — {esc(champ_roster)}</title>',
+        '<style>',
+        f'body{{background:{THEME["bg_main"]};color:{THEME["fg_primary"]};'
+        'font-family:Selawik,"Segoe UI",sans-serif;margin:24px}',
+        f'h1{{color:{THEME["accent_gold"]};text-align:center;margin:0 0 8px}}',
+        f'.champ{{background:{THEME["bg_canvas"]};text-align:center;padding:10px;margin-bottom:16px}}',
+        f'.champ small{{color:{THEME["accent_gold"]};font-weight:bold;display:block}}',
+        '.champ span{font-size:1.4em;font-weight:bold}',
+        '.cols{display:flex;gap:16px;flex-wrap:wrap;align-items:flex-start}',
+        f'table{{border-collapse:collapse;background:{THEME["bg_card"]}}}',
+        f'th{{color:{THEME["accent_gold"]};text-align:left;padding:10px 8px 4px}}',
+        'td{padding:4px 8px}',
+        f'td.lbl{{color:{THEME["fg_secondary"]}}}',
+        'tr:nth-child(even) td{background:#2E3C43}',
+        f'table.history th{{border-bottom:1px solid {THEME["accent_gold"]}}}',
+        '.bracket{overflow-x:auto;margin-top:16px}',
+        f'footer{{color:{THEME["fg_secondary"]};text-align:center;font-size:.8em;margin-top:16px}}',
+        f'a{{color:{THEME["accent_gold"]}}}',
+        '</style></head><body>',
+        '<h1>TOURNAMENT COMPLETE</h1>',
+        f'<div class="champ"><small>CHAMPIONS</small><span>{esc(champ_roster)}</span></div>',
+        f'<div class="cols">{table(left_rows)}{table(right_rows)}</div>',
+    ]
+    if bracket_svg or bracket_href:
+        parts.append('<h2>Bracket</h2><div class="bracket">')
+        parts.append(bracket_svg or f'<img src="{esc(bracket_href)}" alt="Tournament bracket">')
+        parts.append('</div>')
+    if history:
+        parts.append('<h2>Match History</h2><table class="history"><tr><th>Match</th><th>Winner</th>'
+                     '<th>Loser</th><th>Score</th><th>Duration</th></tr>')
+        for mid, w_roster, l_roster, score, dur, color in history:
+            w_color = THEME['red_team'] if color == 'red' else THEME['blue_team']
+            parts.append(f'<tr><td>{esc(mid)}</td><td style="color:{w_color}">{esc(w_roster)}</td>'
+                         f'<td>{esc(l_roster)}</td><td>{esc(score)}</td><td>{esc(dur)}</td></tr>')
+        parts.append('</table>')
+    parts.append(f'<footer>Moose Lodge Shuffleboard  •  Generated {esc(payload["generated"])}  •  '
+                 f'v{esc(payload["version"])}</footer>')
+    parts.append('</body></html>')
+    return "\n".join(parts)
+
+def _export_web_worker(job):
+    """Process-pool entry point: one replay -> <stem>.svg + <stem>.html. Returns a plain result dict."""
+    global LOG_CONSOLE, REPLAY_VIEW_ONLY
+    path, out_dir, known_hash = job
+    LOG_CONSOLE = False
+    started = time.perf_counter()
+    stem = os.path.splitext(os.path.basename(path))[0]
+    result = {'replay': path, 'page': stem + '.html', 'hash': known_hash, 'recomputed': False}
+    try:
+        summary = read_replay_summary(path)
+        payload, info = replay_report_payload(path, summary)
+        if payload is None:
+            result.update(status='incomplete', detail=info)
+        else:
+            snapshot = summary[0]
+            result['recomputed'] = info
+            result['hash'] = report_payload_hash({'report': payload, 'state': snapshot.get('state')})
+            result['meta'] = {'generated': payload['generated'],
+                              'champion': " / ".join(payload['rosters'].get(payload['champion'], ['?'])),
+                              'teams': payload['stats'].get('total_teams'),
+                              'format': TOURNAMENT_FORMATS.get(snapshot.get('format', 'D'), '')}
+            if result['hash'] == known_hash and os.path.exists(os.path.join(out_dir, result['page'])):
+                result['status'] = 'skipped'
+            else:
+                reset_global_state()
+                restore_snapshot(snapshot)
+                REPLAY_VIEW_ONLY = True
+                with open(os.path.join(out_dir, stem + '.svg'), 'w', encoding='utf-8') as f:
+                    f.write(render_bracket_svg())
+                with open(os.path.join(out_dir, result['page']), 'w', encoding='utf-8') as f:
+                    f.write(render_results_html(payload, bracket_href=stem + '.svg'))
+                result['status'] = 'exported'
+    except Exception as e:
+        result.update(status='failed', detail=str(e))
+    result['seconds'] = time.perf_counter() - started
+    return result
+
+def run_export_web_cli(argv):
+    """`sb.py export-web` — returns 1 if any page failed."""
+    import argparse
+    import glob
+    import html
+    from concurrent.futures import ProcessPoolExecutor
+
+    parser = argparse.ArgumentParser(prog='sb.py export-web',
+                                     description='Publish brackets (SVG) and results (HTML) for every finished replay.')
+    parser.add_argument('replays', nargs='*', help=f'replay files (default: {REPLAY_DIR}/*.json)')
+    parser.add_argument('--out', default=WEB_DIR, help=f'output folder (default {WEB_DIR})')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='rebuild even when the content hash matches')
+    args = parser.parse_args(argv)
+
+    global LOG_CONSOLE
+    LOG_CONSOLE = False
+
+    paths = args.replays or sorted(glob.glob(os.path.join(REPLAY_DIR, '*.json')))
+    if not paths:
+        print("No replay files found.")
+        return 0
+
+    os.makedirs(args.out, exist_ok=True)
+    manifest_path = os.path.join(args.out, REPORT_MANIFEST)
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+
+    jobs = [(path, args.out, None if args.force else manifest.get(os.path.basename(path), {}).get('hash'))
+            for path in paths]
+
+    started = time.perf_counter()
+    counts = Counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for r in pool.map(_export_web_worker, jobs):
+            counts[r['status']] += 1
+            name = os.path.basename(r['replay'])
+            if r['status'] in ('exported', 'skipped'):
+                manifest[name] = dict(r['meta'], hash=r['hash'], page=r['page'], recomputed=r['recomputed'])
+            if r['status'] == 'skipped':
+                continue
+            note = r.get('detail') or ("stats recomputed from snapshot" if r['recomputed'] else "")
+            print(f"{r['status'].upper():<10} {name}  ({r['seconds']:.2f}s){'  ' + note if note else ''}")
+
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+    # Index of everything published so far, newest first
+    entries = sorted(manifest.items(), key=lambda kv: _replay_epoch(kv[0]) or 0, reverse=True)
+    rows = "\n".join(
+        f'<tr><td><a href="{html.escape(e["page"])}">{html.escape(e.get("generated", name))}</a></td>'
+        f'<td>{html.escape(e.get("format", ""))}</td><td>{e.get("teams", "")}</td>'
+        f'<td>{html.escape(e.get("champion", ""))}</td></tr>'
+        for name, e in entries)
+    with open(os.path.join(args.out, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write('<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>Tournament Results</title>'
+                f'<style>body{{background:{THEME["bg_main"]};color:{THEME["fg_primary"]};'
+                'font-family:Selawik,"Segoe UI",sans-serif;margin:24px}'
+                f'a,h1{{color:{THEME["accent_gold"]}}}td,th{{padding:4px 12px;text-align:left}}</style>'
+                '</head><body><h1>Tournament Results</h1>\n'
+                '<table><tr><th>Date</th><th>Format</th><th>Teams</th><th>Champions</th></tr>\n'
+                f'{rows}\n</table></body></html>\n')
+
+    print(f"{counts['exported']} exported, {counts['skipped']} unchanged, "
+          f"{counts['incomplete']} unfinished, {counts['failed']} failed "
+          f"in {time.perf_counter() - started:.2f}s -> {args.out}")
+    return 1 if counts['failed'] else 0
+
+# =============================================================================
+# --- Live Results Server ---
+# With SB_LIVE=1 the app serves a spectator page on the LAN
+# (http://<laptop>:SB_LIVE_PORT/) so players can follow the bracket on their
+# phones instead of crowding the laptop. An asyncio loop on its own thread
+# runs a small HTTP server and plain RFC 6455 WebSockets (standard library
+# only). The Tk thread never touches the loop's data: live_publish() diffs
+# a fresh view against the last one it sent and hands only the changes over
+# with call_soon_threadsafe(). The loop encodes each update once and queues
+# the same frame for every phone; a phone that falls too far behind is
+# dropped and resyncs when it reconnects. /snapshot serves the full replay
+# snapshot for the TV display process (see TV Display), and /report plus
+# POST /submit let table scorekeepers send results (see Remote Results).
+# `python sb.py serve` runs the same server headless, following a replay file.
+# =============================================================================
+
+LIVE_ENABLED = os.environ.get('SB_LIVE', '0') == '1'
+LIVE_HOST = os.environ.get('SB_LIVE_HOST', '0.0.0.0')
+LIVE_PORT = int(os.environ.get('SB_LIVE_PORT', '8080'))
+LIVE_MAX_CLIENTS = 200
+LIVE_CLIENT_QUEUE = 64        # frames buffered per phone before it is dropped
+LIVE_REQUEST_TIMEOUT = 10     # seconds a client has to send its request headers
+LIVE_MAX_FRAME = 65536        # phones only send close/ping frames; anything bigger is refused
+_WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+_live_loop = None        # asyncio loop of the server thread, None when not running
+_live_thread = None
+_live_published = None   # last view handed to the loop (publishing thread only)
+_live_clients = {}       # frame queue -> StreamWriter (loop thread only)
+_live_state = {}         # full view plus score, bracket and seq (loop thread only)
+_live_bracket_svg = ''   # (loop thread only)
+_live_snapshot = b''     # serialize_snapshot() JSON for the TV display (loop thread only)
+_live_versions = {}      # match id -> version, bumped each time the match changes (publishing thread only)
+_live_wired = False      # scoreboard counters and submission pump hooked up
+
+def live_view():
+    """The spectator view of the current tournament as plain JSON data."""
+    ids = sorted((k for k, v in TOURNAMENT_STATE.items() if isinstance(v, dict)), key=sort_match_keys)
+    matches = {}
+    for mid in ids:
+        md = TOURNAMENT_STATE[mid]
+        matches[mid] = {'teams': list(md['teams']), 'winner': md.get('winner'),
+                        'red_score': md.get('red_score'), 'blue_score': md.get('blue_score'),
+                        'v': _live_versions.get(mid, 0)}
+    view = {
+        'format': TOURNAMENT_FORMAT,
+        'rosters': {team: list(TEAM_ROSTERS.get(team, [])) for team in TEAMS},
+        'order': ids,
+        'matches': matches,
+        'rankings': dict(TOURNAMENT_RANKINGS),
+        'active': None,
+        'standings': None,
+    }
+    active = TOURNAMENT_STATE.get('active_match_id')
+    if active == 'TOURNAMENT_OVER':
+        view['active'] = {'id': active, 'champion': TOURNAMENT_RANKINGS.get('1ST')}
+    elif active in TOURNAMENT_STATE:
+        red, blue = live_match_colours(active)
+        view['active'] = {'id': active, 'red': red, 'blue': blue}
+    if TOURNAMENT_FORMAT in LEAGUE_FORMATS and TOURNAMENT_STATE:
+        view['standings'] = [[r['team'], r['wins'], r['losses']]
+                             for r in league_standings(TOURNAMENT_STATE, get_compiled_bracket())]
+    return view
+
+def live_match_colours(mid):
+    """(red team, blue team) of a match: teams order, except as swapped on the scoreboard for the active match."""
+    red, blue = TOURNAMENT_STATE[mid]['teams']
+    if (mid == TOURNAMENT_STATE.get('active_match_id')
+            and {current_match_teams['red'], current_match_teams['blue']} == {red, blue}):
+        red, blue = current_match_teams['red'], current_match_teams['blue']   # after a swap
+    return red, blue
+
+def live_delta(old, new):
+    """
+    Top-level keys of `new` that differ from `old`; 'matches' is narrowed to
+    the changed matches, with None for a match that no longer exists (GGF
+    once GF is decided).
+    """
+    if old is None:
+        return dict(new)
+    delta = {}
+    for key, value in new.items():
+        if key == 'matches':
+            changed = {mid: m for mid, m in value.items() if old['matches'].get(mid) != m}
+            changed.update((mid, None) for mid in old['matches'] if mid not in value)
+            if changed:
+                delta['matches'] = changed
+        elif old.get(key) != value:
+            delta[key] = value
+    return delta
+
+def live_publish():
+    """
+    Sends what changed since the last call to every phone, bumping the
+    version of each changed match. Call on the thread that owns the globals.
+    """
+    global _live_published
+    loop = _live_loop
+    if loop is None:
+        return
+    with trace_span('live_publish'):
+        view = live_view()
+        delta = live_delta(_live_published, view)
+        if not delta:
+            return
+        for mid, m in delta.get('matches', {}).items():
+            if m is not None:   # the same dict as in `view`
+                m['v'] = _live_versions[mid] = _live_versions.get(mid, 0) + 1
+        svg = snapshot = None
+        if 'matches' in delta or 'rosters' in delta:
+            svg = render_bracket_svg()
+            snapshot = json.dumps(serialize_snapshot(), separators=(",", ":")).encode('utf-8')
+        _live_published = view
+        delta['t'] = 'delta'
+        try:
+            loop.call_soon_threadsafe(_live_apply, delta, svg, snapshot)
+        except RuntimeError:
+            pass   # server stopped in the meantime
+
+def live_publish_score(*_):
+    """IntVar trace callback: pushes the scoreboard counters as they change."""
+    loop = _live_loop
+    if loop is None or not ui_references.get('red_counter_var') or not ui_references.get('blue_counter_var'):
+        return
+    msg = {'t': 'score', 'id': TOURNAMENT_STATE.get('active_match_id'),
+           'red': ui_references['red_counter_var'].get(), 'blue': ui_references['blue_counter_var'].get()}
+    try:
+        loop.call_soon_threadsafe(_live_apply, msg, None, None)
+    except RuntimeError:
+        pass
+
+def _ws_frame(payload, opcode=0x1):
+    """One unmasked, unfragmented server frame."""
+    n = len(payload)
+    if n < 126:
+        header = bytes((0x80 | opcode, n))
+    elif n < 65536:
+        header = bytes((0x80 | opcode, 126)) + n.to_bytes(2, 'big')
+    else:
+        header = bytes((0x80 | opcode, 127)) + n.to_bytes(8, 'big')
+    return header + payload
+
+async def _ws_read_frame(reader, limit=LIVE_MAX_FRAME):
+    """(opcode, payload) of the next frame; `limit` caps its size (None: no cap)."""
+    b1, b2 = await reader.readexactly(2)
+    n = b2 & 0x7F
+    if n == 126:
+        n = int.from_bytes(await reader.readexactly(2), 'big')
+    elif n == 127:
+        n = int.from_bytes(await reader.readexactly(8), 'big')
+    if limit is not None and n > limit:
+        raise ValueError(f"WebSocket frame of {n} bytes")
+    mask = await reader.readexactly(4) if b2 & 0x80 else None
+    data = await reader.readexactly(n)
+    if mask:
+        data = bytes(b ^ mask[i & 3] for i, b in enumerate(data))
+    return b1 & 0x0F, data
+
+def _live_encode(msg):
+    return _ws_frame(json.dumps(msg, separators=(",", ":")).encode('utf-8'))
+
+def _live_apply(msg, svg, snapshot):
+    """Loop thread: folds an update into the full state and queues it for every phone."""
+    global _live_bracket_svg, _live_snapshot
+    if msg['t'] == 'score':
+        _live_state['score'] = {k: msg[k] for k in ('id', 'red', 'blue')}
+    else:
+        for key, value in msg.items():
+            if key == 'matches':
+                merged = {**_live_state.get('matches', {}), **value}
+                _live_state['matches'] = {mid: m for mid, m in merged.items() if m is not None}
+            elif key != 't':
+                _live_state[key] = value
+        if svg is not None:
+            _live_bracket_svg, _live_snapshot = svg, snapshot
+            msg['bracket'] = _live_state['bracket'] = _live_state.get('bracket', 0) + 1
+    msg['seq'] = _live_state['seq'] = _live_state.get('seq', 0) + 1
+    frame = _live_encode(msg)
+    for queue, writer in list(_live_clients.items()):
+        try:
+            queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            log_message(f"Live: dropping a phone {LIVE_CLIENT_QUEUE} updates behind", "DEBUG")
+            del _live_clients[queue]
+            writer.close()
+
+async def _live_send(queue, writer):
+    try:
+        while True:
+            writer.write(await queue.get())
+            await writer.drain()
+    except (ConnectionError, asyncio.CancelledError):
+        pass
+
+async def _live_websocket(reader, writer, headers):
+    import base64
+    import hashlib
+    key = headers.get('sec-websocket-key')
+    if not key or len(_live_clients) >= LIVE_MAX_CLIENTS:
+        await _live_respond(writer, '503 Service Unavailable', b'Too many viewers', 'text/plain')
+        return
+    accept = base64.b64encode(hashlib.sha1((key + _WS_GUID).encode('ascii')).digest()).decode('ascii')
+    writer.write(('HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n'
+                  f'Sec-WebSocket-Accept: {accept}\r\n\r\n').encode('ascii'))
+    queue = asyncio.Queue(LIVE_CLIENT_QUEUE)
+    queue.put_nowait(_live_encode({'t': 'sync', **_live_state}))
+    _live_clients[queue] = writer
+    sender = asyncio.ensure_future(_live_send(queue, writer))
+    try:
+        while True:
+            opcode, payload = await _ws_read_frame(reader)
+            if opcode == 0x8:     # close
+                break
+            if opcode == 0x9:     # ping
+                writer.write(_ws_frame(payload, 0xA))
+    except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+        pass
+    finally:
+        _live_clients.pop(queue, None)
+        sender.cancel()
+        writer.close()
+
+async def _live_respond(writer, status, body, content_type):
+    writer.write((f'HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n'
+                  f'Content-Length: {len(body)}\r\nCache-Control: no-cache\r\nConnection: close\r\n\r\n'
+                  ).encode('ascii') + body)
+    try:
+        await writer.drain()
+    except ConnectionError:
+        pass
+    writer.close()
+
+async def _live_handle(reader, writer):
+    """One connection: the pages, /state, /bracket.svg, /snapshot, POST /submit, or the /ws upgrade."""
+    try:
+        head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), LIVE_REQUEST_TIMEOUT)
+    except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+        writer.close()
+        return
+    lines = head.decode('latin-1').split('\r\n')
+    request = lines[0].split()
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+    if len(request) < 2 or request[0] not in ('GET', 'POST'):
+        await _live_respond(writer, '405 Method Not Allowed', b'', 'text/plain')
+        return
+    path = request[1].split('?', 1)[0]
+    if request[0] == 'POST':
+        if path == '/submit':
+            status, body = await _live_submit(reader, headers)
+            await _live_respond(writer, status, json.dumps(body).encode('utf-8'), 'application/json')
+        else:
+            await _live_respond(writer, '405 Method Not Allowed', b'', 'text/plain')
+    elif path == '/ws' and headers.get('upgrade', '').lower() == 'websocket':
+        await _live_websocket(reader, writer, headers)
+    elif path in ('/', '/report'):
+        page = render_live_page(report=path == '/report')
+        await _live_respond(writer, '200 OK', page.encode('utf-8'), 'text/html; charset=utf-8')
+    elif path == '/state':
+        await _live_respond(writer, '200 OK', json.dumps(_live_state).encode('utf-8'), 'application/json')
+    elif path == '/bracket.svg':
+        await _live_respond(writer, '200 OK', _live_bracket_svg.encode('utf-8'), 'image/svg+xml')
+    elif path == '/snapshot':
+        await _live_respond(writer, '200 OK', _live_snapshot or b'{}', 'application/json')
+    else:
+        await _live_respond(writer, '404 Not Found', b'Not found', 'text/plain')
+
+def _live_lan_address():
+    """Best guess at this machine's LAN address, for the log line (no traffic is sent)."""
+    import socket
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect(('10.255.255.255', 1))
+            return s.getsockname()[0]
+    except OSError:
+        return '127.0.0.1'
+
+def start_live_server(host=LIVE_HOST, port=LIVE_PORT):
+    """Starts the server thread. Returns True once it is listening."""
+    global _live_thread, asyncio
+    if _live_loop is not None:
+        return True
+    import asyncio
+    live_submit_token(host)   # before the first request can arrive
+    ready = threading.Event()
+    failure = []
+
+    def run():
+        global _live_loop
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            server = loop.run_until_complete(asyncio.start_server(_live_handle, host, port, backlog=128))
+        except OSError as e:
+            failure.append(e)
+            loop.close()
+            ready.set()
+            return
+        _live_loop = loop
+        ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            server.close()
+            for writer in _live_clients.values():
+                writer.close()
+            _live_clients.clear()
+            tasks = asyncio.all_tasks(loop)   # connection handlers finish on the closed sockets
+            if tasks:
+                loop.run_until_complete(asyncio.wait(tasks, timeout=1))
+            loop.run_until_complete(server.wait_closed())
+            loop.close()
+
+    _live_thread = threading.Thread(target=run, daemon=True, name='live-server')
+    _live_thread.start()
+    ready.wait(5)
+    if failure or _live_loop is None:
+        log_message(f"Live results server could not start on {host}:{port}: "
+                    f"{failure[0] if failure else 'timed out'}", "WARN")
+        return False
+    shown = _live_lan_address() if host in ('0.0.0.0', '') else host
+    log_message(f"Live results at http://{shown}:{port}/")
+    log_message(f"Table scorekeepers report results at {live_report_url(host, port)}")
+    return True
+
+def start_live_updates(root, host=LIVE_HOST):
+    """
+    Starts the server (if needed), wires the scoreboard counters into it and
+    starts applying remote results on the Tk thread. Returns False if it
+    could not listen.
+    """
+    global _live_wired
+    if not start_live_server(host, LIVE_PORT):
+        return False
+    if not _live_wired and ui_references.get('red_counter_var'):
+        for color in ('red', 'blue'):
+            ui_references[f'{color}_counter_var'].trace_add('write', live_publish_score)
+
+        def pump():
+            process_live_submissions()
+            root.after(LIVE_SUBMIT_POLL_MS, pump)
+        root.after(LIVE_SUBMIT_POLL_MS, pump)
+        _live_wired = True
+    root.after_idle(live_publish)
+    return True
+
+def stop_live_server():
+    """Stops the server thread, closing every phone's connection."""
+    global _live_loop, _live_published
+    loop, _live_loop = _live_loop, None
+    if loop is None:
+        return
+    _live_published = None
+    loop.call_soon_threadsafe(loop.stop)
+    _live_thread.join(timeout=2)
+
+def render_live_page(report=False):
+    """
+    The spectator page, or with `report` the scorekeepers' page that also
+    lists every ready match with buttons to submit its result. Both render
+    whatever arrives over /ws, so they are the same for every tournament.
+    """
+    return LIVE_PAGE_TEMPLATE.replace('{{REPORT}}', 'true' if report else 'false').replace('{{CSS}}', (
+        f'body{{background:{THEME["bg_main"]};color:{THEME["fg_primary"]};'
+        'font-family:Selawik,"Segoe UI",sans-serif;margin:12px}'
+        f'h1,h2{{color:{THEME["accent_gold"]};margin:14px 0 6px}}h1{{text-align:center}}'
+        f'.card{{background:{THEME["bg_card"]};padding:10px;margin:4px 0;border-radius:6px}}'
+        f'small{{color:{THEME["fg_secondary"]};display:block}}'
+        '.vs{display:flex;justify-content:space-between;gap:8px;font-weight:bold}'
+        f'.red{{color:{THEME["red_team"]}}}.blue{{color:{THEME["blue_team"]}}}'
+        '.pts{font-size:2em;display:block}'
+        '.bracket{overflow-x:auto}.bracket img{max-width:none}'
+        f'button{{background:{THEME["btn_default"]};color:{THEME["fg_primary"]};border:0;'
+        'border-radius:4px;padding:10px;margin:4px 4px 0 0;font-weight:bold}'
+        'input{width:3em;padding:8px;margin:4px 4px 0 0}'
+        f'#msg{{color:{THEME["accent_gold"]};font-weight:bold}}'
+        f'footer{{color:{THEME["fg_secondary"]};text-align:center;font-size:.8em;margin-top:16px}}'))
+
+LIVE_PAGE_TEMPLATE = r"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><meta name="viewport" content="width=device-width,initial-scale=1">
+<title>Shuffleboard — Live</title><style>{{CSS}}</style></head><body>
+<h1 id="title">LIVE RESULTS</h1>
+<div id="report"></div><div id="msg"></div>
+<div id="now" class="card"></div>
+<div id="standings"></div>
+<h2>Up Next</h2><div id="next"></div>
+<h2>Bracket</h2><div class="bracket"><img id="bracket" alt=""></div>
+<h2>Results</h2><div id="done"></div>
+<footer id="conn">connecting…</footer>
+<script>
+const REPORT = {{REPORT}};
+const TOKEN = new URLSearchParams(location.search).get('token');
+let S = {matches: {}, order: [], rosters: {}};
+let shownBracket = 0, shownForms = '';
+const $ = id => document.getElementById(id);
+const esc = s => String(s ?? '').replace(/[&<>"]/g, c => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'}[c]));
+const roster = t => t ? esc((S.rosters[t] || [t]).join(' / ')) : 'TBD';
+
+function render() {
+  const a = S.active, sc = S.score;
+  if (a && a.id === 'TOURNAMENT_OVER') {
+    $('now').innerHTML = `<small>CHAMPIONS</small><b>${roster(a.champion)}</b>`;
+  } else if (a) {
+    const live = sc && sc.id === a.id;
+    $('now').innerHTML = `<small>NOW PLAYING · ${esc(a.id)}</small><div class="vs">` +
+      `<span class="red">${roster(a.red)}<span class="pts">${live ? sc.red : 0}</span></span>` +
+      `<span class="blue" style="text-align:right">${roster(a.blue)}<span class="pts">${live ? sc.blue : 0}</span></span></div>`;
+  }
+  $('standings').innerHTML = S.standings ? '<h2>Standings</h2>' + S.standings.map((r, i) =>
+    `<div class="card">${i + 1}. ${roster(r[0])} <b style="float:right">${r[1]}-${r[2]}</b></div>`).join('') : '';
+  const next = [], done = [];
+  for (const id of S.order) {
+    const m = S.matches[id];
+    if (!m || (a && id === a.id)) continue;
+    if (m.winner) done.push([id, m]);
+    else if (m.teams[0] || m.teams[1]) next.push(`<div class="card"><small>${esc(id)}</small>${roster(m.teams[0])} vs ${roster(m.teams[1])}</div>`);
+  }
+  $('next').innerHTML = next.join('') || '<small>Nothing on deck.</small>';
+  $('done').innerHTML = done.reverse().map(([id, m]) => {
+    const loser = m.teams[0] === m.winner ? m.teams[1] : m.teams[0];
+    const score = m.red_score != null && m.blue_score != null
+      ? ` (${Math.max(m.red_score, m.blue_score)}-${Math.min(m.red_score, m.blue_score)})` : '';
+    return `<div class="card"><small>${esc(id)}</small><b>${roster(m.winner)}</b> beat ${roster(loser)}${score}</div>`;
+  }).join('');
+  if (S.bracket && S.bracket !== shownBracket) {
+    shownBracket = S.bracket;
+    $('bracket').src = '/bracket.svg?v=' + S.bracket;
+  }
+  if (REPORT) renderForms();
+}
+
+// Scorekeepers' page: one card per ready match. Cards are only rebuilt when
+// the ready set or a version changes, so typed scores survive score updates.
+// [red, blue]: the main table's match follows the scoreboard after a swap
+const sides = id => S.active && S.active.id === id && S.active.red ? [S.active.red, S.active.blue] : S.matches[id].teams;
+
+function renderForms() {
+  const ready = S.order.filter(id => S.matches[id] && !S.matches[id].winner && S.matches[id].teams[0] && S.matches[id].teams[1]);
+  const key = ready.map(id => id + ':' + S.matches[id].v + ':' + sides(id)[0]).join(',');
+  if (key === shownForms) return;
+  shownForms = key;
+  $('report').innerHTML = ready.map(id => {
+    const [red, blue] = sides(id);
+    return `<div class="card"><small>${esc(id)} — report the winner</small>` +
+      `<input id="rs-${esc(id)}" inputmode="numeric" placeholder="red"><input id="bs-${esc(id)}" inputmode="numeric" placeholder="blue"><br>` +
+      `<button class="red" onclick="report('${esc(id)}', 0)">${roster(red)}</button>` +
+      `<button class="blue" onclick="report('${esc(id)}', 1)">${roster(blue)}</button></div>`;
+  }).join('') || '<small>No matches are ready to report.</small>';
+}
+
+const PROBLEMS = {
+  stale: 'This match changed since you loaded it. Check it and send again.',
+  already_resolved: 'This match was already reported.',
+  tournament_over: 'The tournament is over.',
+  not_ready: 'This match is not ready yet.',
+  bad_token: 'This link cannot report results. Ask the scorekeeper for the report link.',
+};
+
+async function report(id, slot) {
+  const m = S.matches[id], winner = sides(id)[slot];
+  if (!confirm(`${(S.rosters[winner] || [winner]).join(' / ')} won ${id}?`)) return;
+  const num = el => el.value === '' ? null : Number(el.value);
+  const body = {match: id, version: m.v, winner, red_score: num($('rs-' + id)), blue_score: num($('bs-' + id)), token: TOKEN};
+  try {
+    const r = await fetch('/submit', {method: 'POST', headers: {'Content-Type': 'application/json'}, body: JSON.stringify(body)});
+    const res = await r.json();
+    $('msg').textContent = r.ok ? `${id} recorded.`
+      : (res.duplicate ? `${id} was already recorded with that result.` : (PROBLEMS[res.error] || res.error));
+  } catch (e) {
+    $('msg').textContent = 'Could not reach the scoring laptop. Try again.';
+  }
+}
+if (REPORT) $('title').textContent = 'REPORT RESULTS';
+
+function apply(m) {
+  if (m.t === 'sync') S = Object.assign({matches: {}, order: [], rosters: {}}, m);
+  else if (m.t === 'score') S.score = m;
+  else for (const k in m) {
+    if (k === 'matches') for (const id in m.matches) {
+      if (m.matches[id]) S.matches[id] = m.matches[id]; else delete S.matches[id];
+    }
+    else S[k] = m[k];
+  }
+  render();
+}
+
+function connect() {
+  const ws = new WebSocket((location.protocol === 'https:' ? 'wss://' : 'ws://') + location.host + '/ws');
+  ws.onopen = () => { $('conn').textContent = 'live'; };
+  ws.onmessage = e => apply(JSON.parse(e.data));
+  ws.onclose = () => { $('conn').textContent = 'reconnecting…'; setTimeout(connect, 2000); };
+}
+connect();
+</script></body></html>
+"""
+
+def run_serve_cli(argv):
+    """`sb.py serve` — the live results server without the GUI, following a replay file."""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='sb.py serve',
+                                     description='Serve live results for a replay file (e.g. one `sb.py cli` is scoring); '
+                                                 'results sent from /report are written to it.')
+    parser.add_argument('replay', nargs='?', help='replay file (default: follow the newest in replays/)')
+    parser.add_argument('--host', default=LIVE_HOST, help=f'address to bind (default {LIVE_HOST})')
+    parser.add_argument('--port', type=int, default=LIVE_PORT, help=f'port (default {LIVE_PORT})')
+    parser.add_argument('--poll', type=float, default=1.0, help='seconds between checks of the file (default 1)')
+    args = parser.parse_args(argv)
+
+    global LOG_CONSOLE
+    LOG_CONSOLE = False
+
+    if not start_live_server(args.host, args.port):
+        print(f"Could not listen on {args.host}:{args.port}.")
+        return 1
+    shown = _live_lan_address() if args.host in ('0.0.0.0', '') else args.host
+    print(f"Live results at http://{shown}:{args.port}/  (Ctrl+C to stop)")
+    print(f"Table scorekeepers report at {live_report_url(args.host, args.port)}")
+
+    seen = None
+    try:
+        while True:
+            path = args.replay or _cli_latest_replay()
+            try:
+                stamp = (path, os.stat(path).st_mtime_ns) if path else None
+            except OSError:
+                stamp = None
+            if stamp and stamp != seen and _cli_load(path):
+                seen = stamp
+                live_publish()
+            process_live_submissions(wait=args.poll)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_live_server()
+    return 0
+
+# =============================================================================
+# --- Remote Results ---
+# Table scorekeepers report results from their phones (the /report page, or
+# POST /submit with {match, version, winner, red_score, blue_score}) instead
+# of calling them out to the main laptop. Concurrency is optimistic: every
+# match carries the version live_publish() gave it, and a submission must
+# name the version it was made against. The server thread turns away stale,
+# duplicate and unknown submissions on its own from the state it already
+# holds; the rest are queued for the thread that owns the tournament (the Tk
+# loop, or `sb.py serve`), which checks the version again, applies the
+# result through record_match_result() and publishes the new state. Nothing
+# is locked, so a slow phone never holds up another table or the scorekeeper.
+# Submissions carry the token from /report?token=...: SB_LIVE_TOKEN if set,
+# otherwise one generated at startup whenever the server listens beyond
+# loopback, so a spectator on the lodge Wi-Fi cannot record results. The
+# operator gets the full report URL in the log (or on the `serve` console).
+# =============================================================================
+
+LIVE_SUBMIT_TOKEN = os.environ.get('SB_LIVE_TOKEN') or None
+_live_token = None            # token submissions must carry, None when open (set by start_live_server)
+_live_generated_token = None  # made once per process, so printed links stay valid across restarts
+LIVE_SUBMIT_POLL_MS = 100     # how often the Tk loop applies queued submissions
+LIVE_SUBMIT_TIMEOUT = 10      # seconds a phone waits for the owner thread to answer
+
+_live_submissions = queue.Queue()   # (submission, future, loop) from the server thread
+
+async def _live_submit(reader, headers):
+    """Server thread: reads a POST /submit body, pre-checks it and waits for the owner thread's answer."""
+    try:
+        length = int(headers.get('content-length', '0'))
+        if not 0 < length <= LIVE_MAX_FRAME:
+            return '413 Payload Too Large', {'error': 'bad_length'}
+        sub = json.loads(await asyncio.wait_for(reader.readexactly(length), LIVE_REQUEST_TIMEOUT))
+        if not isinstance(sub, dict):
+            raise ValueError("submission must be an object")
+    except (ValueError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+        return '400 Bad Request', {'error': 'bad_request'}
+    import hmac
+    token = _live_token
+    if token is not None and not hmac.compare_digest(str(sub.get('token') or '').encode('utf-8'),
+                                                     token.encode('utf-8')):
+        return '403 Forbidden', {'error': 'bad_token'}
+
+    # Fast path: answer from the last published state without involving the owner thread
+    mid = sub.get('match')
+    known = _live_state.get('matches', {}).get(mid)
+    if known is None:
+        return '404 Not Found', {'error': 'unknown_match', 'match': mid}
+    current = {'match': mid, 'version': known['v'], 'teams': known['teams'], 'winner': known['winner']}
+    if known['winner'] is not None:
+        return '409 Conflict', {'error': 'already_resolved', 'duplicate': known['winner'] == sub.get('winner'),
+                                **current}
+    if sub.get('version') != known['v']:
+        return '409 Conflict', {'error': 'stale', **current}
+
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    _live_submissions.put((sub, future, loop))
+    try:
+        return await asyncio.wait_for(future, LIVE_SUBMIT_TIMEOUT)
+    except asyncio.TimeoutError:
+        return '503 Service Unavailable', {'error': 'no_answer', **current}
+
+def _live_is_loopback(host):
+    """True for addresses only this machine can reach ('localhost', 127.x, ::1)."""
+    import ipaddress
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+def live_submit_token(host):
+    """The token POST /submit will require when listening on `host` (None: loopback, no SB_LIVE_TOKEN)."""
+    global _live_token, _live_generated_token
+    if LIVE_SUBMIT_TOKEN:
+        _live_token = LIVE_SUBMIT_TOKEN
+    elif _live_is_loopback(host):
+        _live_token = None
+    else:
+        if _live_generated_token is None:
+            import secrets
+            _live_generated_token = secrets.token_urlsafe(9)
+        _live_token = _live_generated_token
+    return _live_token
+
+def live_report_url(host, port):
+    """The /report link to hand to table scorekeepers."""
+    shown = _live_lan_address() if host in ('0.0.0.0', '') else host
+    return f"http://{shown}:{port}/report" + (f"?token={_live_token}" if _live_token else "")
+
+def _live_answer(future, result):
+    if not future.done():
+        future.set_result(result)
+
+def process_live_submissions(wait=0):
+    """
+    Owner thread: applies every queued submission and answers each phone.
+    With `wait`, blocks up to that many seconds for the first one.
+    """
+    try:
+        item = _live_submissions.get(timeout=wait) if wait else _live_submissions.get_nowait()
+    except queue.Empty:
+        return
+    while item is not None:
+        sub, future, loop = item
+        try:
+            result = apply_live_submission(sub)
+        except Exception as e:
+            log_message(f"Remote result {sub.get('match')} failed: {e}", "ERROR")
+            result = ('500 Internal Server Error', {'error': 'failed', 'match': sub.get('match')})
+        try:
+            loop.call_soon_threadsafe(_live_answer, future, result)
+        except RuntimeError:
+            pass   # server stopped in the meantime
+        try:
+            item = _live_submissions.get_nowait()
+        except queue.Empty:
+            item = None
+
+def apply_live_submission(sub):
+    """
+    Owner thread: validates one submitted result against the current state
+    and applies it. Returns (HTTP status, response body).
+    """
+    live_publish()   # every change so far must have its version before comparing
+    mid = sub.get('match')
+    md = TOURNAMENT_STATE.get(mid)
+    if not isinstance(md, dict) or 'config' not in md:
+        return '404 Not Found', {'error': 'unknown_match', 'match': mid}
+    current = {'match': mid, 'version': _live_versions.get(mid, 0), 'teams': list(md['teams']),
+               'winner': md.get('winner')}
+    if TOURNAMENT_STATE.get('active_match_id') == 'TOURNAMENT_OVER':
+        return '409 Conflict', {'error': 'tournament_over', **current}
+    if md.get('winner') is not None:
+        # Stricter than handle_match_resolution(): a reset GF keeps its winner
+        # and is_reset, and a phone must never replay it
+        return '409 Conflict', {'error': 'already_resolved', 'duplicate': md['winner'] == sub.get('winner'),
+                                **current}
+    if sub.get('version') != current['version']:
+        return '409 Conflict', {'error': 'stale', **current}
+    team_a, team_b = md['teams']
+    if not (team_a and team_b):
+        return '409 Conflict', {'error': 'not_ready', **current}
+    winner = sub.get('winner')
+    if winner not in (team_a, team_b):
+        return '400 Bad Request', {'error': 'winner_not_in_match', **current}
+    red_score, blue_score = sub.get('red_score'), sub.get('blue_score')
+    if (red_score is None) != (blue_score is None) or any(
+            v is not None and (not isinstance(v, int) or isinstance(v, bool) or v < 0) for v in (red_score, blue_score)):
+        return '400 Bad Request', {'error': 'bad_score', **current}
+
+    loser = team_b if winner == team_a else team_a
+    colour = 'red' if winner == live_match_colours(mid)[0] else 'blue'
+    shown = last_assigned_match_id
+    log_message(f"Resolving match {mid} from a remote submission: {winner} ({colour}) defeated {loser}")
+    # As confirm_match_resolution(): stop the clock of a match the scoreboard was timing
+    finalize_match_duration(mid)
+    record_match_result(mid, winner, loser, colour, red_score, blue_score)
+    append_snapshot_to_file(REPLAY_FILEPATH)
+    if TOURNAMENT_STATE.get('active_match_id') == 'TOURNAMENT_OVER' and REPLAY_FILEPATH:
+        champion = TOURNAMENT_RANKINGS.get('1ST')
+        if champion:
+            append_final_stats_to_file(REPLAY_FILEPATH, champion)
+
+    if main_root is not None:
+        if mid == shown:
+            reset_game()   # the scoreboard was on this match: move it to the next one
+        else:
+            update_scoreboard_display()
+    live_publish()
+    return '200 OK', {'ok': True, 'match': mid, 'version': _live_versions.get(mid, 0),
+                      'next': TOURNAMENT_STATE.get('active_match_id')}
+
+# =============================================================================
+# --- TV Display ---
+# `python sb.py display` is a read-only, full-screen bracket plus the current
+# score for a TV or projector, run as its own process so its redraws never
+# touch the scorekeeper's event loop. It follows the Live Results Server on
+# this machine: a feed thread reads the /ws updates and fetches /snapshot
+# whenever the bracket changes, and hands both to the display's Tk loop
+# through a queue. F6 in the main window starts the server (localhost only
+# unless SB_LIVE=1) and launches the display. When the bracket is bigger than
+# the screen the view pans lane by lane, pausing on each.
+# =============================================================================
+
+DISPLAY_POLL_MS = 100
+DISPLAY_RETRY_S = 2.0        # wait before reconnecting to the server
+DISPLAY_SCROLL_STEP = 6      # pixels per frame while panning
+DISPLAY_SCROLL_FRAME_MS = 30
+DISPLAY_DWELL_MS = 6000      # pause on each lane (or screenful of a wide lane)
+
+def open_tv_display(root):
+    """F6: starts the live server if needed and launches `sb.py display` against it."""
+    import subprocess
+    if not start_live_updates(root, LIVE_HOST if LIVE_ENABLED else '127.0.0.1'):
+        messagebox.showerror("TV Display", f"Could not start the live results server on port {LIVE_PORT}.")
+        return
+    subprocess.Popen([sys.executable, os.path.abspath(__file__), 'display', '--port', str(LIVE_PORT)])
+    log_message("TV display launched")
+
+def _display_fetch_snapshot(host, port):
+    import urllib.request
+    with urllib.request.urlopen(f"http://{host}:{port}/snapshot", timeout=5) as resp:
+        return json.loads(resp.read())
+
+def _display_feed(host, port, out, stop):
+    """
+    Display process, feed thread: follows /ws and posts ('snapshot', snap),
+    ('msg', msg), 'connected' and 'disconnected' events to `out`, reconnecting
+    until `stop` is set.
+    """
+    import asyncio
+    import base64
+
+    async def follow():
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            key = base64.b64encode(os.urandom(16)).decode('ascii')
+            writer.write((f"GET /ws HTTP/1.1\r\nHost: {host}:{port}\r\nUpgrade: websocket\r\n"
+                          f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n"
+                          "Sec-WebSocket-Version: 13\r\n\r\n").encode('ascii'))
+            head = await reader.readuntil(b'\r\n\r\n')
+            if b' 101 ' not in head.split(b'\r\n', 1)[0]:
+                raise ConnectionError(head.split(b'\r\n', 1)[0].decode('latin-1'))
+            out.put(('connected', None))
+            bracket = None
+            while not stop.is_set():
+                opcode, payload = await _ws_read_frame(reader, limit=None)
+                if opcode == 0x8:
+                    return
+                if opcode != 0x1:
+                    continue
+                msg = json.loads(payload)
+                if msg['t'] == 'sync' or msg.get('bracket', bracket) != bracket:
+                    bracket = msg.get('bracket')
+                    snap = await asyncio.get_running_loop().run_in_executor(
+                        None, _display_fetch_snapshot, host, port)
+                    out.put(('snapshot', snap))
+                out.put(('msg', msg))
+        finally:
+            writer.close()
+
+    while not stop.is_set():
+        try:
+            asyncio.run(follow())
+        except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError) as e:
+            log_message(f"Display feed: {e}", "DEBUG")
+        out.put(('disconnected', None))
+        stop.wait(DISPLAY_RETRY_S)
+
+def display_scroll_stops(layout, view_w, view_h):
+    """
+    Top-left view positions the display pans between: each lane's top, and
+    for lanes wider than the screen, successive screenfuls across it.
+    """
+    total_h = layout['height']
+    stops = []
+    for lane in layout['lanes']:
+        ids = [mid for _, _, _, col_ids in lane['rounds'] for mid in col_ids]
+        right = max((layout['boxes'][mid][0] + layout['boxes'][mid][2] for mid in ids), default=0) + SF(24)
+        y = max(0, min(lane['y'], total_h - view_h))
+        overflow = max(0, right - view_w)
+        pages = ceil(overflow / (view_w * 0.8)) if overflow else 0
+        for page in range(pages + 1):
+            stop = (overflow * page // pages if pages else 0, y)
+            if not stops or stops[-1] != stop:
+                stops.append(stop)
+    return stops
+
+def run_display_cli(argv):
+    """`sb.py display` — read-only full-screen bracket and score, fed by the live server."""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='sb.py display',
+                                     description='Full-screen bracket and score for a TV, following the live results server.')
+    parser.add_argument('--host', default='127.0.0.1', help='live server address (default 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=LIVE_PORT, help=f'live server port (default {LIVE_PORT})')
+    parser.add_argument('--windowed', action='store_true', help='start in a window instead of full screen')
+    args = parser.parse_args(argv)
+
+    global LOG_CONSOLE
+    LOG_CONSOLE = False
+
+    root = tk.Tk()
+    init_scaling(root)
+    root.title("Moose Lodge Shuffleboard — TV Display")
+    root.configure(bg=THEME['bg_main'])
+    root.geometry(screen_geometry(root))
+    root.attributes('-fullscreen', not args.windowed)
+    root.bind('<F11>', lambda e: root.attributes('-fullscreen', not int(root.attributes('-fullscreen'))))
+    root.bind('<Escape>', lambda e: root.attributes('-fullscreen', False))
+
+    # ── Score banner ─────────────────────────────────────────────────────────
+    banner = tk.Frame(root, bg=THEME['bg_card'], pady=SF(8))
+    banner.pack(fill='x')
+    sides = {}
+    for color, side in (('red', 'left'), ('blue', 'right')):
+        box = tk.Frame(banner, bg=THEME['bg_card'], padx=SF(24))
+        box.pack(side=side)
+        score = tk.Label(box, text="", font=scaled_font('Selawik', 40, 'bold'),
+                         fg=THEME[f'{color}_team'], bg=THEME['bg_card'])
+        names = tk.Label(box, text="", font=scaled_font('Selawik', 18, 'bold'),
+                         fg=THEME['fg_primary'], bg=THEME['bg_card'])
+        for widget in ((score, names) if side == 'left' else (names, score)):
+            widget.pack(side='left', padx=SF(10))
+        sides[color] = (names, score)
+    center = tk.Label(banner, text="Waiting for the scoreboard…", font=scaled_font('Selawik', 20, 'bold'),
+                      fg=THEME['accent_gold'], bg=THEME['bg_card'])
+    center.pack(expand=True)
+
+    canvas = tk.Canvas(root, bg=THEME['bg_canvas'], highlightthickness=0)
+    canvas.pack(fill='both', expand=True)
+
+    live = {'active': None, 'score': None, 'connected': False}
+    scroll = {'stops': [], 'i': 0, 'job': None}
+
+    def roster(team):
+        return " / ".join(TEAM_ROSTERS.get(team, [team])) if team else "TBD"
+
+    def update_banner():
+        active, score = live['active'], live['score']
+        if not live['connected']:
+            center.config(text="Waiting for the scoreboard…")
+        elif active and active['id'] == 'TOURNAMENT_OVER':
+            center.config(text=f"CHAMPIONS  {roster(active.get('champion'))}")
+        elif active:
+            center.config(text=f"NOW PLAYING  {active['id']}")
+        playing = live['connected'] and active and active['id'] != 'TOURNAMENT_OVER'
+        for color, (names, points) in sides.items():
+            names.config(text=roster(active[color]) if playing else "")
+            shown = score[color] if playing and score and score.get('id') == active['id'] else 0
+            points.config(text=str(shown) if playing else "")
+
+    def scroll_tick():
+        scroll['job'] = None
+        stops = scroll['stops']
+        if len(stops) < 2:
+            return
+        region = [float(v) for v in str(canvas.cget('scrollregion')).split()] or [0, 0, 1, 1]
+        total_w, total_h = max(1.0, region[2]), max(1.0, region[3])
+        x, y = canvas.canvasx(0), canvas.canvasy(0)
+        tx, ty = stops[scroll['i']]
+        if abs(tx - x) <= DISPLAY_SCROLL_STEP and abs(ty - y) <= DISPLAY_SCROLL_STEP:
+            canvas.xview_moveto(tx / total_w)
+            canvas.yview_moveto(ty / total_h)
+            scroll['i'] = (scroll['i'] + 1) % len(stops)
+            scroll['job'] = root.after(DISPLAY_DWELL_MS, scroll_tick)
+            return
+        step = lambda cur, target: cur + max(-DISPLAY_SCROLL_STEP, min(DISPLAY_SCROLL_STEP, target - cur))
+        canvas.xview_moveto(step(x, tx) / total_w)
+        canvas.yview_moveto(step(y, ty) / total_h)
+        scroll['job'] = root.after(DISPLAY_SCROLL_FRAME_MS, scroll_tick)
+
+    def redraw():
+        if scroll['job']:
+            root.after_cancel(scroll['job'])
+            scroll['job'] = None
+        draw_large_bracket(canvas)
+        if not TOURNAMENT_STATE:
+            return
+        view_w, view_h = canvas.winfo_width(), canvas.winfo_height()
+        layout = bracket_layout(TOURNAMENT_STATE, get_compiled_bracket(), max(SF(620), view_w))
+        scroll['stops'] = display_scroll_stops(layout, view_w, view_h)
+        scroll['i'] = 0
+        canvas.xview_moveto(0)
+        canvas.yview_moveto(0)
+        scroll['job'] = root.after(DISPLAY_DWELL_MS, scroll_tick)
+
+    bind_debounced_canvas_redraw(canvas, redraw)
+
+    events = queue.Queue()
+    stop = threading.Event()
+    threading.Thread(target=_display_feed, args=(args.host, args.port, events, stop),
+                     daemon=True, name='display-feed').start()
+
+    def pump():
+        snapshot = None
+        try:
+            while True:
+                kind, data = events.get_nowait()
+                if kind == 'snapshot':
+                    snapshot = data
+                elif kind in ('connected', 'disconnected'):
+                    live['connected'] = kind == 'connected'
+                elif data['t'] == 'score':
+                    live['score'] = data
+                else:
+                    if data['t'] == 'sync':
+                        live['score'] = data.get('score')
+                    if 'active' in data:
+                        live['active'] = data['active']
+        except queue.Empty:
+            pass
+        if snapshot:   # only the newest one matters
+            reset_global_state()
+            restore_snapshot(snapshot)
+            redraw()
+        update_banner()
+        root.after(DISPLAY_POLL_MS, pump)
+
+    def close():
+        stop.set()
+        root.destroy()
+    root.protocol("WM_DELETE_WINDOW", close)
+    pump()
+    root.mainloop()
+    return 0
+
+# =============================================================================
+# --- Match Table Export ---
+# `python sb.py export-matches` flattens every replay's matches into one
+# table (CSV, or Parquet when pyarrow is installed) for season analysis.
+# Replays are streamed one at a time and rows are written as they are made,
+# so memory stays flat however large the library grows.
+# =============================================================================
+
+MATCH_EXPORT_COLUMNS = (
+    'tournament', 'format', 'complete', 'seq', 'match_id', 'side', 'started_at',
+    'winner', 'loser', 'winner_color', 'red_score', 'blue_score',
+    'winner_score', 'loser_score', 'duration_s',
+    'winner_player1', 'winner_player2', 'loser_player1', 'loser_player2',
+)
+MATCH_EXPORT_BATCH = 5000   # rows per Parquet row group
+
+def _match_side(mid, md, fmt):
+    """'WB', 'LB', 'Finals', or 'Pool' for league formats (same rules as compile_bracket)."""
+    if fmt in LEAGUE_FORMATS:
+        return 'Pool'
+    bt = md.get('is_winnerbracket', 'unknown')
+    if bt == 'both' or mid in ('GF', 'GGF'):
+        return 'Finals'
+    if bt in ('false', False):
+        return 'LB'
+    return 'WB'
+
+def iter_replay_matches(path, skipped=None):
+    """
+    Yields one flat row (a dict keyed by MATCH_EXPORT_COLUMNS) per played
+    match in a replay, in play order (see replay_match_records). A missing
+    or unreadable file yields nothing and is appended to `skipped`.
+    """
+    try:
+        snapshot, final = read_replay_summary(path)
+    except (OSError, ValueError) as e:
+        log_message(f"Match export: skipping unreadable replay {path}: {e}", "WARN")
+        if skipped is not None:
+            skipped.append(path)
+        return
+    if not snapshot:
+        return
+    fmt = snapshot.get('format', 'D')
+    state = snapshot.get('state', {})
+    rosters = snapshot.get('rosters', {})
+    complete = final is not None or snapshot.get('active_match_id') == 'TOURNAMENT_OVER'
+    tournament = os.path.splitext(os.path.basename(path))[0]
+
+    for seq, rec in enumerate(replay_match_records(snapshot, final), start=1):
+        mid = rec.get('id')
+        md = state.get(mid, {})
+        colour = rec.get('color')
+        red, blue = rec.get('red_score'), rec.get('blue_score')
+        scored = red is not None and blue is not None
+        w_players = (list(rosters.get(rec.get('winner'), [])) + [None, None])[:2]
+        l_players = (list(rosters.get(rec.get('loser'), [])) + [None, None])[:2]
+        started = md.get('start_time')
+        yield {
+            'tournament': tournament,
+            'format': fmt,
+            'complete': complete,
+            'seq': seq,
+            'match_id': mid,
+            'side': _match_side(mid, md, fmt),
+            'started_at': (datetime.datetime.fromtimestamp(started).isoformat(timespec='seconds')
+                           if started else None),
+            'winner': rec.get('winner'),
+            'loser': rec.get('loser'),
+            'winner_color': colour,
+            'red_score': red,
+            'blue_score': blue,
+            'winner_score': (red if colour == 'red' else blue) if scored else None,
+            'loser_score': (blue if colour == 'red' else red) if scored else None,
+            'duration_s': md.get('duration'),
+            'winner_player1': w_players[0],
+            'winner_player2': w_players[1],
+            'loser_player1': l_players[0],
+            'loser_player2': l_players[1],
+        }
+
+def _write_matches_csv(rows, out):
+    import csv
+    writer = csv.DictWriter(out, fieldnames=MATCH_EXPORT_COLUMNS)
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+def _write_matches_parquet(rows, path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    ints = {'seq', 'red_score', 'blue_score', 'winner_score', 'loser_score', 'duration_s'}
+    schema = pa.schema([(c, pa.int64() if c in ints else pa.bool_() if c == 'complete' else pa.string())
+                        for c in MATCH_EXPORT_COLUMNS])
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= MATCH_EXPORT_BATCH:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                count += len(batch)
+                batch = []
+        if batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            count += len(batch)
+    return count
+
+def run_export_matches_cli(argv):
+    """`sb.py export-matches` — one row per match across the replay library."""
+    import argparse
+    import glob
+
+    parser = argparse.ArgumentParser(prog='sb.py export-matches',
+                                     description='Flatten all replay match records into CSV or Parquet.')
+    parser.add_argument('replays', nargs='*', help=f'replay files (default: {REPLAY_DIR}/*.json)')
+    parser.add_argument('--out', default='matches.csv',
+                        help="output file; .parquet writes Parquet, '-' writes CSV to stdout "
+                             "(default matches.csv)")
+    parser.add_argument('--complete-only', action='store_true', help='skip unfinished tournaments')
+    args = parser.parse_args(argv)
+
+    global LOG_CONSOLE
+    LOG_CONSOLE = False
+
+    paths = args.replays or sorted(glob.glob(os.path.join(REPLAY_DIR, '*.json')),
+                                   key=lambda p: _replay_epoch(os.path.basename(p)) or 0)
+    skipped = []
+    rows = (row for path in paths for row in iter_replay_matches(path, skipped)
+            if row['complete'] or not args.complete_only)
+
+    started = time.perf_counter()
+    if args.out.endswith('.parquet'):
+        try:
+            count = _write_matches_parquet(rows, args.out)
+        except ImportError:
+            print("Parquet output needs pyarrow (pip install pyarrow); use a .csv file instead.")
+            return 1
+    elif args.out == '-':
+        count = _write_matches_csv(rows, sys.stdout)
+    else:
+        with open(args.out, 'w', newline='', encoding='utf-8') as f:
+            count = _write_matches_csv(rows, f)
+
+    if args.out != '-':
+        print(f"{count} matches from {len(paths) - len(skipped)} replays -> {args.out} "
+              f"in {time.perf_counter() - started:.2f}s")
+    for path in skipped:
+        print(f"Skipped unreadable replay: {path}", file=sys.stderr)
+    return 0
+
+# =============================================================================
+# --- Benchmarks ---
+# `python sb.py bench` times the hot paths on fixed, seeded inputs: bracket
+# generation and resolution for every data/*.json config, snapshot writing and
+# replay loading at 10/100/1000-match scale, final stats, and the full-bracket
+# renderer (needs a display; run under `xvfb-run` on headless machines).
+# Results are written as JSON and compared against a stored baseline.
+# =============================================================================
+
+BENCH_VERSION = 1
+BENCH_BASELINE_FILE = os.path.join('bench', 'baseline.json')
+BENCH_SCALES = (10, 100, 1000)
+BENCH_DEFAULT_REPEAT = 5
+BENCH_REGRESSION = 0.25        # flag results more than 25% slower than baseline
+BENCH_NOISE_FLOOR = 0.00005    # ... and at least this many seconds slower
+
+def _bench_time(fn, repeat):
+    """Runs fn() `repeat` times with GC paused, as timeit does; returns (best, median) wall seconds."""
+    import gc
+    runs = []
+    gc.collect()
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn()
+            runs.append(time.perf_counter() - started)
+    finally:
+        if was_enabled:
+            gc.enable()
+    runs.sort()
+    return runs[0], runs[len(runs) // 2]
+
+def _bench_play(config, fmt, num_teams, seed, replay_path=None):
+    """
+    Loads a fresh tournament into the globals and plays it to the end with
+    seeded outcomes, scores and durations through record_match_result(). With replay_path, a snapshot is written
+    after every match like a live game. Returns the number of matches played.
+    """
+    global TOURNAMENT_FORMAT, TOURNAMENT_START_TIME
+    rng = random.Random(seed)
+    reset_global_state()
+    TOURNAMENT_FORMAT = fmt
+    TOURNAMENT_START_TIME = 1_700_000_000.0
+    TEAMS.extend(f"Team {i + 1}" for i in range(num_teams))
+    for i, team in enumerate(TEAMS):
+        TEAM_ROSTERS[team] = [f"Player {2 * i + 1}", f"Player {2 * i + 2}"]
+    TOURNAMENT_STATE.update(build_bracket_state(TEAMS, config))
+    TOURNAMENT_STATE['active_match_id'] = next_playable_match(TOURNAMENT_STATE, get_compiled_bracket())
+
+    lines = []
+    played = 0
+    while TOURNAMENT_STATE['active_match_id'] != 'TOURNAMENT_OVER':
+        mid = TOURNAMENT_STATE['active_match_id']
+        a, b = TOURNAMENT_STATE[mid]['teams']
+        pick = rng.randrange(2)
+        winner, loser = (a, b) if pick == 0 else (b, a)
+        colour = 'red' if pick == 0 else 'blue'
+        duration = rng.randint(240, 1500)
+        scores = sorted((rng.randint(0, 14), 15))
+        red_score, blue_score = (scores[1], scores[0]) if pick == 0 else scores
+
+        TOURNAMENT_STATE[mid]['start_time'] = TOURNAMENT_START_TIME + played * 900
+        record_match_result(mid, winner, loser, colour, red_score, blue_score, duration)
+        played += 1
+        if replay_path:
+            lines.append(json.dumps(serialize_snapshot(), separators=(",", ":")))
+
+    if replay_path:
+        final = {"type": "FINAL_STATS", "version": SNAPSHOT_VERSION, "timestamp": time.time(),
+                 "champion": TOURNAMENT_RANKINGS.get('1ST'),
+                 "stats": _compute_final_stats(TOURNAMENT_RANKINGS.get('1ST'))}
+        lines.append(json.dumps(final, separators=(",", ":")))
+        with open(replay_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+    return played
+
+def _bench_brackets(paths, repeat, seed, results, select):
+    """bracket/<config>/generate and /resolve for every data/*.json config."""
+    for path in paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        m = _CONFIG_FILENAME_RE.search(os.path.basename(path))
+        if not m:
+            continue
+        num_teams, fmt = int(m.group(1)), m.group(2)
+        teams = [f"Team {i + 1}" for i in range(num_teams)]
+
+        def generate():
+            if fmt == 'D':
+                config, _ = _read_bracket_config_file(path)
+            else:
+                with open(path, 'r') as f:
+                    config, _ = _parse_json_config_content(json.load(f))
+            compile_bracket(build_bracket_state(teams, config))
+            return config
+
+        key = f"bracket/{name}/generate"
+        if select(key):
+            best, median = _bench_time(generate, repeat)
+            results[key] = {'seconds': best, 'median': median, 'matches': len(generate())}
+
+        key = f"bracket/{name}/resolve"
+        if select(key):
+            config = generate()
+            played = [0]
+            def resolve():
+                played[0] = _bench_play(config, fmt, num_teams, seed)
+            best, median = _bench_time(resolve, repeat)
+            results[key] = {'seconds': best, 'median': median, 'matches': played[0]}
+
+def _bench_scale_teams(matches):
+    """Smallest round-robin field with at least `matches` games."""
+    n = 2
+    while n * (n - 1) // 2 < matches:
+        n += 1
+    return n
+
+def _bench_persistence(repeat, seed, results, select, workdir):
+    """snapshot/*, replay/* and final_stats/* at each of BENCH_SCALES."""
+    for scale in BENCH_SCALES:
+        keys = [f"{kind}/{scale}" for kind in ('snapshot/serialize', 'snapshot/append',
+                                               'replay/load', 'replay/summary', 'final_stats')]
+        if not any(select(k) for k in keys):
+            continue
+        num_teams = _bench_scale_teams(scale)
+        # One full snapshot per match makes the 1000-match replay several hundred MB,
+        # so only write it when a replay benchmark will read it.
+        replay = os.path.join(workdir, f"bench_{scale}.jsonl")
+        wants_replay = select(keys[2]) or select(keys[3])
+        played = _bench_play(generate_round_robin_config(num_teams), 'R', num_teams, seed,
+                             replay if wants_replay else None)
+        meta = {'matches': played, 'teams': num_teams}
+        if wants_replay:
+            meta['bytes'] = os.path.getsize(replay)
+        champion = TOURNAMENT_RANKINGS.get('1ST')
+        scratch = os.path.join(workdir, f"append_{scale}.jsonl")
+
+        timed = {
+            keys[0]: serialize_snapshot,
+            keys[1]: lambda: append_snapshot_to_file(scratch),
+            keys[2]: lambda: _find_last_snapshot_in_file(replay),
+            keys[3]: lambda: read_replay_summary(replay),
+            keys[4]: lambda: _compute_final_stats(champion),
+        }
+        for key, fn in timed.items():
+            if select(key):
+                best, median = _bench_time(fn, repeat)
+                results[key] = dict(meta, seconds=best, median=median)
+
+def _bench_render(paths, repeat, seed, results, skipped, select):
+    """render/<config>: draw_large_bracket() of a finished tournament on a withdrawn Tk canvas."""
+    keys = {}
+    for path in paths:
+        m = _CONFIG_FILENAME_RE.search(os.path.basename(path))
+        key = f"render/{os.path.splitext(os.path.basename(path))[0]}"
+        if m and select(key):
+            keys[key] = (path, int(m.group(1)), m.group(2))
+    if not keys:
+        return
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        for key in keys:
+            skipped[key] = f"no display ({e}); run under xvfb-run"
+        return
+    try:
+        root.withdraw()
+        canvas = tk.Canvas(root, width=1600, height=1000, highlightthickness=0)
+        canvas.pack(fill=tk.BOTH, expand=True)
+        root.update_idletasks()
+        for key, (path, num_teams, fmt) in keys.items():
+            if fmt == 'D':
+                config, _ = _read_bracket_config_file(path)
+            else:
+                with open(path, 'r') as f:
+                    config, _ = _parse_json_config_content(json.load(f))
+            played = _bench_play(config, fmt, num_teams, seed)
+            best, median = _bench_time(lambda: draw_large_bracket(canvas), repeat)
+            results[key] = {'seconds': best, 'median': median, 'matches': played,
+                            'items': len(canvas.find_all())}
+    finally:
+        root.destroy()
+
+def compare_bench_results(current, baseline, threshold=BENCH_REGRESSION):
+    """
+    Compares two bench result dicts by best time. Returns a list of
+    (name, baseline_s, current_s, ratio, status) rows, status being one of
+    'ok', 'faster', 'REGRESSION', 'new' or 'missing'.
+    """
+    rows = []
+    cur, base = current.get('results', {}), baseline.get('results', {})
+    for name in sorted(set(cur) | set(base)):
+        if name not in base:
+            rows.append((name, None, cur[name]['seconds'], None, 'new'))
+            continue
+        if name not in cur:
+            rows.append((name, base[name]['seconds'], None, None, 'missing'))
+            continue
+        b, c = base[name]['seconds'], cur[name]['seconds']
+        ratio = c / b if b > 0 else float('inf')
+        if ratio > 1 + threshold and c - b > BENCH_NOISE_FLOOR:
+            status = 'REGRESSION'
+        elif ratio < 1 / (1 + threshold) and b - c > BENCH_NOISE_FLOOR:
+            status = 'faster'
+        else:
+            status = 'ok'
+        rows.append((name, b, c, ratio, status))
+    return rows
+
+def run_bench_cli(argv):
+    """`sb.py bench` — returns 1 when a result regresses against the baseline."""
+    import argparse
+    import glob
+    import platform
+    import tempfile
+
+    parser = argparse.ArgumentParser(prog='sb.py bench',
+                                     description='Time engine, persistence, stats and rendering hot paths.')
+    parser.add_argument('configs', nargs='*', help='config files (default: data/*.json)')
+    parser.add_argument('--repeat', type=int, default=BENCH_DEFAULT_REPEAT,
+                        help=f'runs per benchmark; the best is compared (default {BENCH_DEFAULT_REPEAT})')
+    parser.add_argument('--seed', type=int, default=0, help='RNG seed for match outcomes')
+    parser.add_argument('--only', default='',
+                        help='comma-separated name prefixes, e.g. bracket,replay/1000')
+    parser.add_argument('--out', help='write results JSON here')
+    parser.add_argument('--baseline', default=BENCH_BASELINE_FILE,
+                        help=f'baseline to compare against (default {BENCH_BASELINE_FILE})')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='store these results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=BENCH_REGRESSION,
+                        help=f'allowed slowdown, as a fraction, before flagging '
+                             f'(default {BENCH_REGRESSION}, i.e. {BENCH_REGRESSION:.0%}%)')
+    args = parser.parse_args(argv)
+
+    global LOG_CONSOLE
+    LOG_CONSOLE = False
+
+    paths = args.configs or sorted(glob.glob(os.path.join('data', '*.json')),
+                                   key=lambda p: [int(t) if t.isdigit() else t
+                                                  for t in re.split(r'(\d+)', p)])
+    prefixes = [p.strip() for p in args.only.split(',') if p.strip()]
+    select = lambda name: not prefixes or any(name.startswith(p) for p in prefixes)
+
+    results, skipped = {}, {}
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix='sb_bench_') as workdir:
+        _bench_brackets(paths, args.repeat, args.seed, results, select)
+        _bench_persistence(args.repeat, args.seed, results, select, workdir)
+    _bench_render(paths, args.repeat, args.seed, results, skipped, select)
+    reset_global_state()
+
+    report = {
+        'version': BENCH_VERSION,
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'sb_version': SHUF_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'seed': args.seed,
+        'results': results,
+        'skipped': skipped,
+    }
+
+    for name, r in results.items():
+        print(f"{name:<32} {r['seconds'] * 1000:10.3f} ms  (median {r['median'] * 1000:.3f} ms)")
+    for name, why in skipped.items():
+        print(f"{name:<32}    skipped  {why}")
+    print(f"{len(results)} benchmarks in {time.perf_counter() - started:.2f}s")
+
+    outputs = [(args.out, report)] if args.out else []
+    if args.save_baseline:
+        saved = report
+        if prefixes and os.path.exists(args.baseline):
+            # A partial run only replaces the benchmarks it measured
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                old = json.load(f)
+            kept = {k: v for k, v in old.get('results', {}).items() if not select(k)}
+            saved = dict(report, results=dict(kept, **results))
+        outputs.append((args.baseline, saved))
+    for path, data in outputs:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        print(f"Wrote {path}")
+    if args.save_baseline:
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; rerun with --save-baseline to create one.")
+        return 0
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if not prefixes:
+        selected = baseline.get('results', {})
+    else:
+        selected = {k: v for k, v in baseline.get('results', {}).items() if select(k)}
+    rows = compare_bench_results(report, dict(baseline, results=selected), args.threshold)
+
+    print(f"\nAgainst {args.baseline} ({baseline.get('created', '?')}, "
+          f"python {baseline.get('python', '?')}):")
+    regressions = 0
+    for name, b, c, ratio, status in rows:
+        if status in ('new', 'missing'):
+            if name in skipped:
+                continue
+            print(f"  {status.upper():<10} {name}")
+            continue
+        regressions += status == 'REGRESSION'
+        print(f"  {status:<10} {name:<32} {b * 1000:10.3f} -> {c * 1000:10.3f} ms  x{ratio:.2f}")
+    print(f"{regressions} regression(s) beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+# Subcommands for `python sb.py <command> ...`; no command launches the GUI.
+CLI_COMMANDS = {
+    'validate': run_validate_cli,
+    'stats': run_stats_cli,
+    'cli': run_headless_cli,
+    'bench': run_bench_cli,
+    'export-pdf': run_export_pdf_cli,
+    'export-web': run_export_web_cli,
+    'export-matches': run_export_matches_cli,
+    'serve': run_serve_cli,
+    'display': run_display_cli,
+}
 
 if __name__ == '__main__':
 
+    if len(sys.argv) > 1 and sys.argv[1] in CLI_COMMANDS:
+        sys.exit(CLI_COMMANDS[sys.argv[1]](sys.argv[2:]))
+
+    startup_mark('module_loaded')
     log_message("--- Shuffleboard Tournament Manager starting ---")
 
     if not os.path.exists('data'):